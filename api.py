@@ -0,0 +1,167 @@
+"""Headless HTTP/JSON API for the NL→SQL pipeline (no Streamlit involved).
+
+    python api.py --port 8000                 # live Gemini (GOOGLE_API_KEY)
+    python api.py --port 8000 --stub 0.4      # stub Gemini answering after ~0.4 s, for load tests
+
+    POST /query    {"question": ..., "explain": false, "stream": false}   NL -> SQL -> rows
+    POST /sql      {"question": ...}                                      NL -> SQL only
+    POST /run      {"sql": ..., "stream": false}                          run a read-only query
+    POST /explain  {"sql": ...}
+    GET  /health
+    GET  /workload                                                        executions grouped by query shape
+
+Results come back as one JSON object (capped at MAX_ROWS rows, "truncated" says so) or, with
+"stream": true or Accept: application/x-ndjson, as NDJSON lines: {"type": "sql"}, {"type":
+"columns"}, any number of {"type": "rows"} and a final {"type": "done"} (or {"type": "error"}).
+Every request runs against student.db through a read-only connection; Gemini and SQLite calls
+are blocking and run in a bounded thread pool so the event loop keeps accepting requests.
+While no Gemini model is reachable, /query and /sql answer from the offline engine (fallback.py)
+with "engine": "offline" and its "confidence", and /health reports "degraded_s".
+"""
+import argparse, contextlib, json, os, sqlite3, time
+
+try:
+    from starlette.applications import Starlette
+    from starlette.concurrency import run_in_threadpool
+    from starlette.responses import Response, StreamingResponse
+    from starlette.routing import Route
+except ImportError:
+    raise RuntimeError("Install starlette and uvicorn for the API: `pip install starlette uvicorn`")
+
+import core, sqlnorm
+
+DB         = os.getenv("INTELLISQL_DB", "student.db")
+MAX_ROWS   = 10_000            # rows in a plain JSON response; stream for more
+THREADS    = 64                # concurrent blocking calls (Gemini round-trips + queries)
+NDJSON     = "application/x-ndjson"
+
+def _dumps(obj):
+    return json.dumps(obj, default=str, ensure_ascii=False, separators=(",", ":"))
+
+def _json(obj, status=200):
+    return Response(_dumps(obj), status, media_type="application/json")
+
+def _error(msg, status):
+    return _json({"error": msg}, status)
+
+async def _body(request, *required):
+    try:
+        body = await request.json()
+    except ValueError:
+        body = None
+    if not isinstance(body, dict): return None, _error("expected a JSON object", 400)
+    missing = [k for k in required if not isinstance(body.get(k), str) or not body[k].strip()]
+    if missing: return None, _error(f"missing {', '.join(missing)}", 400)
+    return body, None
+
+def _streaming(request, body):
+    return bool(body.get("stream")) or NDJSON in request.headers.get("accept", "")
+
+# ── Results ────────────────────────────────────────────────
+def _rows(sql):
+    """Plain JSON result: (columns, rows up to MAX_ROWS, truncated, sql ms)."""
+    t0 = time.perf_counter()
+    cols, chunks = core.iter_sql(sql, DB)
+    rows = []
+    try:
+        for batch in chunks:
+            rows += batch
+            if len(rows) > MAX_ROWS: break
+    finally:
+        chunks.close()
+    return cols, rows[:MAX_ROWS], len(rows) > MAX_ROWS, (time.perf_counter() - t0) * 1000
+
+def _ndjson(head, sql, timings):
+    """Lines for a streamed result; runs in Starlette's thread pool as the client reads."""
+    yield _dumps(dict(head, type="sql")) + "\n"
+    t0, n = time.perf_counter(), 0
+    try:
+        cols, chunks = core.iter_sql(sql, DB)
+        yield _dumps({"type": "columns", "columns": cols}) + "\n"
+        for batch in chunks:
+            n += len(batch)
+            yield _dumps({"type": "rows", "rows": batch}) + "\n"
+    except sqlite3.Error as e:
+        yield _dumps({"type": "error", "error": str(e)}) + "\n"; return
+    timings = dict(timings, sql_ms=(time.perf_counter() - t0) * 1000)
+    yield _dumps({"type": "done", "row_count": n, "timings": timings}) + "\n"
+
+async def _respond(request, body, head, timings):
+    sql = head["sql"]
+    if not core.is_safe_sql(sql):
+        return _json(dict(head, error="blocked: only read-only queries are allowed"), 400)
+    if not core.returns_rows(sql):
+        return _json(dict(head, error="blocked: only SELECT / WITH queries can be run"), 400)
+    if _streaming(request, body):
+        return StreamingResponse(_ndjson(head, sql, timings), media_type=NDJSON)
+    try:
+        cols, rows, truncated, ms = await run_in_threadpool(_rows, sql)
+    except sqlite3.Error as e:
+        return _json(dict(head, error=str(e)), 400)
+    return _json(dict(head, columns=cols, rows=rows, row_count=len(rows), truncated=truncated,
+                      timings=dict(timings, sql_ms=ms)))
+
+# ── Endpoints ──────────────────────────────────────────────
+async def health(request):
+    return _json({"ok": True, "backend": type(core.backend()).__name__, "db": DB, "degraded_s": round(core.degraded())})
+
+async def sql(request):
+    body, err = await _body(request, "question")
+    if err: return err
+    try:
+        return _json(await run_in_threadpool(core.generate, body["question"], DB))
+    except core.AIUnavailable as e:
+        return _error(str(e), 503)
+
+async def query(request):
+    body, err = await _body(request, "question")
+    if err: return err
+    try:
+        out = await run_in_threadpool(core.generate, body["question"], DB)
+        if body.get("explain") and out["safe"] and out["engine"] == "gemini":
+            t0 = time.perf_counter()
+            out["explanation"] = await run_in_threadpool(core.explain_sql, out["sql"])
+            out["timings"]["explain_ms"] = (time.perf_counter() - t0) * 1000
+    except core.AIUnavailable as e:
+        return _error(str(e), 503)
+    timings = out.pop("timings")
+    return await _respond(request, body, out, timings)
+
+async def run(request):
+    body, err = await _body(request, "sql")
+    if err: return err
+    return await _respond(request, body, {"sql": body["sql"]}, {})
+
+async def explain(request):
+    body, err = await _body(request, "sql")
+    if err: return err
+    try:
+        return _json({"sql": body["sql"], "explanation": await run_in_threadpool(core.explain_sql, body["sql"])})
+    except core.AIUnavailable as e:
+        return _error(str(e), 503)
+
+async def workload(request):
+    return _json({"shapes": sqlnorm.workload_stats(int(request.query_params.get("n", 20)))})
+
+@contextlib.asynccontextmanager
+async def lifespan(app):
+    import anyio.to_thread
+    anyio.to_thread.current_default_thread_limiter().total_tokens = THREADS
+    yield
+
+app = Starlette(routes=[Route("/health", health), Route("/sql", sql, methods=["POST"]),
+                        Route("/query", query, methods=["POST"]), Route("/run", run, methods=["POST"]),
+                        Route("/explain", explain, methods=["POST"]), Route("/workload", workload)],
+                lifespan=lifespan)
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="IntelliSQL HTTP API")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8000)
+    ap.add_argument("--stub", type=float, metavar="SECONDS", help="use the stub Gemini backend with this latency")
+    args = ap.parse_args()
+    if args.stub is not None:
+        from stubgemini import StubGemini
+        core.set_backend(StubGemini(latency=args.stub))
+    import uvicorn
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
@@ -0,0 +1,164 @@
+"""Answer a file of questions offline through the page_query pipeline.
+
+    python batch.py questions.txt -o answers.jsonl
+    python batch.py grading.csv -o answers.jsonl --gemini 8 --sql 4 --format parquet
+    python batch.py questions.jsonl -o answers.jsonl --stub 0.3      # no network
+
+Input is a .txt file (one question per line), a .csv with a "question" column (or the first
+column) and an optional "id" column, or .jsonl with {"question": ..., "id": ...} per line.
+Each answered question becomes one JSONL line: id, question, english, sql, row_count,
+result file, timings and error. Lines are written as they finish and flushed, so an
+interrupted run picks up where it stopped when started again with the same output file;
+--retry-errors also redoes the questions that failed.
+"""
+import argparse, csv, hashlib, json, os, sys, time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import core
+from exports import FORMATS, query_source, write
+
+GEMINI_CONCURRENCY = 4      # questions in flight at Gemini at once
+SQL_WORKERS        = 4      # queries executed in parallel
+
+# ── Input ──────────────────────────────────────────────────
+def read_questions(path):
+    """[(id, question)] from .txt / .csv / .jsonl; ids default to the 1-based position."""
+    ext = os.path.splitext(path)[1].lower()
+    with open(path, encoding="utf-8-sig", newline="") as f:
+        if ext == ".jsonl":
+            items = [json.loads(line) for line in f if line.strip()]
+            rows = [(d.get("id"), d.get("question", "")) for d in items]
+        elif ext == ".csv":
+            r = csv.DictReader(f)
+            qcol = next((c for c in r.fieldnames or [] if c.strip().lower() == "question"), (r.fieldnames or [None])[0])
+            icol = next((c for c in r.fieldnames or [] if c.strip().lower() == "id"), None)
+            rows = [(d.get(icol) if icol else None, d.get(qcol) or "") for d in r]
+        else:
+            rows = [(None, line) for line in f]
+    out = [(str(i if qid in (None, "") else qid), q.strip()) for i, (qid, q) in enumerate(rows, start=1)]
+    return [(qid, q) for qid, q in out if q]
+
+def done_ids(path, retry_errors=False):
+    """Ids already answered in an existing output file. A line cut off by a crash is removed;
+    with retry_errors failed ids are run again (the later line for an id is the current one)."""
+    done = set()
+    if not os.path.exists(path): return done
+    with open(path, "rb+") as f:
+        data = f.read()
+        if data and not data.endswith(b"\n"): f.truncate(data.rfind(b"\n") + 1)
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                rec = json.loads(line)
+            except ValueError:
+                continue
+            if retry_errors and rec.get("error"): done.discard(rec["id"])
+            else:                                 done.add(rec["id"])
+    return done
+
+# ── Pipeline ───────────────────────────────────────────────
+class Batch:
+    """Two pools: Gemini-bound SQL generation limited to `gemini` threads, and query execution
+    + result writing on `sql` threads, so slow model calls never hold up finished queries."""
+    def __init__(self, db="student.db", results_dir=None, fmt="csv", gemini=GEMINI_CONCURRENCY, sql=SQL_WORKERS):
+        self.db, self.dir, self.fmt = db, results_dir, fmt
+        self.gen  = ThreadPoolExecutor(gemini, thread_name_prefix="batch-gemini")
+        self.exec = ThreadPoolExecutor(sql, thread_name_prefix="batch-sql")
+        if results_dir: os.makedirs(results_dir, exist_ok=True)
+
+    def _generate(self, qid, question):
+        t0 = time.perf_counter()
+        try:
+            out = {"id": qid, **core.generate(question, self.db)}
+        except Exception as e:
+            return {"id": qid, "question": question, "error": f"{type(e).__name__}: {e}",
+                    "timings": {"generate_ms": (time.perf_counter() - t0) * 1000}}
+        return out
+
+    def _execute(self, rec):
+        if "error" not in rec: self._run_sql(rec)
+        rec["timings"]["total_ms"] = sum(rec["timings"].values())
+        return rec
+
+    def _run_sql(self, rec):
+        if not rec.pop("safe"):
+            rec["error"] = "blocked: not a read-only query"; return
+        t0 = time.perf_counter()
+        try:
+            source = query_source(self.db, rec["sql"], readonly=True)
+            if self.dir:
+                path = os.path.join(self.dir, f"{_safe_name(rec['id'])}.{FORMATS[self.fmt][1]}")
+                with open(path + ".part", "wb") as f: rec["row_count"] = write(self.fmt, source, f)
+                os.replace(path + ".part", path)
+                rec["result"] = path
+            else:
+                rec["row_count"] = sum(len(b) for b in source[1])
+        except Exception as e:
+            rec["error"] = f"{type(e).__name__}: {e}"
+        rec["timings"]["sql_ms"] = (time.perf_counter() - t0) * 1000
+
+    def run(self, questions, out):
+        """Answer questions, calling out(record) for each as it completes (from this thread)."""
+        gen, execs = {self.gen.submit(self._generate, qid, q) for qid, q in questions}, set()
+        while gen or execs:
+            finished, _ = wait(gen | execs, return_when=FIRST_COMPLETED)
+            for fut in finished:
+                if fut in gen:
+                    gen.discard(fut); execs.add(self.exec.submit(self._execute, fut.result()))
+                else:
+                    execs.discard(fut); out(fut.result())
+
+    def close(self):
+        self.gen.shutdown(cancel_futures=True); self.exec.shutdown(cancel_futures=True)
+
+def _safe_name(qid):
+    """Readable file name for a question id; the hash of the raw id keeps ids that read alike
+    ("a/b", "a b") or share a long prefix from writing to the same file."""
+    stem = "".join(c if c.isalnum() or c in "-_" else "_" for c in qid)[:80] or "q"
+    return f"{stem}-{hashlib.sha1(qid.encode()).hexdigest()[:8]}"
+
+# ── CLI ────────────────────────────────────────────────────
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Run a file of questions through IntelliSQL")
+    ap.add_argument("input", help=".txt, .csv or .jsonl file of questions")
+    ap.add_argument("-o", "--output", required=True, help="JSONL results (appended to when resuming)")
+    ap.add_argument("--db", default="student.db")
+    ap.add_argument("--results", help="directory for result files (default: <output>.results)")
+    ap.add_argument("--format", default="csv", choices=list(FORMATS))
+    ap.add_argument("--no-results", action="store_true", help="only count rows, write no result files")
+    ap.add_argument("--gemini", type=int, default=GEMINI_CONCURRENCY, help="concurrent Gemini calls")
+    ap.add_argument("--sql", type=int, default=SQL_WORKERS, help="parallel query workers")
+    ap.add_argument("--retry-errors", action="store_true", help="redo questions that failed last time")
+    ap.add_argument("--stub", type=float, metavar="SECONDS", help="use the offline Gemini stub with this latency")
+    args = ap.parse_args(argv)
+    if args.stub is not None:
+        from stubgemini import StubGemini
+        core.set_backend(StubGemini(latency=args.stub))
+
+    questions = read_questions(args.input)
+    done = done_ids(args.output, args.retry_errors)
+    todo = [(qid, q) for qid, q in questions if qid not in done]
+    print(f"{len(questions)} questions, {len(questions) - len(todo)} already answered, {len(todo)} to run", file=sys.stderr)
+    if not todo: return 0
+
+    results = None if args.no_results else (args.results or os.path.splitext(args.output)[0] + ".results")
+    batch = Batch(args.db, results, args.format, args.gemini, args.sql)
+    counts, t0 = {"ok": 0, "error": 0}, time.perf_counter()
+    with open(args.output, "a", encoding="utf-8") as f:
+        def out(rec):
+            f.write(json.dumps(rec, ensure_ascii=False, default=str) + "\n"); f.flush()
+            counts["error" if rec.get("error") else "ok"] += 1
+            n = counts["ok"] + counts["error"]
+            if n % 25 == 0 or n == len(todo):
+                print(f"  {n}/{len(todo)} · {counts['error']} errors · {n / (time.perf_counter() - t0):.1f} q/s", file=sys.stderr)
+        try:
+            batch.run(todo, out)
+        except KeyboardInterrupt:
+            print("Interrupted — run the same command again to resume.", file=sys.stderr)
+            return 130
+        finally:
+            batch.close()
+    return 1 if counts["error"] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,613 @@
+"""IntelliSQL micro-benchmarks.
+
+    python bench.py              # run every offline benchmark
+    python bench.py fewshot      # run selected sections
+    python bench.py --live       # also time real Gemini calls (needs GOOGLE_API_KEY)
+"""
+import argparse, os, statistics, tempfile, time
+
+from settings import approx_tokens
+
+QUESTIONS = [
+    "How many students?", "All CSE students", "Highest marks?", "Average marks?",
+    "All AIML students", "Section A students", "All female students", "Top 5 students",
+    "Class-wise average marks", "Marks above 80?", "Marks below 50?", "Gender-wise count",
+    "Section wise count", "Pass count by class", "Girls in Data Science section B",
+    "Which department has the best average score?", "Boys scoring under 40 in CAI",
+]
+
+def timed(fn, repeat=200):
+    """Median wall time of fn() in milliseconds."""
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter(); fn(); samples.append((time.perf_counter() - t0) * 1000)
+    return statistics.median(samples)
+
+def header(title):
+    print("\n" + "=" * 70); print(f"{title:^70}"); print("=" * 70)
+
+# ── Few-shot prompt selection ──────────────────────────────
+def bench_fewshot(live=False):
+    from prompts import BASE_PROMPT, ExampleStore, split_prompt, fewshot_prompt
+    header("Few-shot selection — prompt size & latency")
+    with tempfile.TemporaryDirectory() as tmp:
+        store = ExampleStore(split_prompt(BASE_PROMPT)[1], path=os.path.join(tmp, "ex.db"))
+        full  = [BASE_PROMPT + f"\n\nQuestion: {q}\nSQL:" for q in QUESTIONS]
+        few   = [fewshot_prompt(store, q) + f"\n\nQuestion: {q}\nSQL:" for q in QUESTIONS]
+        print(f"{'Prompt':<12} {'Avg chars':>10} {'Avg tokens':>11} {'Build ms':>10}")
+        print("-" * 46)
+        for label, prompts, build in [
+            ("full",   full, lambda: [BASE_PROMPT + q for q in QUESTIONS]),
+            ("few-shot", few, lambda: [fewshot_prompt(store, q) for q in QUESTIONS]),
+        ]:
+            chars = statistics.mean(len(p) for p in prompts)
+            toks  = statistics.mean(approx_tokens(p) for p in prompts)
+            print(f"{label:<12} {chars:>10.0f} {toks:>11.0f} {timed(build, 50)/len(QUESTIONS):>10.3f}")
+        saved = 1 - sum(map(len, few)) / sum(map(len, full))
+        print(f"\n  Input size reduction : {saved:.0%}")
+        if live: _live_latency(full, few)
+
+def _live_latency(full, few):
+    from google import genai
+    client = genai.Client(api_key=os.getenv("GOOGLE_API_KEY"))
+    model  = "models/gemini-2.0-flash-lite"
+    for label, prompts in [("full", full), ("few-shot", few)]:
+        samples = []
+        for p in prompts:
+            t0 = time.perf_counter()
+            client.models.generate_content(model=model, contents=p)
+            samples.append((time.perf_counter() - t0) * 1000)
+        print(f"  Gemini {label:<9}: median {statistics.median(samples):7.0f} ms  p90 "
+              f"{sorted(samples)[int(len(samples)*0.9)]:7.0f} ms")
+
+# ── Chatbot conversation context ───────────────────────────
+def bench_chat(live=False):
+    from conversation import ConversationState
+    header("Chatbot context — prompt size per turn")
+    convo, raw = ConversationState(), []
+    reply = "**SQL:** `{}`\n\n**42 result(s) found.**"
+    print(f"{'Turn':>6} {'Raw last-8 tokens':>18} {'State tokens':>13}")
+    print("-" * 40)
+    for turn in range(1, 61):
+        q   = QUESTIONS[turn % len(QUESTIONS)]
+        sql = f"SELECT * FROM STUDENT WHERE CLASS='CSE' AND MARKS > {turn} ORDER BY MARKS DESC;"
+        raw += [f"User: {q}", "Assistant: " + reply.format(sql)]
+        convo.update(q, sql, 42)
+        if turn in (1, 5, 10, 20, 40, 60):
+            print(f"{turn:>6} {approx_tokens(chr(10).join(raw[-8:])):>18} {approx_tokens(convo.render()):>13}")
+    print(f"\n  State update: {timed(lambda: convo.update('now only section A', sql, 12)) * 1000:.1f} µs/turn")
+
+# ── Local follow-up refinement ─────────────────────────────
+def bench_refine(live=False):
+    from refine import refine
+    header("Chatbot follow-ups — local SQL rewriting")
+    prev = "SELECT * FROM STUDENT WHERE CLASS='CSE';"
+    follow = ["now only section A", "sort by marks", "just the top 10", "only girls",
+              "between 60 and 80", "above 80 but below 90", "only boys and girls", "above 80 and above 90",
+              "how many?", "who is their class teacher?"]
+    print(f"{'Follow-up':<30} {'Local':>6} {'ms':>8}")
+    print("-" * 46)
+    for f in follow:
+        hit = refine(f, prev) is not None
+        print(f"{f:<30} {'yes' if hit else 'LLM':>6} {timed(lambda: refine(f, prev)):>8.3f}")
+
+# ── Streaming exports ──────────────────────────────────────
+def make_student_db(path, n):
+    """A STUDENT table with n synthetic rows, for benchmarks that need volume."""
+    import random, sqlite3
+    rnd  = random.Random(7)
+    conn = sqlite3.connect(path)
+    conn.execute("DROP TABLE IF EXISTS STUDENT")
+    conn.execute("CREATE TABLE STUDENT (NAME VARCHAR(50), CLASS VARCHAR(30), SECTION VARCHAR(5), GENDER VARCHAR(10), MARKS INT)")
+    classes = ["CSE", "Data Science", "AIML", "CSE-AIML", "CAI"]
+    conn.executemany("INSERT INTO STUDENT VALUES (?,?,?,?,?)",
+                     ((f"Student{i}", rnd.choice(classes), rnd.choice("ABC"), rnd.choice(["Male", "Female"]),
+                       rnd.randint(25, 100)) for i in range(n)))
+    conn.commit(); conn.close()
+
+def bench_export(live=False, n=100_000):
+    import sqlite3, tracemalloc
+    import pandas as pd
+    from exports import FORMATS, write, query_source
+    header(f"Streaming exports — {n:,} rows")
+
+    def old_csv(db, out):
+        conn = sqlite3.connect(db); df = pd.read_sql_query("SELECT * FROM STUDENT", conn); conn.close()
+        out.write(df.to_csv(index=False).encode())
+    def old_html(db, out):
+        conn = sqlite3.connect(db); df = pd.read_sql_query("SELECT * FROM STUDENT", conn); conn.close()
+        out.write("".join("<tr>"+"".join(f"<td>{v}</td>" for v in r)+"</tr>" for _, r in df.iterrows()).encode())
+    runs = [(fmt, lambda db, out, fmt=fmt: write(fmt, query_source(db, "SELECT * FROM STUDENT"), out)) for fmt in FORMATS]
+    runs += [("csv (old)", old_csv), ("html (old)", old_html)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = os.path.join(tmp, "bench.db"); make_student_db(db, n)
+        print(f"{'Format':<11} {'Seconds':>8} {'Rows/s':>10} {'MB out':>8} {'Peak MB':>8}")
+        print("-" * 49)
+        for label, fn in runs:
+            out = os.path.join(tmp, "out")
+            t0 = time.perf_counter()
+            with open(out, "wb") as f: fn(db, f)
+            secs = time.perf_counter() - t0
+            tracemalloc.start()
+            with open(out, "wb") as f: fn(db, f)
+            peak = tracemalloc.get_traced_memory()[1]; tracemalloc.stop()
+            print(f"{label:<11} {secs:>8.2f} {n/secs:>10,.0f} {os.path.getsize(out)/2**20:>8.1f} {peak/2**20:>8.1f}")
+
+def bench_email(live=False, n=20, handshake=0.1):
+    import smtplib
+    from email.mime.text import MIMEText
+    from outbox import Outbox
+    from smtpstub import SMTPStub
+    header(f"Email outbox — {n} recipients, {handshake*1000:.0f} ms simulated connect + login")
+
+    def inline(host, port):         # the old send_email: one connection and login per message
+        for i in range(n):
+            msg = MIMEText("<p>results</p>", "html"); msg["Subject"] = "IntelliSQL"
+            with smtplib.SMTP(host, port) as s:
+                s.login("me@example.com", "pw"); s.send_message(msg, "me@example.com", [f"r{i}@example.com"])
+
+    print(f"{'Path':<10} {'UI blocked ms':>14} {'Delivered ms':>13} {'Connections':>12} {'Sent':>6}")
+    print("-" * 59)
+    with tempfile.TemporaryDirectory() as tmp:
+        with SMTPStub(connect_delay=handshake / 2, auth_delay=handshake / 2) as stub:
+            t0 = time.perf_counter(); inline(stub.host, stub.port); ms = (time.perf_counter() - t0) * 1000
+            print(f"{'inline':<10} {ms:>14.0f} {ms:>13.0f} {stub.connections:>12} {len(stub.messages):>6}")
+        with SMTPStub(connect_delay=handshake / 2, auth_delay=handshake / 2, fail_next=2) as stub:
+            box = Outbox(path=os.path.join(tmp, "outbox.db"), server=(stub.host, stub.port), backoff=0.05)
+            t0 = time.perf_counter()
+            box.enqueue("bench", "me@example.com", "pw", [f"r{i}@example.com" for i in range(n)], "IntelliSQL", "<p>results</p>")
+            ui = (time.perf_counter() - t0) * 1000
+            box.drain(); total = (time.perf_counter() - t0) * 1000
+            print(f"{'outbox':<10} {ui:>14.1f} {total:>13.0f} {stub.connections:>12} {len(stub.messages):>6}")
+            print(f"\n  Outbox retries (2 injected 451s): {box.counts['retries']}, failed: {box.counts['failed']}")
+            box.close()
+
+def bench_saved(live=False, n=100_000):
+    import sqlite3
+    import pandas as pd
+    from exports import ExportCache, FORMATS
+    from savedqueries import SavedQueries
+    header(f"Saved reports — opening a {n:,}-row report")
+    sql = "SELECT * FROM STUDENT WHERE MARKS >= 40"
+    with tempfile.TemporaryDirectory() as tmp:
+        db = os.path.join(tmp, "bench.db"); make_student_db(db, n)
+        cache = ExportCache(os.path.join(tmp, "exports"))
+        saved = SavedQueries(os.path.join(tmp, "saved.db"), tmp, exports=cache, tick=0.1)
+        sid = saved.save("bench", "passing students", sql, db)
+        while not cache.stats()["builds"] == len(FORMATS): time.sleep(0.05)
+
+        def cold():                 # what opening the report costs without the scheduler
+            conn = sqlite3.connect(db); df = pd.read_sql_query(sql, conn); conn.close()
+            for fmt in FORMATS: cache.read(fmt, db, sql, question="passing students", sql=sql)
+            return df.head(200)
+        def warm():
+            r = next(r for r in saved.list() if r["ID"] == sid)
+            saved.preview(sid)
+            for fmt in FORMATS: cache.read(fmt, db, sql, **saved.export(r))
+        t0 = time.perf_counter(); cold(); cold_ms = (time.perf_counter() - t0) * 1000
+        print(f"  Query + build all exports : {cold_ms:9.0f} ms")
+        print(f"  Open precomputed report   : {timed(warm, 5):9.1f} ms")
+        builds = cache.stats()["builds"]
+        conn = sqlite3.connect(db); conn.execute("UPDATE STUDENT SET MARKS=MARKS+1 WHERE MARKS < 30"); conn.commit(); conn.close()   # rows outside the result
+        saved.wake.set()
+        while saved.counts["runs"] < 2: time.sleep(0.05)
+        print(f"  Exports rebuilt after a write that leaves the result unchanged: {cache.stats()['builds'] - builds}")
+        saved.close()
+
+def bench_chart(live=False):
+    import sqlite3
+    import pandas as pd
+    import plotly.express as px
+    from charts import CHART_TYPES, build_figure
+    header("render_chart — build time and figure size")
+
+    def old(df, ctype):             # the previous render_chart: whole frame, coloured by the first text column
+        color = None if ctype == "Pie" else df.select_dtypes(include=["object", "string"]).columns[0]
+        fn = {"Bar": px.bar, "Line": px.line, "Area": px.area, "Scatter": px.scatter}.get(ctype)
+        return px.pie(df, names="NAME", values="MARKS") if fn is None else fn(df, x="NAME", y="MARKS", color=color)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = os.path.join(tmp, "bench.db"); make_student_db(db, 100_000)
+        conn = sqlite3.connect(db); full = pd.read_sql_query("SELECT * FROM STUDENT", conn); conn.close()
+        print(f"{'Chart':<10} {'Rows':>8} {'Old ms':>8} {'Old KB':>8} {'New ms':>8} {'New KB':>8}")
+        print("-" * 55)
+        for ctype in CHART_TYPES:
+            for n in (1_000, 100_000):
+                df = full.head(n)
+                t0 = time.perf_counter(); fig, _ = build_figure(df, ctype, "NAME", "MARKS"); kb = len(fig.to_json()) / 1024
+                new_ms = (time.perf_counter() - t0) * 1000
+                if n <= 1_000 and ctype != "Histogram":
+                    t0 = time.perf_counter(); f = old(df, ctype); okb = len(f.to_json()) / 1024
+                    cells = f"{(time.perf_counter() - t0) * 1000:>8.0f} {okb:>8.0f}"
+                else:
+                    cells = f"{'—':>8} {'—':>8}"
+                print(f"{ctype:<10} {n:>8,} {cells} {new_ms:>8.0f} {kb:>8.0f}")
+        print("\n  (old path skipped above 1,000 rows: one trace per NAME makes it take minutes)")
+
+def bench_dashboard(live=False, n=100_000):
+    import sqlite3
+    import pandas as pd
+    import plotly.express as px, plotly.io as pio
+    header(f"Dashboard rerun — {n:,} students")
+
+    def old(db):                    # previous page_dashboard: full frame, six figures every rerun
+        conn = sqlite3.connect(db); df = pd.read_sql_query("SELECT * FROM STUDENT", conn); conn.close()
+        figs = [px.bar(df.groupby("CLASS")["MARKS"].mean().reset_index(), x="CLASS", y="MARKS", color="CLASS"),
+                px.pie(df["GENDER"].value_counts().reset_index(), names="GENDER", values="count", hole=0.45),
+                px.histogram(df, x="MARKS", nbins=10), px.bar(df.nlargest(8, "MARKS"), x="NAME", y="MARKS", color="CLASS")]
+        df2 = df.copy(); df2["Status"] = df2["MARKS"].apply(lambda x: "Pass" if x >= 40 else "Fail")
+        figs.append(px.bar(df2.groupby(["CLASS","Status"])["NAME"].count().reset_index(), x="CLASS", y="NAME", color="Status"))
+        figs.append(px.imshow(df.groupby(["CLASS","SECTION"])["MARKS"].mean().reset_index()
+                              .pivot(index="CLASS", columns="SECTION", values="MARKS")))
+        return sum(len(f.to_json()) for f in figs) + len(df.sort_values("MARKS").to_json())
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = os.path.join(tmp, "bench.db"); make_student_db(db, n)
+        t0 = time.perf_counter(); sent = old(db); ms = (time.perf_counter() - t0) * 1000
+        print(f"  Old rerun (6 figures + full table) : {ms:8.0f} ms  {sent/2**20:6.1f} MB to browser")
+        from dashboard import dashboard_specs
+        t0 = time.perf_counter(); _, figs = dashboard_specs(db); ms = (time.perf_counter() - t0) * 1000
+        print(f"  New, first visit per data version  : {ms:8.0f} ms")
+        in_view = [figs[k] for k in ("class_avg", "gender", "histogram")]
+        revisit = lambda: [pio.from_json(f) for f in in_view]      # cached specs, tabs closed
+        print(f"  New revisit (3 figures in view)    : {timed(revisit, 20):8.1f} ms  {sum(map(len, in_view))/2**20:6.2f} MB to browser")
+
+def bench_grid(live=False, n=1_000_000):
+    import sqlite3
+    import pandas as pd
+    from grid import Grid, index_sql
+    header(f"Paginated grid — {n:,} rows, 50 per page, sorted by MARKS")
+    with tempfile.TemporaryDirectory() as tmp:
+        db = os.path.join(tmp, "bench.db"); make_student_db(db, n)
+        conn = sqlite3.connect(db); conn.execute(index_sql("STUDENT", "MARKS")); conn.close()
+        g = Grid(db, "STUDENT")
+        cursors, cur = [None], None
+        for _ in range(2_000):
+            _, cur = g.page("MARKS", True, cur, size=50); cursors.append(cur)
+        conn = sqlite3.connect(db)
+        offset = lambda p: conn.execute("SELECT * FROM STUDENT ORDER BY MARKS DESC LIMIT 50 OFFSET ?", (p * 50,)).fetchall()
+        print(f"{'Page':>8} {'Grid.page ms':>13} {'Raw OFFSET ms':>14}")
+        print("-" * 37)
+        for p in (0, 100, 2_000):
+            print(f"{p + 1:>8,} {timed(lambda: g.page('MARKS', True, cursors[p], size=50), 20):>13.2f} {timed(lambda: offset(p), 20):>14.2f}")
+        print("  (Grid.page includes connect + DataFrame; OFFSET grows with depth, keyset stays flat)")
+        print(f"\n  Estimated count      : {timed(lambda: g.estimate(), 20):8.2f} ms  (COUNT(*): "
+              f"{timed(lambda: conn.execute('SELECT COUNT(*) FROM STUDENT').fetchone(), 5):.1f} ms)")
+        t0 = time.perf_counter(); df = pd.read_sql_query("SELECT * FROM STUDENT", conn)
+        print(f"  Old full-table load  : {(time.perf_counter() - t0) * 1000:8.0f} ms, "
+              f"{df.memory_usage(deep=True).sum() / 2**20:.0f} MB frame")
+        conn.close()
+
+def bench_search(live=False, n=1_000_000):
+    import sqlite3
+    import pandas as pd
+    from search import build_fts, search_students
+    header(f"Manage delete search — {n:,} students")
+    with tempfile.TemporaryDirectory() as tmp:
+        db = os.path.join(tmp, "bench.db"); make_student_db(db, n)
+        t0 = time.perf_counter(); build_fts(db)
+        print(f"  One-time FTS5 trigram build      : {(time.perf_counter() - t0):8.1f} s")
+        old_n = min(n, 100_000)
+        conn = sqlite3.connect(db)
+        t0 = time.perf_counter()
+        df = pd.read_sql_query(f"SELECT rowid,* FROM STUDENT ORDER BY NAME LIMIT {old_n}", conn)
+        {f"{r['NAME']} | {r['CLASS']} | Sec {r['SECTION']} | {r['MARKS']} marks": r["rowid"] for _, r in df.iterrows()}
+        print(f"  Old selectbox options ({old_n:,} rows): {(time.perf_counter() - t0) * 1000:8.0f} ms per rerun")
+        conn.close()
+        for q in ("St", "Stu", "udent4242", "Student99999", "Data Sci"):
+            print(f"  search {q!r:<16}            : {timed(lambda: search_students(db, q), 20):8.2f} ms")
+        t0 = time.perf_counter()
+        conn = sqlite3.connect(db)
+        conn.executemany("INSERT INTO STUDENT VALUES (?,?,?,?,?)", [(f"New{i}", "CSE", "A", "Male", 50) for i in range(1_000)])
+        conn.commit(); conn.close()
+        print(f"  1,000 inserts with FTS triggers  : {(time.perf_counter() - t0) * 1000:8.0f} ms")
+
+def bench_bulk(live=False, n=2_000):
+    import sqlite3
+    import bulk
+    from search import build_fts
+    header(f"Manage bulk import — {n:,} students into a 100,000-row table")
+    rows = [(f"Bulk{i}", "CSE", "A", "Male", i % 101) for i in range(n)]
+    with tempfile.TemporaryDirectory() as tmp:
+        db = os.path.join(tmp, "bench.db"); make_student_db(db, 100_000)
+        build_fts(db)
+        t0 = time.perf_counter()
+        for r in rows:                       # the old form: one connection + commit per student
+            conn = sqlite3.connect(db)
+            conn.execute("INSERT INTO STUDENT VALUES (?,?,?,?,?)", r); conn.commit(); conn.close()
+        print(f"  One commit per row               : {(time.perf_counter() - t0) * 1000:8.0f} ms")
+        t0 = time.perf_counter(); good, bad = bulk.validate(bulk.parse_text("\n".join(",".join(map(str, r)) for r in rows)))
+        print(f"  Parse + validate                 : {(time.perf_counter() - t0) * 1000:8.0f} ms ({len(good):,} ok, {len(bad)} rejected)")
+        t0 = time.perf_counter(); bulk.insert_students(db, good)
+        print(f"  One executemany transaction      : {(time.perf_counter() - t0) * 1000:8.0f} ms")
+        conn = sqlite3.connect(db)
+        ids = [r[0] for r in conn.execute("SELECT rowid FROM STUDENT WHERE NAME LIKE 'Bulk%'")]; conn.close()
+        t0 = time.perf_counter(); bulk.shift_marks(db, ids, 5)
+        print(f"  {f'Shift {len(ids):,} marks (one txn)':<33}: {(time.perf_counter() - t0) * 1000:8.0f} ms")
+        t0 = time.perf_counter(); bulk.delete_students(db, ids)
+        print(f"  {f'Delete {len(ids):,} rows (one txn)':<33}: {(time.perf_counter() - t0) * 1000:8.0f} ms")
+
+def bench_cache(live=False, n=100_000, rows=2_000):
+    import sqlite3
+    from depcache import DepCache
+    from dashboard import dashboard_specs
+    header(f"Dependency-tracked caches — {n:,} students")
+    with tempfile.TemporaryDirectory() as tmp:
+        db = os.path.join(tmp, "bench.db"); make_student_db(db, n)
+        conn = sqlite3.connect(db); conn.execute("CREATE TABLE NOTES(TXT)"); conn.commit()
+        batch = [(f"New{i}", "CSE", "A", "Male", 50) for i in range(rows)]
+        t0 = time.perf_counter(); conn.executemany("INSERT INTO STUDENT VALUES (?,?,?,?,?)", batch); conn.commit()
+        plain = (time.perf_counter() - t0) * 1000
+        cache = DepCache(); cache.track(db)
+        dash  = cache.cached("STUDENT")(dashboard_specs)
+        notes = cache.cached("NOTES")(lambda d: sqlite3.connect(d).execute("SELECT COUNT(*) FROM NOTES").fetchone())
+        notes(db)
+        print(f"  Dashboard computed               : {timed(lambda: dash(db), 1):8.1f} ms")
+        t0 = time.perf_counter(); conn.executemany("INSERT INTO STUDENT VALUES (?,?,?,?,?)", batch); conn.commit()
+        print(f"  {rows:,} inserts, plain / triggers : {plain:5.0f} / {(time.perf_counter() - t0) * 1000:.0f} ms")
+        dash(db)
+        print(f"  Hit (data_version unchanged)     : {timed(lambda: dash(db), 2000):8.3f} ms")
+        conn.execute("INSERT INTO NOTES VALUES ('x')"); conn.commit()
+        t0 = time.perf_counter(); dash(db); notes(db)
+        print(f"  Write to NOTES, then both read   : {(time.perf_counter() - t0) * 1000:8.1f} ms (dashboard kept)")
+        conn.execute("UPDATE STUDENT SET MARKS = MARKS WHERE rowid = 1"); conn.commit()
+        t0 = time.perf_counter(); dash(db); notes(db)
+        print(f"  Write to STUDENT, then both read : {(time.perf_counter() - t0) * 1000:8.1f} ms (notes kept)")
+        conn.close()
+        s = cache.stats()
+        print(f"  Hit rate {s['hit_rate']:.1%} — " + ", ".join(f"{f}: {c['stale']} stale" for f, c in s["functions"].items()))
+
+def _mixed_load(db, write, readers, writers, seconds):
+    """readers/writers threads hammering db for seconds; write(i) performs one single-row insert."""
+    import sqlite3, threading
+    stop, lock = threading.Event(), threading.Lock()
+    out = {"reads": 0, "writes": 0, "locked": 0, "read_ms": []}
+    def reader():
+        while not stop.is_set():
+            t0 = time.perf_counter()
+            try:
+                conn = sqlite3.connect(db)
+                conn.execute("SELECT CLASS, AVG(MARKS) FROM STUDENT WHERE SECTION = 'A' GROUP BY CLASS").fetchall()
+                conn.close()
+                with lock: out["reads"] += 1; out["read_ms"].append((time.perf_counter() - t0) * 1000)
+            except sqlite3.OperationalError:
+                with lock: out["locked"] += 1
+    def writer_(w):
+        i = 0
+        while not stop.is_set():
+            try:
+                write(w * 10_000_000 + i); i += 1
+                with lock: out["writes"] += 1
+            except sqlite3.OperationalError:
+                with lock: out["locked"] += 1
+    threads = [threading.Thread(target=reader) for _ in range(readers)] + \
+              [threading.Thread(target=writer_, args=(w,)) for w in range(writers)]
+    for t in threads: t.start()
+    time.sleep(seconds); stop.set()
+    for t in threads: t.join()
+    ms = sorted(out["read_ms"]) or [0]
+    return out["reads"] / seconds, out["writes"] / seconds, out["locked"], ms[len(ms) // 2], ms[int(len(ms) * 0.99)]
+
+def bench_writer(live=False, n=100_000, readers=4, writers=8, seconds=3):
+    import sqlite3
+    from writer import Writer
+    header(f"Mixed load on student.db — {readers} readers + {writers} writers, {n:,} rows")
+    row = lambda i: (f"W{i}", "CSE", "A", "Male", i % 101)
+    print(f"  {'':<34}{'reads/s':>9}{'writes/s':>10}{'locked':>8}{'read p50':>10}{'p99 ms':>8}")
+    with tempfile.TemporaryDirectory() as tmp:
+        db = os.path.join(tmp, "journal.db"); make_student_db(db, n)
+        def direct(i):                          # the old path: a connection + commit per write
+            conn = sqlite3.connect(db, timeout=1)
+            conn.execute("INSERT INTO STUDENT VALUES (?,?,?,?,?)", row(i)); conn.commit(); conn.close()
+        r = _mixed_load(db, direct, readers, writers, seconds)
+        print(f"  {'Rollback journal, direct commits':<34}{r[0]:9.0f}{r[1]:10.0f}{r[2]:8d}{r[3]:10.1f}{r[4]:8.1f}")
+        db = os.path.join(tmp, "wal.db"); make_student_db(db, n)
+        w = Writer(db)
+        r = _mixed_load(db, lambda i: w.execute("INSERT INTO STUDENT VALUES (?,?,?,?,?)", row(i)), readers, writers, seconds)
+        s = w.stats(); w.close()
+        print(f"  {'WAL + group-commit writer':<34}{r[0]:9.0f}{r[1]:10.0f}{r[2]:8d}{r[3]:10.1f}{r[4]:8.1f}")
+        print(f"  Writer: {s['requests']:,} requests in {s['commits']:,} commits (largest group {s['largest']})")
+
+def bench_api(live=False, requests=600, latency=0.15):
+    import http.client, json, socket, threading
+    import uvicorn
+    import api, core
+    from stubgemini import StubGemini
+    header(f"HTTP API under load — stub Gemini, {requests} requests")
+    sock = socket.socket(); sock.bind(("127.0.0.1", 0)); port = sock.getsockname()[1]; sock.close()
+    server = uvicorn.Server(uvicorn.Config(api.app, port=port, log_level="error"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started: time.sleep(0.05)
+    def load(n, concurrency, stream):
+        """concurrency keep-alive clients splitting n POST /query requests between them."""
+        lat, lock = [], threading.Lock()
+        def client(k):
+            c = http.client.HTTPConnection("127.0.0.1", port)
+            for i in range(k):
+                body = json.dumps({"question": QUESTIONS[i % len(QUESTIONS)], "stream": stream})
+                t0 = time.perf_counter()
+                c.request("POST", "/query", body, {"content-type": "application/json"})
+                r = c.getresponse(); r.read()
+                if r.status != 200: raise RuntimeError(f"HTTP {r.status}")
+                with lock: lat.append((time.perf_counter() - t0) * 1000)
+            c.close()
+        threads = [threading.Thread(target=client, args=(n // concurrency,)) for _ in range(concurrency)]
+        t0 = time.perf_counter()
+        for t in threads: t.start()
+        for t in threads: t.join()
+        lat.sort()
+        return len(lat) / (time.perf_counter() - t0), lat[len(lat) // 2], lat[int(len(lat) * 0.99)]
+    # each /query makes two Gemini calls (language check + NL->SQL)
+    print(f"  {'Gemini call':<12}{'concurrency':>12}{'format':>8}{'req/s':>9}{'p50 ms':>9}{'p99 ms':>9}")
+    for call, conc, stream in [(0, 1, False), (0, 16, False), (0, 16, True),
+                               (latency, 1, False), (latency, 64, False), (latency, 64, True)]:
+        core.set_backend(StubGemini(latency=call))
+        rps, p50, p99 = load(requests if conc > 1 or not call else 10, conc, stream)
+        print(f"  {f'{call * 1000:.0f} ms':<12}{conc:>12}{'ndjson' if stream else 'json':>8}{rps:9.1f}{p50:9.1f}{p99:9.1f}")
+    server.should_exit = True
+
+# ── Cold start ─────────────────────────────────────────────
+HEAVY = ["streamlit", "pandas", "numpy", "pyarrow", "plotly", "google.genai"]
+
+def _importtime(stmt, repeat=3):
+    """(median wall ms, import ms, {heavy package: cumulative ms}) for stmt in a fresh interpreter,
+    read from python -X importtime."""
+    import subprocess, sys
+    runs = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        err = subprocess.run([sys.executable, "-X", "importtime", "-c", stmt], capture_output=True, text=True,
+                             cwd=os.path.dirname(os.path.abspath(__file__)), check=True).stderr
+        wall, total, heavy = (time.perf_counter() - t0) * 1000, 0, {}
+        for line in err.splitlines():
+            if not line.startswith("import time:") or "cumulative" in line: continue
+            _, cum, name = line[12:].split("|")
+            if not name.startswith("  "): total += int(cum) / 1000
+            if name.strip() in HEAVY: heavy.setdefault(name.strip(), int(cum) / 1000)
+        runs.append((wall, total, heavy))
+    runs.sort(key=lambda r: r[0])
+    return runs[len(runs) // 2]
+
+def bench_startup(live=False):
+    from app import PAGES
+    header("Cold start — fresh interpreter, python -X importtime")
+    targets = [(f"first paint: {label}", f"import app, views.{mod}") for label, mod in PAGES.items()]
+    targets += [("worker: api.py", "import api"), ("worker: batch.py", "import batch")]
+    print(f"  {'Process':<26}{'wall ms':>9}{'imports ms':>12}  heavy packages loaded (cumulative ms)")
+    for label, stmt in targets:
+        wall, total, heavy = _importtime(stmt)
+        loaded = ", ".join(f"{m} {ms:.0f}" for m, ms in heavy.items()) or "—"
+        print(f"  {label:<26}{wall:9.0f}{total:12.0f}  {loaded}")
+
+def bench_payload(live=False):
+    from streamlit.runtime import forward_msg_queue
+    from streamlit.runtime.forward_msg_cache import create_reference_msg
+    from streamlit.testing.v1 import AppTest
+    from app import PAGES
+    header("Rerun payload — bytes sent to the browser per page")
+    sent, seen = [0], set()
+    enqueue = forward_msg_queue.ForwardMsgQueue.enqueue
+    def count(self, msg):
+        """Bytes as the server would send them to a browser that keeps its message cache."""
+        ref = msg.metadata.cacheable and msg.hash in seen
+        sent[0] += (create_reference_msg(msg) if ref else msg).ByteSize()
+        if msg.metadata.cacheable: seen.add(msg.hash)
+        return enqueue(self, msg)
+    forward_msg_queue.ForwardMsgQueue.enqueue = count
+    try:
+        at = AppTest.from_file(os.path.join(os.path.dirname(os.path.abspath(__file__)), "app.py"), default_timeout=60)
+        at.run()
+        print(f"  Session start (Home): {sent[0]:,} B\n")
+        print(f"  {'Page':<16}{'open B':>10}{'rerun B':>10}")
+        for label in PAGES:
+            sent[0] = 0; at.sidebar.radio[0].set_value(label).run(); opened = sent[0]
+            sent[0] = 0; at.run()
+            print(f"  {label:<16}{opened:>10,}{sent[0]:>10,}")
+    finally:
+        forward_msg_queue.ForwardMsgQueue.enqueue = enqueue
+
+def bench_stream(live=False, latency=1.0, n=5):
+    import core
+    from stubgemini import StubGemini
+    header("Streaming — time until the first text is visible" + ("" if live else f" (stub, {latency:.1f} s per answer)"))
+    prompts = [f"In 2-3 sentences, what does this ask of a student database? {q}" for q in QUESTIONS[:n]]
+    core.set_backend(core.LiveBackend() if live else StubGemini(latency=latency))
+    blocking, first, full = [], [], []
+    for p in prompts:
+        t0 = time.perf_counter(); core.gemini(p); blocking.append((time.perf_counter() - t0) * 1000)
+        t0, seen = time.perf_counter(), None
+        for _ in core.gemini_stream(p):
+            if seen is None: seen = (time.perf_counter() - t0) * 1000
+        first.append(seen); full.append((time.perf_counter() - t0) * 1000)
+    print(f"  {'gemini() — text shown when complete':<40}{statistics.median(blocking):8.0f} ms")
+    print(f"  {'gemini_stream() — first chunk shown':<40}{statistics.median(first):8.0f} ms")
+    print(f"  {'gemini_stream() — complete':<40}{statistics.median(full):8.0f} ms")
+    core.set_backend(None)
+
+# ── Offline fallback ───────────────────────────────────────
+# Negation, disjunction, per-group top N, ordinals, distinct / same values, comparisons with an
+# aggregate and unknown words: the slots would run the opposite or a different query
+OFFLINE_REFUSED = ["How many students are not female?", "students except CSE", "Students without section A",
+                   "students scoring less than 40 or more than 90", "Top 3 students in each class",
+                   "second highest marks", "students whose name starts with a",
+                   "students with marks greater than average", "how many classes are there",
+                   "students with same marks", "distinct classes"]
+
+def bench_offline(live=False, n=100_000, latency=0.05):
+    import core, fallback
+    from stubgemini import StubGemini
+    header("Offline NL→SQL — no model reachable")
+    print(f"{'Question':<46} {'Conf':>5} {'ms':>7}")
+    print("-" * 60)
+    for q in QUESTIONS:
+        t = fallback.translate(q)
+        print(f"{q:<46} {t.confidence:>5.0%} {timed(lambda: fallback.translate(q)):>7.3f}")
+    print("\n  Refused (confidence below MIN_CONFIDENCE, so AIUnavailable instead of wrong SQL):")
+    for q in OFFLINE_REFUSED:
+        t = fallback.translate(q)
+        verdict = "refused" if t.confidence < fallback.MIN_CONFIDENCE else "RUN: " + t.sql
+        print(f"    {q:<46} {t.confidence:>5.0%}  {verdict}  ({', '.join(t.unmatched)})")
+    with tempfile.TemporaryDirectory() as d:
+        db = os.path.join(d, "big.db"); make_student_db(db, n)
+        t0 = time.perf_counter(); fallback.catalog(db)
+        print(f"\n  Catalog of a {n:,}-row table (first question):  {(time.perf_counter() - t0) * 1000:8.1f} ms")
+    core.set_backend(StubGemini(latency=latency, fail=1.0))
+    t0 = time.perf_counter(); core.generate("Top 5 students")
+    print(f"  generate() while every model fails, first call: {(time.perf_counter() - t0) * 1000:8.1f} ms "
+          f"({len(core.MODELS)} models x 2 tries, {latency * 1000:.0f} ms each)")
+    print(f"  generate() in degraded mode afterwards:         {timed(lambda: core.generate('Top 5 students'), 50):8.1f} ms")
+    core.set_backend(None)
+
+# ── SQL normalization ──────────────────────────────────────
+VARIANTS = [
+    "SELECT CLASS, ROUND(AVG(MARKS),1) AS AVG_MARKS FROM STUDENT GROUP BY CLASS;",
+    "select class, round(avg(marks),1) as AVG_MARKS\nfrom student\ngroup by class",
+    "SELECT s.CLASS, ROUND(AVG(s.MARKS),1) AS AVG_MARKS FROM STUDENT s GROUP BY s.CLASS;;",
+    "SELECT CLASS, ROUND(AVG(MARKS),1) AS avg_score FROM STUDENT GROUP BY CLASS;",
+    "SELECT * FROM STUDENT WHERE CLASS='CSE' AND MARKS > 80;",
+    "SELECT * FROM STUDENT WHERE MARKS>80 AND CLASS='CSE'",
+    "select * from STUDENT where marks > 80 and class = 'CSE';",
+    "SELECT * FROM STUDENT WHERE CLASS='AIML' AND MARKS > 60;",
+    "SELECT * FROM STUDENT WHERE SECTION IN ('A','B') ORDER BY MARKS ASC LIMIT 5;",
+    "SELECT * FROM STUDENT WHERE SECTION IN ('C') ORDER BY MARKS LIMIT 10;",
+]
+
+def bench_normalize(live=False):
+    import pandas as pd
+    import sqlnorm
+    from containment import answer_from_cache
+    header("SQL normalization — cache keys, history and workload grouping")
+    print(f"  {len(VARIANTS)} statements as Gemini writes them: {len({' '.join(v.split()) for v in VARIANTS})} distinct texts, "
+          f"{len(set(map(sqlnorm.normalize, VARIANTS)))} after normalize(), "
+          f"{len(set(map(sqlnorm.fingerprint, VARIANTS)))} query shapes (fingerprint)")
+    for v in VARIANTS[:4]:
+        print(f"    {sqlnorm.fingerprint(v)}  {sqlnorm.normalize(v)}")
+    def cold():
+        sqlnorm.normalize.cache_clear(); sqlnorm.template.cache_clear()
+        for v in VARIANTS: sqlnorm.normalize(v); sqlnorm.fingerprint(v)
+    print(f"\n  normalize() + fingerprint(), uncached:   {timed(cold, 50) / len(VARIANTS) * 1000:8.1f} µs per statement")
+    print(f"  normalize() + fingerprint(), cached:     "
+          f"{timed(lambda: [sqlnorm.fingerprint(v) for v in VARIANTS], 200) / len(VARIANTS) * 1000:8.1f} µs per statement")
+    df = pd.DataFrame({"CLASS": ["AIML", "CSE"], "AVG_MARKS": [71.2, 68.4]})
+    hit = answer_from_cache(VARIANTS[1], VARIANTS[0], df) is not None
+    print(f"  Reformatted aggregate answered from the previous result: {'yes' if hit else 'no'}")
+
+SECTIONS = {"fewshot": bench_fewshot, "chat": bench_chat, "refine": bench_refine,
+            "export": bench_export, "email": bench_email, "saved": bench_saved,
+            "chart": bench_chart, "dashboard": bench_dashboard,
+            "grid": bench_grid, "search": bench_search, "bulk": bench_bulk,
+            "cache": bench_cache, "writer": bench_writer,
+            "api": bench_api, "startup": bench_startup,
+            "payload": bench_payload, "stream": bench_stream, "offline": bench_offline,
+            "normalize": bench_normalize}
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="IntelliSQL benchmarks")
+    ap.add_argument("sections", nargs="*", help=f"any of: {', '.join(SECTIONS)}")
+    ap.add_argument("--live", action="store_true", help="include real Gemini round-trips")
+    args = ap.parse_args()
+    unknown = set(args.sections) - set(SECTIONS)
+    if unknown: ap.error(f"unknown section(s): {', '.join(sorted(unknown))}")
+    for name in args.sections or SECTIONS:
+        SECTIONS[name](live=args.live)
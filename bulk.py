@@ -0,0 +1,92 @@
+import csv, io
+
+import pandas as pd
+
+from writer import writer
+
+COLUMNS = ["NAME", "CLASS", "SECTION", "GENDER", "MARKS"]
+ALIASES = {"STUDENT": "NAME", "DEPARTMENT": "CLASS", "DEPT": "CLASS", "SEC": "SECTION", "SEX": "GENDER",
+           "SCORE": "MARKS", "MARK": "MARKS"}
+GENDERS = {"M": "Male", "MALE": "Male", "BOY": "Male", "F": "Female", "FEMALE": "Female", "GIRL": "Female"}
+MAX_ROWS = 100_000
+
+# ── Parsing ────────────────────────────────────────────────
+def _columns(df):
+    """Map header names onto STUDENT columns; a frame without a NAME header is taken positionally."""
+    names = [ALIASES.get(str(c).strip().upper(), str(c).strip().upper()) for c in df.columns]
+    if "NAME" not in names:
+        return None
+    df = df.copy(); df.columns = names
+    return df
+
+def parse_text(text):
+    """Pasted roster (CSV, TSV or semicolon separated, header optional) -> DataFrame of strings."""
+    text = text.strip()
+    if not text: return pd.DataFrame(columns=COLUMNS)
+    try:
+        dialect = csv.Sniffer().sniff(text.splitlines()[0], delimiters=",\t;|")
+    except csv.Error:
+        dialect = csv.excel
+    rows = [r for r in csv.reader(io.StringIO(text), dialect) if any(c.strip() for c in r)]
+    df = pd.DataFrame(rows[1:], columns=rows[0]) if rows and len(set(rows[0])) == len(rows[0]) else None
+    df = _columns(df) if df is not None else None
+    if df is None:
+        width = max(len(r) for r in rows)
+        df = pd.DataFrame([r + [""] * (width - len(r)) for r in rows]).iloc[:, :len(COLUMNS)]
+        df.columns = COLUMNS[:df.shape[1]]
+    return df
+
+def parse_frame(df):
+    """Uploaded CSV/XLSX -> DataFrame with STUDENT column names (positional when there is no header)."""
+    named = _columns(df)
+    if named is not None: return named
+    df = pd.concat([df.columns.to_frame().T, df], ignore_index=True).iloc[:, :len(COLUMNS)]
+    df.columns = COLUMNS[:df.shape[1]]
+    return df
+
+# ── Validation ─────────────────────────────────────────────
+def validate(df):
+    """([(NAME, CLASS, SECTION, GENDER, MARKS)], [(row number, problem)]) — bad rows are reported, not inserted."""
+    missing = [c for c in COLUMNS if c not in df.columns]
+    if missing: return [], [(0, f"missing column(s): {', '.join(missing)}")]
+    if len(df) > MAX_ROWS: return [], [(0, f"{len(df):,} rows — import at most {MAX_ROWS:,} at a time")]
+    good, bad = [], []
+    for i, (name, cls, sec, gen, mrk) in enumerate(df[COLUMNS].itertuples(index=False, name=None), start=1):
+        name, cls, sec = (("" if pd.isna(v) else str(v).strip()) for v in (name, cls, sec))
+        gender = GENDERS.get(("" if pd.isna(gen) else str(gen)).strip().upper())
+        try:
+            marks = float(str(mrk).strip())
+        except ValueError:
+            marks = None
+        if not name or len(name) > 50:       bad.append((i, "NAME is required (max 50 characters)"))
+        elif not cls or len(cls) > 30:       bad.append((i, "CLASS is required (max 30 characters)"))
+        elif not sec or len(sec) > 5:        bad.append((i, "SECTION is required (max 5 characters)"))
+        elif gender is None:                 bad.append((i, f"GENDER must be Male or Female, got {gen!r}"))
+        elif marks is None or not marks.is_integer() or not 0 <= marks <= 100:
+                                             bad.append((i, f"MARKS must be a whole number 0–100, got {mrk!r}"))
+        else:                                good.append((name, cls, sec.upper(), gender, int(marks)))
+    return good, bad
+
+def valid_marks(v):
+    return v is not None and not pd.isna(v) and float(v).is_integer() and 0 <= v <= 100
+
+# ── Batched writes ─────────────────────────────────────────
+# Each call is one request to the student.db writer: all rows are written or, on any error, none are.
+def _write(db, sql, params):
+    return writer(db).executemany(sql, params)
+
+def insert_students(db, rows):
+    return _write(db, "INSERT INTO STUDENT(NAME,CLASS,SECTION,GENDER,MARKS) VALUES (?,?,?,?,?)", rows)
+
+def delete_students(db, rowids):
+    return _write(db, "DELETE FROM STUDENT WHERE rowid=?", [(int(r),) for r in rowids])
+
+def update_marks(db, changes):
+    """changes: [(rowid, new marks)]."""
+    if not all(valid_marks(m) for _, m in changes): raise ValueError("MARKS must be whole numbers 0–100")
+    return _write(db, "UPDATE STUDENT SET MARKS=? WHERE rowid=?", [(int(m), int(r)) for r, m in changes])
+
+def shift_marks(db, rowids, delta):
+    """Add delta to the marks of the given students, clamped to 0–100 (grace marks, moderation)."""
+    return _write(db, "UPDATE STUDENT SET MARKS=MAX(0, MIN(100, MARKS + ?)) WHERE rowid=?",
+                  [(int(delta), int(r)) for r in rowids])
@@ -0,0 +1,139 @@
+"""Record / replay for Gemini calls, so the app, benchmarks and evaluations run without network.
+
+    INTELLISQL_GEMINI=record streamlit run app.py     # live calls, each saved to the cassette
+    INTELLISQL_GEMINI=replay streamlit run app.py     # served from the cassette, no network
+    INTELLISQL_GEMINI=once   python batch.py ...      # replay what is recorded, record the rest
+
+INTELLISQL_CASSETTE picks the file (default .intellisql/cassettes/gemini.jsonl) and
+INTELLISQL_REPLAY_LATENCY how long a replayed call takes: none (default), recorded (the
+latency of that recording) or sampled (drawn from all latencies recorded for the model).
+"""
+import hashlib, json, os, random, threading, time
+
+from settings import data_path
+
+class CassetteMiss(KeyError):
+    pass
+
+def prompt_key(model, prompt):
+    return model, hashlib.sha256(prompt.encode()).hexdigest()
+
+class Cassette:
+    """Append-only JSONL of {model, prompt_sha256, response | error, latency_ms, recorded}.
+
+    The same (model, prompt) may be recorded several times; replays cycle through the
+    recordings in order, so a sequence of nondeterministic answers comes back as it was."""
+    def __init__(self, path=None):
+        self.path = path or os.getenv("INTELLISQL_CASSETTE") or data_path("cassettes", "gemini.jsonl")
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self.entries, self.latencies, self.turn = {}, {}, {}
+        self.lock = threading.Lock()
+        if os.path.exists(self.path):
+            with open(self.path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        self._index(json.loads(line))
+                    except ValueError:
+                        continue                 # line cut off while recording
+
+    def _index(self, e):
+        self.entries.setdefault((e["model"], e["prompt_sha256"]), []).append(e)
+        self.latencies.setdefault(e["model"], []).append(e["latency_ms"])
+
+    def __len__(self):
+        return sum(map(len, self.entries.values()))
+
+    def add(self, model, prompt, latency_ms, response=None, error=None):
+        e = {"model": model, "prompt_sha256": prompt_key(model, prompt)[1], "response": response, "error": error,
+             "latency_ms": round(latency_ms, 1), "recorded": time.time(), "prompt_chars": len(prompt)}
+        with self.lock:
+            self._index(e)
+            with open(self.path, "a", encoding="utf-8") as f: f.write(json.dumps(e, ensure_ascii=False) + "\n")
+
+    def next(self, model, prompt):
+        key = prompt_key(model, prompt)
+        with self.lock:
+            hits = self.entries.get(key)
+            if not hits: raise CassetteMiss(f"no recording for {model} / {key[1][:12]}")
+            i = self.turn.get(key, 0)
+            self.turn[key] = i + 1
+            return hits[i % len(hits)]
+
+class Recorder:
+    """Passes calls to backend and records each response, or failure, with its latency."""
+    def __init__(self, backend, cassette):
+        self.backend, self.cassette = backend, cassette
+        self.counts = {"recorded": 0}
+
+    def generate(self, model, prompt):
+        t0 = time.perf_counter()
+        try:
+            text = self.backend.generate(model, prompt)
+        except Exception as e:
+            self.cassette.add(model, prompt, (time.perf_counter() - t0) * 1000, error=f"{type(e).__name__}: {e}")
+            raise
+        self.cassette.add(model, prompt, (time.perf_counter() - t0) * 1000, response=text)
+        self.counts["recorded"] += 1
+        return text
+
+    def stream(self, model, prompt):
+        """Streams from backend and records the whole response once it is complete."""
+        t0, parts = time.perf_counter(), []
+        try:
+            for chunk in (self.backend.stream(model, prompt) if hasattr(self.backend, "stream")
+                          else [self.backend.generate(model, prompt)]):
+                parts.append(chunk)
+                yield chunk
+        except Exception as e:
+            self.cassette.add(model, prompt, (time.perf_counter() - t0) * 1000, error=f"{type(e).__name__}: {e}")
+            raise
+        self.cassette.add(model, prompt, (time.perf_counter() - t0) * 1000, response="".join(parts))
+        self.counts["recorded"] += 1
+
+class Replayer:
+    """Serves recorded responses (recorded failures raise again, so model fallback replays too).
+
+    latency  "none", "recorded" or "sampled" (see module docstring)
+    missing  backend for prompts that were never recorded — with a Recorder this is "once"
+             mode; None raises CassetteMiss"""
+    def __init__(self, cassette, latency="none", missing=None, seed=0):
+        self.cassette, self.latency, self.missing = cassette, latency, missing
+        self.random = random.Random(seed)
+        self.counts = {"hits": 0, "misses": 0}
+
+    def _sleep(self, model, entry):
+        if self.latency == "recorded":
+            time.sleep(entry["latency_ms"] / 1000)
+        elif self.latency == "sampled":
+            pool = self.cassette.latencies.get(model) or [entry["latency_ms"]]
+            time.sleep(self.random.choice(pool) / 1000)
+
+    def _entry(self, model, prompt):
+        """The next recording, or None when the missing backend should answer instead."""
+        try:
+            entry = self.cassette.next(model, prompt)
+        except CassetteMiss:
+            self.counts["misses"] += 1
+            if self.missing is None: raise
+            return None
+        self.counts["hits"] += 1
+        self._sleep(model, entry)
+        if entry["error"]: raise RuntimeError(f"replayed failure: {entry['error']}")
+        return entry
+
+    def generate(self, model, prompt):
+        entry = self._entry(model, prompt)
+        return self.missing.generate(model, prompt) if entry is None else entry["response"]
+
+    def stream(self, model, prompt):
+        """A recording comes back as one chunk (chunk timing is not recorded)."""
+        entry = self._entry(model, prompt)
+        if entry is None: yield from self.missing.stream(model, prompt)
+        else:             yield entry["response"]
+
+def from_env(mode, live):
+    """Backend for INTELLISQL_GEMINI=record|replay|once wrapped around the live backend."""
+    cassette = Cassette()
+    if mode == "record": return Recorder(live, cassette)
+    latency = os.getenv("INTELLISQL_REPLAY_LATENCY", "none")
+    return Replayer(cassette, latency, missing=Recorder(live, cassette) if mode == "once" else None)
@@ -0,0 +1,137 @@
+import numpy as np
+import pandas as pd
+
+CHART_TYPES    = ["Bar", "Line", "Pie", "Area", "Scatter", "Histogram"]
+TOP_N          = 20          # categories kept on bar / pie charts, the rest become "Other"
+MAX_SERIES     = 10          # colour groups; more distinct values than this and nothing is coloured
+MAX_POINTS     = 2_000       # points per line / area chart after LTTB
+WEBGL_POINTS   = 1_000       # scatter switches to WebGL above this
+MAX_SCATTER    = 50_000      # scatter points kept (random sample above this)
+MAX_BINS       = 50
+MAX_FIG_BYTES  = 1_000_000   # serialized figure budget
+
+PALETTE = ["#00E676","#00C853","#6C3FC5","#0F3460","#E91E63"]
+LAYOUT  = dict(plot_bgcolor="#12122A", paper_bgcolor="#12122A", font_color="#E0E0E0",
+               title_font_color="#00E676", title_font_size=15, margin=dict(l=20,r=20,t=40,b=20))
+
+# ── Downsampling ───────────────────────────────────────────
+def lttb(x, y, n):
+    """Largest-Triangle-Three-Buckets: indices of n points that keep the visual shape of (x, y)."""
+    size = len(x)
+    if n >= size or n < 3: return np.arange(size)
+    x, y = np.asarray(x, dtype=float), np.asarray(y, dtype=float)
+    edges = np.linspace(1, size - 1, n - 1).astype(int)     # n-2 buckets between the fixed endpoints
+    out, a = [0], 0
+    for i in range(n - 2):
+        lo, hi = edges[i], edges[i + 1]
+        nxt = slice(edges[i + 1], edges[i + 2] if i + 2 < n - 1 else size)
+        cx, cy = x[nxt].mean(), y[nxt].mean()
+        area = np.abs((x[a] - cx) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (cy - y[a]))
+        a = lo + int(np.nanargmax(area)) if np.isfinite(area).any() else lo
+        out.append(a)
+    out.append(size - 1)
+    return np.array(out)
+
+def top_n(df, x, y, n=TOP_N):
+    """Sum y per x value, keep the n largest and fold the rest into one "Other" row."""
+    g = df.groupby(x, sort=False, dropna=False)[y].sum().sort_values(ascending=False)
+    if len(g) <= n: return g.reset_index()
+    head = g.iloc[:n].reset_index()
+    head[x] = head[x].astype(str)
+    other = pd.DataFrame({x: [f"Other ({len(g) - n:,})"], y: [g.iloc[n:].sum()]})
+    return pd.concat([head, other], ignore_index=True)
+
+def value_counts(df, col):
+    """(rows per value of col, name of the count column): what a bar / pie of a column against
+    itself shows, e.g. for SELECT MARKS where both axes default to the one column."""
+    name = "ROWS" if col == "COUNT" else "COUNT"
+    return df[col].value_counts(dropna=False).rename_axis(col).reset_index(name=name), name
+
+def bins(s, max_bins=MAX_BINS):
+    """Histogram counts of a numeric series, computed here instead of in the browser."""
+    v = s.dropna().to_numpy(dtype=float)
+    if not len(v): return pd.DataFrame({"BIN": [], "COUNT": []})
+    edges = np.histogram_bin_edges(v, bins="auto")
+    if len(edges) - 1 > max_bins: edges = np.linspace(v.min(), v.max(), max_bins + 1)
+    counts, edges = np.histogram(v, bins=edges)
+    fmt = (lambda e: f"{e:g}") if np.allclose(edges, edges.round()) else (lambda e: f"{e:.3g}")
+    return pd.DataFrame({"BIN": [f"{fmt(a)}–{fmt(b)}" for a, b in zip(edges[:-1], edges[1:])], "COUNT": counts})
+
+def color_column(df, exclude):
+    """First text column with few enough distinct values to colour by (None if there is none)."""
+    for c in df.select_dtypes(include=["object", "string"]).columns:
+        if c not in exclude and df[c].nunique() <= MAX_SERIES: return c
+    return None
+
+def _lttb_frame(df, x, y, budget):
+    xs = df[x] if pd.api.types.is_numeric_dtype(df[x]) or pd.api.types.is_datetime64_any_dtype(df[x]) else None
+    xv = np.arange(len(df)) if xs is None else xs.astype("int64") if xs.dtype.kind == "M" else xs
+    return df.iloc[lttb(xv, df[y].fillna(0), budget)]
+
+# ── Figure ─────────────────────────────────────────────────
+def prepare(df, ctype, x, y, budget=None):
+    """Shrink df to what the chart can show. Returns (frame, colour column, notes)."""
+    notes, n = [], len(df)
+    color = color_column(df, {x, y}) if ctype not in ("Pie", "Histogram") else None
+    if ctype == "Histogram":
+        notes.append(f"{n:,} values of {y} binned server-side")
+        return bins(df[y], min(MAX_BINS, budget or MAX_BINS)), None, notes
+    if ctype in ("Bar", "Pie"):
+        keep = min(TOP_N, budget or TOP_N)
+        distinct = df[x].nunique(dropna=False)
+        if distinct > keep or n > distinct:
+            keys = [x] + ([color] if color and ctype == "Bar" else [])
+            out = top_n(df, x, y, keep) if len(keys) == 1 else _top_n_colored(df, x, y, color, keep)
+            notes.append(f"Top {keep} of {distinct:,} {x} values by total {y}" if distinct > keep else f"{y} summed per {x}")
+            return out, (color if len(keys) > 1 else None), notes
+        return df, color, notes
+    if ctype in ("Line", "Area"):
+        limit = budget or MAX_POINTS
+        if n > limit:
+            groups = [g for _, g in df.groupby(color, sort=False)] if color else [df]
+            each = max(3, limit // len(groups))
+            df = pd.concat([_lttb_frame(g, x, y, each) for g in groups])
+            notes.append(f"Downsampled {n:,} → {len(df):,} points (LTTB)")
+        return df, color, notes
+    limit = budget or MAX_SCATTER
+    if n > limit:
+        df = df.sample(limit, random_state=0).sort_index()
+        notes.append(f"Random sample of {limit:,} of {n:,} points")
+    return df, color, notes
+
+def _top_n_colored(df, x, y, color, n):
+    keep = df.groupby(x, dropna=False)[y].sum().nlargest(n).index
+    inside = df[df[x].isin(keep)]
+    out = inside.groupby([x, color], sort=False, dropna=False)[y].sum().reset_index()
+    rest = df[~df[x].isin(keep)]
+    if len(rest):
+        other = rest.groupby(color, sort=False, dropna=False)[y].sum().reset_index()
+        other[x] = f"Other ({df[x].nunique() - n:,})"
+        out[x] = out[x].astype(str)
+        out = pd.concat([out, other[[x, color, y]]], ignore_index=True)
+    return out
+
+def build_figure(df, ctype, x, y):
+    """Plotly figure for a result of any size. Returns (figure, notes); the serialized figure is
+    kept under MAX_FIG_BYTES by halving the point budget until it fits."""
+    import plotly.express as px
+    kw = dict(template="plotly_dark", color_discrete_sequence=PALETTE)
+    budget, counted = None, x == y and ctype in ("Bar", "Pie")
+    if counted: df, y = value_counts(df, x)
+    while True:
+        data, color, notes = prepare(df, ctype, x, y, budget)
+        if counted: notes.insert(0, f"Rows per {x} value")
+        if   ctype == "Bar":       fig = px.bar(data, x=x, y=y, color=color, **kw, title=f"{y} by {x}")
+        elif ctype == "Line":      fig = px.line(data, x=x, y=y, color=color, **kw, title=f"{y} over {x}", render_mode="webgl" if len(data) > WEBGL_POINTS else "svg")
+        elif ctype == "Pie":       fig = px.pie(data, names=x, values=y, **kw, title=f"{y} split")
+        elif ctype == "Area":      fig = px.area(data, x=x, y=y, color=color, **kw, title=f"{y} area")
+        elif ctype == "Histogram": fig = px.bar(data, x="BIN", y="COUNT", **kw, title=f"Distribution of {y}")
+        else:
+            fig = px.scatter(data, x=x, y=y, color=color, **kw, title=f"{y} vs {x}",
+                             render_mode="webgl" if len(data) > WEBGL_POINTS else "svg")
+            if len(data) > WEBGL_POINTS: notes.append(f"WebGL rendering ({len(data):,} points)")
+        fig.update_layout(**LAYOUT)
+        fig.update_traces(marker_line_width=0)
+        size = len(fig.to_json())
+        if size <= MAX_FIG_BYTES or len(data) <= 10: return fig, notes
+        budget = max(10, len(data) // 2)
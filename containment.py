@@ -0,0 +1,94 @@
+import re
+
+import sqlast
+from sqlnorm import normalize
+
+def _key(conj):
+    """Comparable form of a WHERE conjunct: its predicate tuple, or normalized tokens."""
+    p = sqlast.predicate(conj)
+    if p: return p
+    return ("raw", " ".join(t.upper for t in sqlast.tokenize(conj)))
+
+def _plain_columns(q):
+    """[(source, output)] for a projection of bare columns (optionally aliased); None otherwise."""
+    out = []
+    for c in q.columns:
+        m = re.fullmatch(r'\s*("?)(\w+)\1(?:\s+AS\s+("?)(\w+)\3)?\s*', c, re.I)
+        if not m: return None
+        out.append((m.group(2), m.group(4) or m.group(2)))
+    return out
+
+def _like(pattern):
+    return "".join(".*" if ch == "%" else "." if ch == "_" else re.escape(ch) for ch in pattern)
+
+def _mask(s, op, val):
+    numeric = s.dtype.kind in "iuf"
+    vals = val if isinstance(val, tuple) else (val,)
+    if op != "LIKE" and any(isinstance(v, str) == numeric for v in vals):
+        return None     # SQLite type affinity would coerce; let the database answer
+    if op == "=":       return s == val
+    if op == "!=":      return (s != val) & s.notna()
+    if op == "<":       return s < val
+    if op == "<=":      return s <= val
+    if op == ">":       return s > val
+    if op == ">=":      return s >= val
+    if op == "BETWEEN": return s.between(*val)
+    if op == "IN":      return s.isin(val)
+    if op == "NOT IN":  return ~s.isin(val) & s.notna()
+    if op == "LIKE" and isinstance(val, str):
+        return s.astype("string").str.fullmatch(_like(val), case=False).fillna(False).astype(bool)
+    return None
+
+def answer_from_cache(sql, prev_sql, prev_df):
+    """Compute sql's result from prev_df when it is prev_sql again (after normalize()) or only
+    narrows it, else None.
+
+    Contained means: same table, no aggregation, every previous WHERE conjunct kept,
+    extra conjuncts are simple column/literal comparisons, bare-column projection and
+    ORDER BY on columns of the cached frame. A previous LIMIT is only reused with the
+    same filters and ordering and a smaller or equal limit."""
+    if prev_df is None or not prev_sql: return None
+    if normalize(sql) == normalize(prev_sql): return prev_df
+    new, old = sqlast.parse(sql), sqlast.parse(prev_sql)
+    if not new or not old: return None
+    if new.table.upper() != old.table.upper() or new.aggregated or old.aggregated: return None
+    if new.distinct or old.distinct or new.having or old.having: return None
+
+    cols = {c.upper(): c for c in prev_df.columns}
+    try:
+        old_keys, new_keys = [_key(w) for w in old.where], [_key(w) for w in new.where]
+    except ValueError:
+        return None
+    if any(k not in new_keys for k in old_keys): return None
+    extra = [k for k in new_keys if k not in old_keys]
+    same_order = [(e.upper(), d or "ASC") for e, d in new.order_by] == [(e.upper(), d or "ASC") for e, d in old.order_by]
+
+    if old.limit is not None:
+        if extra or not (same_order or not new.order_by) or new.limit is None or new.limit > old.limit:
+            return None
+
+    mask = None
+    for k in extra:
+        if k[0] == "raw" or k[0] not in cols: return None
+        m = _mask(prev_df[cols[k[0]]], k[1], k[2])
+        if m is None: return None
+        mask = m if mask is None else mask & m
+    df = prev_df[mask] if mask is not None else prev_df
+
+    if new.order_by and not same_order:
+        by, asc = [], []
+        for e, d in new.order_by:
+            if e.upper() not in cols: return None
+            by.append(cols[e.upper()]); asc.append(d.upper() != "DESC")
+        df = df.sort_values(by, ascending=asc, kind="stable")
+    if new.limit is not None:
+        df = df.head(new.limit)
+
+    if new.columns != ["*"]:
+        proj = _plain_columns(new)
+        if proj is None or any(src.upper() not in cols for src, _ in proj): return None
+        df = df[[cols[src.upper()] for src, _ in proj]]
+        df.columns = [dst for _, dst in proj]
+    elif old.columns != ["*"]:
+        return None
+    return df.reset_index(drop=True)
@@ -0,0 +1,43 @@
+import sqlast
+from settings import approx_tokens
+
+STATE_BUDGET = 160      # max tokens of conversation context sent per chatbot turn
+
+class ConversationState:
+    """Compact chatbot memory: the current SQL, its WHERE filters and a rolling summary.
+
+    Updated once per turn instead of replaying raw messages, and trimmed to a fixed
+    token budget so the prompt stays the same size however long the chat gets."""
+    def __init__(self, budget=STATE_BUDGET):
+        self.budget  = budget
+        self.sql     = ""
+        self.filters = []
+        self.summary = []       # one short line per turn, oldest first
+        self.turns   = 0
+
+    def update(self, question, sql=None, rows=None, error=None):
+        self.turns += 1
+        q = " ".join(question.split())
+        q = q if len(q) <= 60 else q[:57] + "..."
+        if sql:
+            self.sql = sql
+            parsed = sqlast.parse(sql)
+            self.filters = parsed.where if parsed else []
+            self.summary.append(f'"{q}" → {rows if rows is not None else "?"} row(s)')
+        else:
+            self.summary.append(f'"{q}" → {error or "no SQL"}')
+        self._trim()
+
+    def _trim(self):
+        while len(self.summary) > 1 and approx_tokens(self.render()) > self.budget:
+            self.summary.pop(0)
+        if approx_tokens(self.render()) > self.budget:
+            self.sql = self.sql[:self.budget * 2] + " …"
+
+    def render(self):
+        if not self.turns: return "(new conversation)"
+        lines = [f"Current SQL: {self.sql or '(none yet)'}",
+                 f"Active filters: {' AND '.join(self.filters) if self.filters else '(none)'}",
+                 f"Earlier turns ({self.turns} total, most recent last):"]
+        lines += [f"  - {s}" for s in self.summary]
+        return "\n".join(lines)
@@ -0,0 +1,279 @@
+import os, re, sqlite3, statistics, threading, time
+from collections import deque
+
+import fallback
+from cassette import CassetteMiss
+from prompts import BASE_PROMPT, ExampleStore, split_prompt, fewshot_prompt
+from sqlnorm import record_run
+
+# ── Gemini ─────────────────────────────────────────────────
+MODELS = [
+    "models/gemini-2.0-flash-lite",
+    "models/gemini-2.0-flash-lite-001",
+    "models/gemini-2.0-flash-001",
+    "models/gemini-2.0-flash",
+    "models/gemini-flash-lite-latest",
+    "models/gemini-flash-latest",
+]
+
+# Once every model has failed, gemini() and gemini_stream() fail at once for this long instead of
+# walking MODELS again, and NL→SQL is answered by the offline engine (fallback.py).
+DEGRADED_SECONDS = float(os.getenv("INTELLISQL_DEGRADED_SECONDS", "60"))
+
+class AIUnavailable(Exception):
+    pass
+
+class LiveBackend:
+    """The google-genai client, created on first use so importing core needs no API key."""
+    def __init__(self, api_key=None):
+        self.api_key, self._client, self._lock = api_key, None, threading.Lock()
+
+    def client(self):
+        with self._lock:
+            if self._client is None:
+                from google import genai
+                self._client = genai.Client(api_key=self.api_key or os.getenv("GOOGLE_API_KEY"))
+            return self._client
+
+    def generate(self, model, prompt):
+        return self.client().models.generate_content(model=model, contents=prompt).text
+
+    def stream(self, model, prompt):
+        for chunk in self.client().models.generate_content_stream(model=model, contents=prompt):
+            if chunk.text: yield chunk.text
+
+_backend, _backend_lock = None, threading.Lock()
+
+def backend():
+    """Where gemini() sends prompts, from INTELLISQL_GEMINI: live (default), stub (stubgemini.py),
+    or record / replay / once (cassette.py)."""
+    global _backend
+    with _backend_lock:
+        if _backend is None:
+            mode = os.getenv("INTELLISQL_GEMINI", "live")
+            if mode == "stub":
+                from stubgemini import StubGemini
+                _backend = StubGemini.from_env()
+            elif mode in ("record", "replay", "once"):
+                import cassette
+                _backend = cassette.from_env(mode, LiveBackend())
+            else:
+                _backend = LiveBackend()
+        return _backend
+
+def set_backend(b):
+    """Swap the backend (any object with generate(model, prompt) -> text, and optionally
+    stream(model, prompt) -> iterator of text chunks)."""
+    global _backend, _down_until
+    with _backend_lock: _backend, _down_until = b, 0.0
+
+_down_until = 0.0
+
+def degraded():
+    """Seconds until models are tried again after all of them failed (0 when they are in use)."""
+    return max(0.0, _down_until - time.monotonic())
+
+def _unavailable(models):
+    """The error for a finished walk over models; only exhausting all of MODELS degrades the app,
+    a caller's own subset (evaluate.py --models) failing says nothing about the rest."""
+    global _down_until
+    if not models or set(MODELS) <= set(models): _down_until = time.monotonic() + DEGRADED_SECONDS
+    return AIUnavailable("AI models temporarily unavailable. Try again.")
+
+def gemini(prompt_text, max_retries=2, models=None):
+    if degraded(): raise AIUnavailable("AI models temporarily unavailable. Try again.")
+    b = backend()
+    for m in models or MODELS:
+        for _ in range(max_retries):
+            try:
+                return b.generate(m, prompt_text).strip()
+            except CassetteMiss:
+                raise                       # replaying and the prompt was never recorded: retrying can't help
+            except Exception:
+                continue
+    raise _unavailable(models)
+
+_streams, _streams_lock = deque(maxlen=200), threading.Lock()
+
+def gemini_stream(prompt_text, max_retries=2, models=None):
+    """gemini() yielding text as it is generated. The fallback over models and retries applies until
+    the first chunk arrives; a failure after that raises AIUnavailable, as the start is already shown.
+    So does a prompt missing from the replay cassette. Backends without stream() answer in one chunk."""
+    if degraded(): raise AIUnavailable("AI models temporarily unavailable. Try again.")
+    b, t0 = backend(), time.perf_counter()
+    for m in models or MODELS:
+        for _ in range(max_retries):
+            first, parts = None, 0
+            try:
+                for chunk in (b.stream(m, prompt_text) if hasattr(b, "stream") else [b.generate(m, prompt_text)]):
+                    if first is None:
+                        if not chunk.strip(): continue
+                        chunk, first = chunk.lstrip(), time.perf_counter()
+                    parts += 1
+                    yield chunk
+            except CassetteMiss as e:               # replaying: pages show it like any unavailable model
+                raise AIUnavailable(f"AI response not recorded for replay ({e})") from e
+            except Exception as e:
+                if first is None: continue
+                raise AIUnavailable(f"AI response interrupted: {e}")
+            if first is None: continue                # empty answer: treat like a failure
+            with _streams_lock:
+                _streams.append(((first - t0) * 1000, (time.perf_counter() - t0) * 1000, parts))
+            return
+    raise _unavailable(models)
+
+def stream_stats():
+    """Recent streamed responses: count, median time to first token and to the full answer (ms)."""
+    with _streams_lock: recent = list(_streams)
+    if not recent: return {"responses": 0, "first_token_ms": None, "total_ms": None, "chunks": None}
+    return {"responses": len(recent), "first_token_ms": statistics.median(r[0] for r in recent),
+            "total_ms": statistics.median(r[1] for r in recent), "chunks": statistics.median(r[2] for r in recent)}
+
+# ── SQL ────────────────────────────────────────────────────
+def clean_sql(text):
+    """Model output -> one SQL statement: fences stripped, terminated with a semicolon."""
+    sql = re.sub(r"```sql|```", "", text).strip()
+    return sql if sql.endswith(";") else sql + ";"
+
+def is_safe_sql(sql):
+    danger = r"\b(DROP|DELETE|INSERT|UPDATE|ALTER|CREATE|TRUNCATE|EXEC|EXECUTE)\b"
+    return not bool(re.search(danger, sql, re.IGNORECASE))
+
+def returns_rows(sql):
+    """True for a query that reads rows (SELECT / WITH / VALUES). ATTACH, PRAGMA and friends pass
+    is_safe_sql but return nothing, and ATTACH even creates the file it names."""
+    body = re.sub(r"^(\s|--[^\n]*\n?|/\*.*?\*/|\()*", "", sql, flags=re.S)
+    return bool(re.match(r"(SELECT|WITH|VALUES)\b", body, re.IGNORECASE))
+
+def connect(db, readonly=False):
+    return sqlite3.connect(f"file:{db}?mode=ro", uri=True) if readonly else sqlite3.connect(db)
+
+def run_sql(sql, db="student.db", readonly=False):
+    t0   = time.perf_counter()
+    conn = connect(db, readonly)
+    cur  = conn.cursor()
+    cur.execute(sql)
+    rows = cur.fetchall()
+    cols = [d[0] for d in cur.description]
+    conn.close()
+    record_run(sql, (time.perf_counter() - t0) * 1000, len(rows))
+    return rows, cols
+
+def iter_sql(sql, db="student.db", chunk=1_000, readonly=True):
+    """(columns, generator of row lists) — for streaming results without holding them in memory."""
+    t0   = time.perf_counter()
+    conn = connect(db, readonly)
+    try:
+        cur = conn.execute(sql)
+        if cur.description is None:
+            raise sqlite3.ProgrammingError("not a query: only SELECT / WITH statements return rows")
+    except BaseException:
+        conn.close(); raise
+    cols = [d[0] for d in cur.description]
+    def rows():
+        n = 0
+        try:
+            while batch := cur.fetchmany(chunk):
+                n += len(batch); yield batch
+        finally:
+            conn.close()
+            record_run(sql, (time.perf_counter() - t0) * 1000, n)
+    return cols, rows()
+
+# ── Prompts ────────────────────────────────────────────────
+_store, _store_lock = None, threading.Lock()
+
+def example_store():
+    global _store
+    with _store_lock:
+        if _store is None: _store = ExampleStore(split_prompt(BASE_PROMPT)[1])
+        return _store
+
+def nl_to_sql(question):
+    return gemini(fewshot_prompt(example_store(), question) + f"\n\nQuestion: {question}\nSQL:")
+
+def offline_sql(question, db="student.db", table=None):
+    """The offline engine's Translation (fallback.py); AIUnavailable when it isn't confident enough to run."""
+    t = fallback.translate(question, db, table)
+    if t.confidence < fallback.MIN_CONFIDENCE:
+        raise AIUnavailable(f"AI models temporarily unavailable, and the offline engine could not read this question "
+                            f"({t.confidence:.0%} understood; unknown: {', '.join(t.unmatched) or 'everything'}). "
+                            f"Try again shortly, or ask more simply.")
+    return t
+
+def sql_for(question, db="student.db", table=None, prompt=None):
+    """(sql, None) from Gemini — prompt defaults to the few-shot NL→SQL prompt — or (sql, Translation)
+    from the offline engine when no model is available."""
+    try:
+        return clean_sql(gemini(prompt) if prompt else nl_to_sql(question)), None
+    except AIUnavailable:
+        t = offline_sql(question, db, table)
+        return t.sql, t
+
+def explain_sql(sql, stream=False):
+    return (gemini_stream if stream else gemini)(f"""Explain this SQL query in simple plain English for a non-technical person.
+Be concise — 2 to 3 sentences only. Focus on what data it retrieves.
+SQL: {sql}""")
+
+def optimize_sql(sql, stream=False):
+    return (gemini_stream if stream else gemini)(f"""Review this SQL query and suggest an improved version if possible.
+Explain the improvement in 1-2 sentences. If the query is already optimal, say so.
+SQL: {sql}""")
+
+def ai_insights(df, stream=False):
+    sample = df.head(30).to_string(index=False)
+    return (gemini_stream if stream else gemini)(f"""Analyze this student data and provide exactly 5 concise bullet-point insights.
+Focus on patterns, top/bottom performers, class comparisons, and notable trends.
+Format each point starting with a relevant emoji.
+Data:
+{sample}""")
+
+def translate_to_english(text):
+    return gemini(f"Translate this to English. Return ONLY the English translation, nothing else:\n{text}")
+
+def is_english(text):
+    r = gemini(f"Is this text written in English? Reply with only YES or NO:\n{text}")
+    return "YES" in r.upper()
+
+def auto_sample_questions(cols_info):
+    return gemini(f"""Generate exactly 8 useful natural language questions a user can ask about a database table with these columns: {cols_info}
+Number them 1-8. Make them varied — include filters, aggregations, comparisons, and rankings.""")
+
+def to_english(question):
+    """(question in English, translation or None). Detection or translation failures keep the original."""
+    try:
+        if not is_english(question):
+            t = translate_to_english(question)
+            return t, t
+    except Exception:
+        pass
+    return question, None
+
+# ── Pipeline ───────────────────────────────────────────────
+def generate(question, db="student.db"):
+    """Question in any language -> {question, english, translated, sql, safe, engine, timings}; engine is
+    "gemini", or "offline" with the engine's confidence and what it understood."""
+    timings, t0 = {}, time.perf_counter()
+    english, translated = to_english(question)
+    timings["language_ms"] = (time.perf_counter() - t0) * 1000
+    t0 = time.perf_counter()
+    sql, offline = sql_for(english, db)
+    timings["nl_to_sql_ms"] = (time.perf_counter() - t0) * 1000
+    out = {"question": question, "english": english, "translated": translated, "sql": sql,
+           "safe": is_safe_sql(sql), "engine": "offline" if offline else "gemini", "timings": timings}
+    if offline: out.update(confidence=offline.confidence, understood=offline.understood)
+    return out
+
+def answer(question, db="student.db", explain=False):
+    """The page_query pipeline without the UI: generate, guard, run read-only, optionally explain."""
+    out = generate(question, db)
+    if not out["safe"]: return out
+    t0 = time.perf_counter()
+    out["rows"], out["columns"] = run_sql(out["sql"], db, readonly=True)
+    out["row_count"] = len(out["rows"])
+    out["timings"]["sql_ms"] = (time.perf_counter() - t0) * 1000
+    if explain and out["engine"] == "gemini":          # offline means there is no model to explain it
+        t0 = time.perf_counter()
+        out["explanation"] = explain_sql(out["sql"])
+        out["timings"]["explain_ms"] = (time.perf_counter() - t0) * 1000
+    return out
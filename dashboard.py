@@ -0,0 +1,51 @@
+import sqlite3
+
+import pandas as pd
+
+from charts import bins
+
+DASH_COLORS = ["#00E676","#00C853","#6C3FC5","#0F3460","#E91E63","#FF6D00"]
+
+def dashboard_specs(db):
+    """(metrics, {name: figure JSON}) for the dashboard; figures is None without plotly.
+    Aggregation happens in SQLite, so no full-table frame is built."""
+    conn = sqlite3.connect(db)
+    try:
+        q = lambda sql: pd.read_sql_query(sql, conn)
+        total, avg_m, top_m, low_m, passed = conn.execute(
+            "SELECT COUNT(*), ROUND(AVG(MARKS),1), MAX(MARKS), MIN(MARKS), SUM(MARKS>=40) FROM STUDENT").fetchone()
+        metrics = (total, avg_m, top_m, low_m, round((passed or 0)/total*100,1) if total else 0)
+        try:
+            import plotly.express as px
+        except ImportError:
+            return metrics, None
+        ca = q("SELECT CLASS, ROUND(AVG(MARKS),1) AS AVG FROM STUDENT GROUP BY CLASS")
+        sc = q("SELECT GENDER AS Gender, COUNT(*) AS Count FROM STUDENT GROUP BY GENDER ORDER BY Count DESC")
+        hist = bins(q("SELECT MARKS FROM STUDENT")["MARKS"], max_bins=10)
+        t8 = q("SELECT * FROM STUDENT ORDER BY MARKS DESC LIMIT 8")
+        pf = q("SELECT CLASS, SUM(MARKS>=40) AS \"Pass ✅\", SUM(MARKS<40) AS \"Fail ❌\" FROM STUDENT GROUP BY CLASS")
+        pf = pf.melt(id_vars="CLASS", var_name="Status", value_name="Count")
+        hp = q("SELECT CLASS, SECTION, AVG(MARKS) AS MARKS FROM STUDENT GROUP BY CLASS, SECTION")
+        hp = hp.pivot(index="CLASS",columns="SECTION",values="MARKS").fillna(0).round(1)
+    finally:
+        conn.close()
+
+    kw = dict(template="plotly_dark", color_discrete_sequence=DASH_COLORS)
+    bg = dict(plot_bgcolor="#12122A", paper_bgcolor="#12122A", font_color="#E0E0E0",
+              title_font_color="#00E676", margin=dict(l=20,r=20,t=40,b=20))
+    figs = {}
+    fig = px.bar(ca, x="CLASS", y="AVG", color="CLASS", **kw, text="AVG", title="Average Marks by Class")
+    fig.update_traces(textposition="outside"); figs["class_avg"] = fig
+    fig = px.pie(sc, names="Gender", values="Count", **kw, title="Male vs Female Students",
+                 hole=0.45, color_discrete_map={"Male":"#00E676","Female":"#6C3FC5"})
+    fig.update_traces(textinfo="label+percent"); figs["gender"] = fig
+    figs["histogram"] = px.bar(hist, x="BIN", y="COUNT", color_discrete_sequence=["#00E676"], template="plotly_dark",
+                               title="Frequency of Marks", labels={"BIN":"Marks","COUNT":"count"})
+    figs["histogram"].update_layout(bargap=0)
+    figs["top8"] = px.bar(t8, x="NAME", y="MARKS", color="CLASS", **kw, title="Top 8 Students")
+    figs["pass_fail"] = px.bar(pf, x="CLASS", y="Count", color="Status", barmode="group", template="plotly_dark",
+                               color_discrete_map={"Pass ✅":"#00E676","Fail ❌":"#E91E63"}, title="Pass vs Fail per Class")
+    figs["heatmap"] = px.imshow(hp, color_continuous_scale="Greens", template="plotly_dark",
+                                title="Avg Marks — Class × Section", text_auto=True)
+    for fig in figs.values(): fig.update_layout(**bg)
+    return metrics, {k: fig.to_json() for k, fig in figs.items()}
@@ -0,0 +1,135 @@
+import functools, sqlite3, threading
+from collections import OrderedDict
+
+from settings import db_stamp
+from writer import writer
+
+VERSIONS    = "_TABLE_VERSIONS"
+MAX_ENTRIES = 256
+
+def _q(name):
+    return '"' + name.replace('"', '""') + '"'
+
+def _trigger_ddl(table):
+    bump = f"UPDATE {VERSIONS} SET V = V + 1 WHERE TBL = '{table.replace(chr(39), chr(39) * 2)}';"
+    return [f"CREATE TRIGGER IF NOT EXISTS {_q(f'_TV_{table}_{op}')} AFTER {ev} ON {_q(table)} BEGIN {bump} END"
+            for op, ev in (("I", "INSERT"), ("U", "UPDATE"), ("D", "DELETE"))]
+
+class DepCache:
+    """In-process result cache whose entries declare the database tables they read.
+
+    Tracked databases carry a _TABLE_VERSIONS counter bumped by triggers on every insert, update
+    and delete, so writes from any connection or process are seen. A lookup compares the entry's
+    table versions with the current ones and recomputes only when one of its own tables changed;
+    PRAGMA data_version lets an unchanged database skip even that query. Untracked databases
+    (uploads, read-only files) fall back to the file stamp for all of their tables."""
+    def __init__(self, max_entries=MAX_ENTRIES):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()             # key -> (versions, value)
+        self.deps    = {}                        # (db, table) -> {keys}
+        self.owned   = set()
+        self.state   = {}                        # db -> {"conn", "data", "schema", "versions"}
+        self.counts  = {}                        # function -> {"hits", "misses", "stale", "dropped"}
+        self.lock    = threading.RLock()
+
+    # ── Versions ──
+    def track(self, db):
+        """Opt db in to per-table versions (triggers are added to tables as cached functions use them)."""
+        self.owned.add(db)
+
+    def _install(self, db, tables):
+        """Add the version table and triggers through the shared writer, which owns all DDL."""
+        def install(conn):
+            conn.execute(f"CREATE TABLE IF NOT EXISTS {VERSIONS}(TBL TEXT PRIMARY KEY, V INTEGER NOT NULL) WITHOUT ROWID")
+            for t in tables:
+                conn.execute(f"INSERT OR IGNORE INTO {VERSIONS} VALUES (?, 0)", (t,))
+                for ddl in _trigger_ddl(t): conn.execute(ddl)
+                # a table recreated without triggers (sql.py) may have changed unseen
+                conn.execute(f"UPDATE {VERSIONS} SET V = V + 1 WHERE TBL = ?", (t,))
+        try:
+            writer(db).submit(install).result()
+            return True
+        except sqlite3.OperationalError:
+            return False                         # read-only, locked or missing table: stamp fallback
+
+    def _triggers(self, conn, tables):
+        names = {r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE type='trigger' AND name LIKE '\\_TV\\_%' ESCAPE '\\'")}
+        return [t for t in tables if not {f"_TV_{t}_I", f"_TV_{t}_U", f"_TV_{t}_D"} <= names]
+
+    def versions(self, db, tables):
+        """Current version of each table in db, as a tuple (the whole-file stamp when untracked)."""
+        if db not in self.owned: return (db_stamp(db),)
+        with self.lock:
+            s = self.state.get(db)
+            if s is None:
+                s = self.state[db] = {"conn": sqlite3.connect(db, check_same_thread=False),
+                                      "data": None, "schema": None, "versions": {}}
+            conn = s["conn"]
+            data = conn.execute("PRAGMA data_version").fetchone()[0]
+            if data != s["data"] or any(t not in s["versions"] for t in tables):
+                schema = conn.execute("PRAGMA schema_version").fetchone()[0]
+                missing = [t for t in tables if t not in s["versions"]]
+                if schema != s["schema"]: missing = sorted(set(missing) | set(s["versions"]))
+                missing = self._triggers(conn, missing) if missing else []
+                if missing and not self._install(db, missing):
+                    return (db_stamp(db),)
+                s["data"]   = conn.execute("PRAGMA data_version").fetchone()[0]
+                s["schema"] = conn.execute("PRAGMA schema_version").fetchone()[0]
+                s["versions"] = dict(conn.execute(f"SELECT TBL, V FROM {VERSIONS}"))
+            return tuple(s["versions"].get(t) for t in tables)
+
+    # ── Entries ──
+    def cached(self, *tables):
+        """Decorator for fn(db, *args): results are reused until one of tables changes in db."""
+        def wrap(fn):
+            name = fn.__qualname__
+            @functools.wraps(fn)
+            def inner(db, *args, **kwargs):
+                key = (name, db, args, tuple(sorted(kwargs.items())))
+                ver = self.versions(db, tables)
+                with self.lock:
+                    c = self.counts.setdefault(name, {"hits": 0, "misses": 0, "stale": 0, "dropped": 0})
+                    hit = self.entries.get(key)
+                    if hit and hit[0] == ver:
+                        self.entries.move_to_end(key); c["hits"] += 1
+                        return hit[1]
+                    c["misses"] += 1
+                    if hit: c["stale"] += 1
+                value = fn(db, *args, **kwargs)
+                with self.lock:
+                    self.entries[key] = (ver, value)
+                    for t in tables: self.deps.setdefault((db, t), set()).add(key)
+                    while len(self.entries) > self.max_entries: self._drop(next(iter(self.entries)))
+                return value
+            inner.clear = lambda: self.invalidate(function=name)
+            return inner
+        return wrap
+
+    def _drop(self, key):
+        self.entries.pop(key, None)
+        for keys in self.deps.values(): keys.discard(key)
+
+    def invalidate(self, db=None, table=None, function=None):
+        """Drop the entries that read table in db (any table when None), or every entry of function."""
+        with self.lock:
+            if function:
+                doomed = [k for k in self.entries if k[0] == function]
+            else:
+                doomed = set().union(*(keys for (d, t), keys in self.deps.items()
+                                       if (db is None or d == db) and (table is None or t == table)))
+            for k in doomed:
+                if k in self.entries: self.counts[k[0]]["dropped"] += 1
+                self._drop(k)
+            return len(doomed)
+
+    def stats(self):
+        """Per-function hits / misses / stale / dropped / entries, plus totals and hit rate."""
+        with self.lock:
+            per = {f: dict(c, entries=sum(k[0] == f for k in self.entries)) for f, c in self.counts.items()}
+        hits, misses = sum(c["hits"] for c in per.values()), sum(c["misses"] for c in per.values())
+        return {"functions": per, "hits": hits, "misses": misses, "entries": len(self.entries),
+                "hit_rate": hits / (hits + misses) if hits + misses else 0.0}
+
+# Shared by every rerun and session of the app, like st.cache_data.
+_cache = DepCache()
+cached, track, invalidate, stats = _cache.cached, _cache.track, _cache.invalidate, _cache.stats
@@ -0,0 +1,243 @@
+"""Execution-match evaluation of NL→SQL configurations.
+
+    python evaluate.py                                  # default configs, live Gemini
+    python evaluate.py --stub 0.2                       # offline stub backend
+    python evaluate.py --config offline                 # the no-model fallback engine (fallback.py)
+    python evaluate.py --config lite=fewshot:models/gemini-2.0-flash-lite --config full=full
+    python evaluate.py --out run.jsonl                  # keep every model response
+    python evaluate.py --offline run.jsonl              # re-score recorded responses, no model calls
+    INTELLISQL_GEMINI=replay python evaluate.py         # replay a Gemini cassette (cassette.py)
+
+A prediction is correct when its result set equals one of the reference results, compared
+as multisets of rows (row order is ignored, and so is column order when the shapes match:
+some reordering of the prediction's columns must give the reference rows).
+Each configuration reports accuracy, invalid SQL, NL→SQL latency and approximate tokens.
+"""
+import argparse, hashlib, itertools, json, sqlite3, statistics, sys, threading, time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+import core, fallback
+from prompts import BASE_PROMPT, CHIPS, ExampleStore, split_prompt
+from settings import approx_tokens
+from sqlnorm import normalize
+
+# ── Golden set ─────────────────────────────────────────────
+# References for the Query page chips; where a question has more than one fair reading
+# every accepted SQL is listed.
+CHIP_SQL = {
+    "How many students?":       ["SELECT COUNT(*) FROM STUDENT;"],
+    "All CSE students":         ["SELECT * FROM STUDENT WHERE CLASS='CSE';"],
+    "Highest marks?":           ["SELECT * FROM STUDENT WHERE MARKS=(SELECT MAX(MARKS) FROM STUDENT);",
+                                 "SELECT MAX(MARKS) FROM STUDENT;"],
+    "Average marks?":           ["SELECT ROUND(AVG(MARKS),1) FROM STUDENT;", "SELECT AVG(MARKS) FROM STUDENT;"],
+    "All AIML students":        ["SELECT * FROM STUDENT WHERE CLASS='AIML';"],
+    "Section A students":       ["SELECT * FROM STUDENT WHERE SECTION='A';"],
+    "All female students":      ["SELECT * FROM STUDENT WHERE GENDER='Female';"],
+    "All male students":        ["SELECT * FROM STUDENT WHERE GENDER='Male';"],
+    "CSE-AIML students":        ["SELECT * FROM STUDENT WHERE CLASS='CSE-AIML';"],
+    "Top 5 students":           ["SELECT * FROM STUDENT ORDER BY MARKS DESC LIMIT 5;"],
+    "CAI students":             ["SELECT * FROM STUDENT WHERE CLASS='CAI';"],
+    "Class-wise average marks": ["SELECT CLASS, ROUND(AVG(MARKS),1) FROM STUDENT GROUP BY CLASS;",
+                                 "SELECT CLASS, AVG(MARKS) FROM STUDENT GROUP BY CLASS;"],
+    "Marks above 80?":          ["SELECT * FROM STUDENT WHERE MARKS > 80;"],
+    "Marks below 50?":          ["SELECT * FROM STUDENT WHERE MARKS < 50;"],
+    "Gender-wise count":        ["SELECT GENDER, COUNT(*) FROM STUDENT GROUP BY GENDER;"],
+    "Section wise count":       ["SELECT CLASS, SECTION, COUNT(*) FROM STUDENT GROUP BY CLASS, SECTION;",
+                                 "SELECT SECTION, COUNT(*) FROM STUDENT GROUP BY SECTION;"],
+    "Data Science students":    ["SELECT * FROM STUDENT WHERE CLASS='Data Science';"],
+    "Pass count by class":      ["SELECT CLASS, COUNT(*) FROM STUDENT WHERE MARKS>=40 GROUP BY CLASS;"],
+}
+
+def golden_set(path=None):
+    """[{id, question, sql: [references], source}] — BASE_PROMPT examples + chips, or a JSONL file
+    of {"question", "sql"} (sql a string or a list) when path is given."""
+    if path:
+        with open(path, encoding="utf-8") as f:
+            items = [json.loads(line) for line in f if line.strip()]
+        return [{"id": str(d.get("id", i)), "question": d["question"], "source": d.get("source", "file"),
+                 "sql": d["sql"] if isinstance(d["sql"], list) else [d["sql"]]} for i, d in enumerate(items, 1)]
+    items, seen = [], set()
+    examples = [(q, [s], "prompt") for q, s in split_prompt(BASE_PROMPT)[1]]
+    for q, refs, source in examples + [(q, CHIP_SQL[q], "chip") for q in CHIPS]:
+        key = " ".join(q.lower().strip("?").split())
+        if key in seen: continue
+        seen.add(key)
+        items.append({"id": f"{source}-{len(items) + 1}", "question": q, "sql": refs, "source": source})
+    return items
+
+# ── Configurations ─────────────────────────────────────────
+_seeds, _seeds_lock = None, threading.Lock()
+
+def seed_store():
+    """Few-shot examples from BASE_PROMPT only. The app's store also holds questions learned from
+    its history, which may be the golden questions themselves with their answers; ":memory:"
+    keeps those out, and anything added here is gone with the connection."""
+    global _seeds
+    with _seeds_lock:
+        if _seeds is None: _seeds = ExampleStore(split_prompt(BASE_PROMPT)[1], path=":memory:")
+        return _seeds
+
+def prompt_for(mode, question):
+    if mode == "offline": return ""
+    if mode == "full": return BASE_PROMPT + f"\n\nQuestion: {question}\nSQL:"
+    return core.fewshot_prompt(seed_store(), question) + f"\n\nQuestion: {question}\nSQL:"
+
+def parse_config(text):
+    """"name=mode:model,model" -> (name, mode, [models]); mode is fewshot, full or offline (no model),
+    models default to core.MODELS."""
+    name, _, spec = text.partition("=")
+    mode, _, models = (spec or name).partition(":")
+    if mode not in ("fewshot", "full", "offline"): raise argparse.ArgumentTypeError(f"unknown prompt mode {mode!r}")
+    return name, mode, [m for m in models.split(",") if m] or None
+
+DEFAULT_CONFIGS = [("fewshot", "fewshot", None), ("full", "full", None)]
+
+# ── Scoring ────────────────────────────────────────────────
+def _value(v):
+    return round(float(v), 4) if isinstance(v, (int, float)) else v
+
+MAX_ALIGNMENTS = 1_000      # column orders tried when many columns hold the same values
+
+def _alignments(options, taken=()):
+    """Column orders for b: one index from each option list, none used twice."""
+    if len(taken) == len(options): yield taken; return
+    for j in options[len(taken)]:
+        if j not in taken: yield from _alignments(options, taken + (j,))
+
+def same_result(a, b):
+    """Order-insensitive result equality; column order only matters when the shapes differ.
+
+    Columns are aligned, not mixed: each column of a is paired with a column of b holding the
+    same values, and the rows are compared under that pairing."""
+    rows = lambda rs: Counter(tuple(map(_value, r)) for r in rs)
+    target = rows(a)
+    if target == rows(b): return True
+    if len(a) != len(b) or not a or len(a[0]) != len(b[0]): return False
+    column = lambda rs, i: Counter(_value(r[i]) for r in rs)
+    theirs = [column(b, j) for j in range(len(b[0]))]
+    options = [[j for j, c in enumerate(theirs) if c == column(a, i)] for i in range(len(a[0]))]
+    return any(rows([r[j] for j in order] for r in b) == target
+               for order in itertools.islice(_alignments(options), MAX_ALIGNMENTS))
+
+class Scorer:
+    """Runs SQL read-only against db, caching reference results by their normalized SQL."""
+    def __init__(self, db="student.db"):
+        self.db, self.refs = db, {}
+
+    def rows(self, sql):
+        return core.run_sql(sql, self.db, readonly=True)[0]
+
+    def score(self, item, sql):
+        """(match, error) for predicted sql."""
+        if not core.is_safe_sql(sql): return False, "blocked: not a read-only query"
+        try:
+            pred = self.rows(sql)
+        except sqlite3.Error as e:
+            return False, f"{type(e).__name__}: {e}"
+        for ref in item["sql"]:
+            key = normalize(ref)
+            if key not in self.refs: self.refs[key] = self.rows(ref)
+            if same_result(pred, self.refs[key]): return True, None
+        return False, None
+
+# ── Runs ───────────────────────────────────────────────────
+def predict(config, item, db="student.db"):
+    """One model call -> record with response, latency and token counts."""
+    name, mode, models = config
+    prompt = prompt_for(mode, item["question"])
+    rec = {"config": name, "id": item["id"], "question": item["question"],
+           "prompt_sha1": hashlib.sha1(prompt.encode()).hexdigest(), "tokens_in": approx_tokens(prompt)}
+    t0 = time.perf_counter()
+    try:
+        if mode == "offline":
+            t = fallback.translate(item["question"], db)
+            rec["response"], rec["confidence"] = t.sql, t.confidence
+        else:
+            rec["response"] = core.gemini(prompt, models=models)
+    except Exception as e:
+        rec["response"], rec["error"] = None, f"{type(e).__name__}: {e}"
+    rec["latency_ms"] = (time.perf_counter() - t0) * 1000
+    rec["tokens_out"] = approx_tokens(rec["response"] or "")
+    return rec
+
+def evaluate(golden, configs=DEFAULT_CONFIGS, db="student.db", workers=1, recorded=None):
+    """Score every config on golden; recorded (records from an earlier --out) replaces model calls."""
+    scorer, by_id = Scorer(db), {g["id"]: g for g in golden}
+    if recorded is None:
+        with ThreadPoolExecutor(workers) as pool:
+            recorded = list(pool.map(lambda job: predict(*job, db), [(c, g) for c in configs for g in golden]))
+    out = []
+    for rec in recorded:
+        item = by_id.get(rec["id"])
+        if item is None: continue
+        rec = dict(rec, sql=core.clean_sql(rec["response"]) if rec.get("response") else None)
+        if rec["sql"]:
+            rec["match"], err = scorer.score(item, rec["sql"])
+            rec["sql_error"] = err
+        else:
+            rec["match"], rec["sql_error"] = False, None
+        out.append(rec)
+    return out
+
+def summarize(records):
+    rows = {}
+    for r in records: rows.setdefault(r["config"], []).append(r)
+    table = []
+    for name, rs in rows.items():
+        lat = sorted(r["latency_ms"] for r in rs)
+        table.append({"config": name, "n": len(rs), "accuracy": sum(r["match"] for r in rs) / len(rs),
+                      "invalid": sum(bool(r.get("sql_error")) for r in rs), "failed": sum(bool(r.get("error")) for r in rs),
+                      "p50_ms": statistics.median(lat), "p95_ms": lat[min(len(lat) - 1, int(len(lat) * 0.95))],
+                      "tokens_in": statistics.mean(r["tokens_in"] for r in rs),
+                      "tokens_out": statistics.mean(r["tokens_out"] for r in rs)})
+    return table
+
+def print_table(table, f=sys.stdout):
+    print(f"{'Config':<14}{'N':>5}{'Accuracy':>10}{'Invalid':>9}{'Failed':>8}{'p50 ms':>9}{'p95 ms':>9}"
+          f"{'Tok in':>8}{'Tok out':>9}", file=f)
+    print("-" * 81, file=f)
+    for t in table:
+        print(f"{t['config']:<14}{t['n']:>5}{t['accuracy']:>10.1%}{t['invalid']:>9}{t['failed']:>8}{t['p50_ms']:>9.0f}"
+              f"{t['p95_ms']:>9.0f}{t['tokens_in']:>8.0f}{t['tokens_out']:>9.0f}", file=f)
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Execution-match evaluation of IntelliSQL NL→SQL")
+    ap.add_argument("--golden", help="JSONL golden set (default: BASE_PROMPT examples + Query page chips)")
+    ap.add_argument("--config", action="append", type=parse_config, metavar="NAME=MODE[:MODEL,...]",
+                    help="configuration to evaluate; MODE is fewshot, full or offline (repeatable)")
+    ap.add_argument("--db", default="student.db")
+    ap.add_argument("--workers", type=int, default=1, help="concurrent model calls")
+    ap.add_argument("--out", help="write every prediction (with the raw response) as JSONL")
+    ap.add_argument("--offline", metavar="JSONL", help="score the responses recorded by an earlier --out")
+    ap.add_argument("--stub", type=float, metavar="SECONDS", help="use the offline Gemini stub with this latency")
+    ap.add_argument("--min-accuracy", type=float, help="exit with status 1 if any config scores below this (0-1)")
+    args = ap.parse_args(argv)
+    if args.stub is not None:
+        from stubgemini import StubGemini
+        core.set_backend(StubGemini(latency=args.stub))
+
+    golden, recorded = golden_set(args.golden), None
+    if args.offline:
+        with open(args.offline, encoding="utf-8") as f:
+            recorded = [json.loads(line) for line in f if line.strip()]
+        if args.config:
+            names = {c[0] for c in args.config}
+            recorded = [r for r in recorded if r["config"] in names]
+    records = evaluate(golden, args.config or DEFAULT_CONFIGS, args.db, args.workers, recorded)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            for r in records: f.write(json.dumps(r, ensure_ascii=False) + "\n")
+    print(f"{len(golden)} golden questions · {'recorded responses' if recorded else type(core.backend()).__name__}\n")
+    table = summarize(records)
+    print_table(table)
+    misses = [r for r in records if not r["match"]]
+    if misses:
+        print(f"\nMisses ({len(misses)}):")
+        for r in misses[:20]:
+            print(f"  [{r['config']}] {r['question']!r}: {r.get('error') or r.get('sql_error') or r['sql']}")
+    if args.min_accuracy is not None and any(t["accuracy"] < args.min_accuracy for t in table): return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,267 @@
+import csv, hashlib, html, io, json, os, sqlite3, tempfile, threading, time
+from datetime import datetime
+
+from settings import data_path, db_stamp
+from sqlnorm import normalize, record_run
+
+CHUNK = 10_000
+EXPORT_BUDGET = 1 * 2**30       # bytes of generated export files kept on disk
+FORMATS = {
+    "csv":     ("text/csv", "csv"),
+    "html":    ("text/html", "html"),
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+    "xlsx":    ("application/vnd.openxmlformats-officedocument.spreadsheetml.sheet", "xlsx"),
+}
+
+# ── Row Sources ────────────────────────────────────────────
+# A source is (column names, iterator over lists of row tuples), so writers never need
+# the whole result at once.
+def query_source(db, sql, params=(), chunk=CHUNK, readonly=False):
+    t0   = time.perf_counter()
+    conn = sqlite3.connect(f"file:{db}?mode=ro", uri=True) if readonly else sqlite3.connect(db)
+    cur  = conn.execute(sql, params)
+    cols = [d[0] for d in cur.description]
+    def rows():
+        n = 0
+        try:
+            while True:
+                batch = cur.fetchmany(chunk)
+                if not batch: break
+                n += len(batch)
+                yield batch
+        finally:
+            conn.close()
+            record_run(sql, (time.perf_counter() - t0) * 1000, n)
+    return cols, rows()
+
+def parquet_source(path, chunk=CHUNK):
+    import pyarrow.parquet as pq
+    f = pq.ParquetFile(path)
+    def rows():
+        for b in f.iter_batches(batch_size=chunk):
+            yield list(zip(*(c.to_pylist() for c in b.columns)))
+    return f.schema_arrow.names, rows()
+
+def frame_source(df, chunk=CHUNK):
+    def rows():
+        for i in range(0, len(df), chunk):
+            yield list(df.iloc[i:i+chunk].itertuples(index=False, name=None))
+    return list(df.columns), rows()
+
+# ── Writers ────────────────────────────────────────────────
+# Each writer streams a source into a binary file object and returns the row count.
+def write_csv(source, out):
+    cols, chunks = source
+    text = io.TextIOWrapper(out, encoding="utf-8", newline="", write_through=True)
+    w = csv.writer(text)
+    w.writerow(cols)
+    n = 0
+    for batch in chunks:
+        w.writerows(batch); n += len(batch)
+    text.flush(); text.detach()
+    return n
+
+REPORT_STYLE = """body{font-family:monospace;background:#0A0A14;color:#E0E0F0;padding:40px;}
+h1{color:#00E676;} h3{color:#00BCD4;} pre{background:#12122A;padding:16px;border-radius:8px;color:#A8D8A8;white-space:pre-wrap;}
+table{width:100%;border-collapse:collapse;margin-top:16px;}
+th{background:#12122A;color:#00E676;padding:10px;text-align:left;border:1px solid rgba(0,230,118,0.2);}
+td{padding:8px 10px;border:1px solid rgba(255,255,255,0.05);}
+tr:nth-child(even){background:rgba(255,255,255,0.03);}
+.section{background:#12122A;border:1px solid rgba(0,230,118,0.2);border-radius:8px;padding:20px;margin:16px 0;}
+.pager button{background:#12122A;color:#00E676;border:1px solid rgba(0,230,118,0.3);border-radius:6px;padding:4px 12px;margin:8px 4px 0 0;cursor:pointer;}
+footer{margin-top:40px;color:#888;font-size:0.8rem;text-align:center;}"""
+
+PAGER_JS = """<script>(function(){var pages=document.querySelectorAll('tbody.pg'),cur=0,
+lab=document.getElementById('pglabel');function show(i){pages[cur].style.display='none';cur=Math.max(0,Math.min(pages.length-1,i));
+pages[cur].style.display='';lab.textContent='Page '+(cur+1)+' of '+pages.length;}
+document.getElementById('pgprev').onclick=function(){show(cur-1)};document.getElementById('pgnext').onclick=function(){show(cur+1)};
+show(0);})();</script>"""
+
+def write_html(source, out, question="", sql="", explanation="", page_size=None):
+    """Stream an HTML report; with page_size the table is split into pages with prev/next controls."""
+    cols, chunks = source
+    e = html.escape
+    out.write(f"""<!DOCTYPE html><html><head><meta charset="utf-8"><title>IntelliSQL Report</title>
+<style>{REPORT_STYLE}</style></head><body>
+<h1>🗄️ IntelliSQL Query Report</h1>
+<p style="color:#888">{datetime.now().strftime('%Y-%m-%d %H:%M')}</p>
+""".encode())
+    if question:    out.write(f'<div class="section"><h3>❓ Question</h3><p>{e(question)}</p></div>\n'.encode())
+    if sql:         out.write(f'<div class="section"><h3>🧾 Generated SQL</h3><pre>{e(sql)}</pre></div>\n'.encode())
+    if explanation: out.write(f"<div class='section'><h3>💡 Explanation</h3><p>{e(explanation)}</p></div>\n".encode())
+    out.write(('<div class="section"><h3>📊 Results <span id="nrows" style="color:#888;font-size:0.85rem"></span></h3>'
+               '<table><thead><tr>' + "".join(f"<th>{e(str(c))}</th>" for c in cols) + "</tr></thead>").encode())
+    n, in_page = 0, 0
+    if not page_size: out.write(b"<tbody>")
+    for batch in chunks:
+        parts = []
+        for row in batch:
+            if page_size and in_page == 0:
+                parts.append('<tbody class="pg" style="display:none">' if n else '<tbody class="pg">')
+            parts.append("<tr>" + "".join(f"<td>{e('' if v is None else str(v))}</td>" for v in row) + "</tr>")
+            n += 1
+            if page_size:
+                in_page += 1
+                if in_page == page_size: parts.append("</tbody>"); in_page = 0
+        out.write("".join(parts).encode())
+    if not page_size or in_page: out.write(b"</tbody>")
+    out.write(b"</table>")
+    if page_size and n > page_size:
+        out.write(b'<div class="pager"><button id="pgprev">&#8592; Prev</button><span id="pglabel"></span>'
+                  b'<button id="pgnext">Next &#8594;</button></div>' + PAGER_JS.encode())
+    out.write(f"""</div><script>document.getElementById('nrows').textContent='— {n} rows';</script>
+<footer>Generated by IntelliSQL — Powered by Google Gemini AI</footer>
+</body></html>""".encode())
+    return n
+
+def _arrow_type(values):
+    import pyarrow as pa
+    kinds = {type(v) for v in values if v is not None}
+    if kinds <= {int}:        return pa.int64() if kinds else None
+    if kinds <= {int, float}: return pa.float64()
+    if kinds <= {bytes}:      return pa.binary()
+    return pa.string()
+
+def _number(v, kind):
+    """Coerce a stray SQLite value into a numeric Parquet column; unconvertible values become NULL."""
+    try:
+        return None if v is None else kind(v)
+    except (TypeError, ValueError, OverflowError):
+        return None
+
+def write_parquet(source, out):
+    import pyarrow as pa, pyarrow.parquet as pq
+    cols, chunks = source
+    writer, types, n = None, None, 0
+    for batch in chunks:
+        columns = list(zip(*batch))
+        if writer is None:
+            # SQLite is dynamically typed: take each column's type from the first chunk,
+            # falling back to string when it is all NULL or mixed
+            types  = [_arrow_type(c) or pa.string() for c in columns]
+            writer = pq.ParquetWriter(out, pa.schema(list(zip(cols, types))), compression="zstd")
+        arrays = []
+        for c, t in zip(columns, types):
+            if t == pa.string():    c = [None if v is None else str(v) for v in c]
+            elif t == pa.float64(): c = [_number(v, float) for v in c]
+            try:
+                arrays.append(pa.array(c, type=t))
+            except (pa.ArrowInvalid, pa.ArrowTypeError, OverflowError):
+                arrays.append(pa.array([_number(v, int) for v in c], type=t))
+        writer.write_batch(pa.record_batch(arrays, names=cols)); n += len(batch)
+    if writer is None:
+        pq.write_table(pa.table({c: pa.array([], type=pa.string()) for c in cols}), out)
+    else:
+        writer.close()
+    return n
+
+def write_xlsx(source, out):
+    try:
+        from openpyxl import Workbook
+    except ImportError:
+        raise RuntimeError("Install openpyxl for Excel export: `pip install openpyxl`")
+    cols, chunks = source
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("Results")
+    ws.append(cols)
+    n = 0
+    for batch in chunks:
+        for row in batch: ws.append(row)
+        n += len(batch)
+    wb.save(out)
+    return n
+
+WRITERS = {"csv": write_csv, "html": write_html, "parquet": write_parquet, "xlsx": write_xlsx}
+
+def write(fmt, source, out, **meta):
+    if fmt != "html": meta = {}
+    return WRITERS[fmt](source, out, **meta)
+
+def export_file(fmt, db, query, **meta):
+    """Stream a query straight from the SQLite cursor into a temp file (rewound, ready to read)."""
+    f = tempfile.TemporaryFile()
+    write(fmt, query_source(db, query), f, **meta)
+    f.seek(0)
+    return f
+
+def export_bytes(fmt, db, query, **meta):
+    with export_file(fmt, db, query, **meta) as f:
+        return f.read()
+
+# ── Export Cache ───────────────────────────────────────────
+class ExportCache:
+    """Generated export files keyed by (result identity, format), built only when first requested.
+
+    A result is identified by its database, normalized query text and the database's change stamp,
+    so any write to the database naturally produces new keys; old files age out by LRU. Callers that
+    already know the result's identity (a saved report's row hash) pass it as result, with a source
+    to build from, and keep their files across writes that leave the result unchanged."""
+    def __init__(self, directory=None, budget=EXPORT_BUDGET):
+        self.dir, self.budget = directory or data_path("exports"), budget
+        os.makedirs(self.dir, exist_ok=True)
+        self.lock, self.building = threading.Lock(), {}
+        self.counts = {"hits": 0, "builds": 0}
+
+    def key(self, fmt, db, query, result=None, **meta):
+        ident = [fmt, result] if result else [fmt, os.path.abspath(db), normalize(query), db_stamp(db)]
+        ident = json.dumps(ident + [sorted(meta.items())], default=str)
+        return hashlib.sha1(ident.encode()).hexdigest()
+
+    def path(self, fmt, db, query, result=None, source=None, **meta):
+        """Path of the export file, generating it on a miss (concurrent requests share one build) from
+        source() if given, else by running query."""
+        key  = self.key(fmt, db, query, result, **meta)
+        path = os.path.join(self.dir, f"{key}.{FORMATS[fmt][1]}")
+        with self.lock:
+            if os.path.exists(path):
+                self.counts["hits"] += 1; os.utime(path)
+                return path
+            build = self.building.setdefault(key, threading.Lock())
+        with build:
+            if not os.path.exists(path):
+                tmp = path + ".part"
+                try:
+                    with open(tmp, "wb") as f: write(fmt, source() if source else query_source(db, query), f, **meta)
+                    os.replace(tmp, path)
+                    with self.lock: self.counts["builds"] += 1
+                except BaseException:            # a failed build leaves nothing behind; the next request retries
+                    try:
+                        os.remove(tmp)
+                    except FileNotFoundError:
+                        pass
+                    raise
+                finally:
+                    with self.lock: self.building.pop(key, None)
+                self._trim()
+        return path
+
+    def read(self, fmt, db, query, result=None, source=None, **meta):
+        with open(self.path(fmt, db, query, result, source, **meta), "rb") as f:
+            return f.read()
+
+    def _files(self):
+        """(mtime, size, path) of the finished exports; one removed meanwhile by another thread is skipped."""
+        out = []
+        for f in os.listdir(self.dir):
+            if f.endswith(".part"): continue
+            try:
+                st = os.stat(os.path.join(self.dir, f))
+            except FileNotFoundError:
+                continue
+            out.append((st.st_mtime, st.st_size, os.path.join(self.dir, f)))
+        return out
+
+    def _trim(self):
+        files = sorted(self._files())
+        used  = sum(sz for _, sz, _ in files)
+        for _, sz, f in files:
+            if used <= self.budget: break
+            try:
+                os.remove(f)
+            except FileNotFoundError:    # removed by a concurrent trim
+                pass
+            used -= sz
+
+    def stats(self):
+        files = self._files()
+        return {"files": len(files), "disk": sum(sz for _, sz, _ in files), **self.counts}
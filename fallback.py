@@ -0,0 +1,348 @@
+import re, sqlite3, statistics, threading, time
+from collections import deque
+
+from refine import AGGREGATES, COLUMN_WORDS, FILLER, GENDER_WORDS, PASS_MARK, SCORE_COL, VOCAB
+from sqlast import quote
+from settings import db_stamp
+
+# Keyword / slot NL→SQL over one table, used when no model can be reached. Values are matched
+# against the column values in the database; comparisons, aggregates, grouping and ordering
+# against the column names. Every word of the question has to be accounted for by a slot, a
+# table word or filler, and the share that was is reported as the confidence; one unknown word
+# ("second highest", "starts with") can change what is asked, so anything short of all of it
+# is refused.
+
+# ── Catalog ────────────────────────────────────────────────
+MAX_VALUES     = 40      # text columns with at most this many distinct values are matched by value
+MIN_CONFIDENCE = 1.0     # below this a translation is not good enough to run unasked
+NUMERIC_TYPES  = ("INT", "REAL", "FLOA", "DOUB", "NUM", "DEC")
+TABLE_WORDS    = {"row", "rows", "record", "records", "entry", "entries", "item", "items", "data", "table"}
+
+def _plural(word):
+    return word + ("es" if word.endswith(("s", "x", "ch", "sh")) else "s")
+
+class Column:
+    __slots__ = ("name", "numeric", "values", "words")
+    def __init__(self, name, numeric, values):
+        self.name, self.numeric, self.values = name, numeric, values
+        base = name.lower().replace("_", " ")
+        self.words = {base, _plural(base)}
+
+class Catalog:
+    """One table: its columns, their low-cardinality values and the words that name them."""
+    def __init__(self, table, columns):
+        self.table, self.columns = table, {c.name: c for c in columns}
+        name = table.lower().replace("_", " ")
+        self.table_words = TABLE_WORDS | {name, name + "s", name.rstrip("s")}
+        self.domain = table.upper() in VOCAB
+        heads = [c.name.lower().replace("_", " ").split()[-1] for c in columns]
+        for c, head in zip(columns, heads):       # "price" for unit_price, unless another column ends in it too
+            if heads.count(head) == 1 and head not in c.words: c.words |= {head, _plural(head)}
+        if self.domain:
+            for word, col in COLUMN_WORDS.items():
+                if col in self.columns: self.columns[col].words.add(word)
+        numeric = [c.name for c in columns if c.numeric]
+        self.score = (SCORE_COL if self.domain and SCORE_COL in self.columns
+                      else numeric[0] if len(numeric) == 1 else None)
+        self.intents = _value_intents(self) + _intents(self)
+        self.refusals = _refusals(self)
+
+    def words(self, numeric=None):
+        """Regex alternation of the words naming columns (only numeric / text ones if asked), longest first."""
+        words = {w for c in self.columns.values() if numeric is None or c.numeric == numeric for w in c.words}
+        return "|".join(map(re.escape, sorted(words, key=len, reverse=True))) or r"(?!x)x"
+
+    def column(self, word):
+        return next(c.name for c in self.columns.values() if word in c.words)
+
+def user_tables(conn):
+    """Tables a question can be about: no sqlite_ / underscore internals, no FTS shadow tables."""
+    rows = conn.execute("SELECT name, sql FROM sqlite_master WHERE type='table'").fetchall()
+    virtual = [n for n, s in rows if (s or "").upper().startswith("CREATE VIRTUAL")]
+    return [n for n, s in rows if n not in virtual and not n.startswith(("sqlite_", "_"))
+            and not any(n.startswith(v + "_") for v in virtual)]
+
+def _ident(name):
+    return name if re.fullmatch(r"[A-Za-z_]\w*", name) else '"' + name.replace('"', '""') + '"'
+
+def build_catalog(conn, table):
+    columns = []
+    for _, name, decl, *_ in conn.execute(f"PRAGMA table_info({_ident(table)})"):
+        numeric, values = any(t in (decl or "").upper() for t in NUMERIC_TYPES), []
+        if not numeric:
+            values = [v for (v,) in conn.execute(
+                f"SELECT DISTINCT {_ident(name)} FROM {_ident(table)} LIMIT {MAX_VALUES + 1}")
+                if isinstance(v, str) and v.strip()]
+            if len(values) > MAX_VALUES: values = []
+        columns.append(Column(name, numeric, values))
+    if not columns: raise ValueError(f"no such table: {table}")
+    return Catalog(table, columns)
+
+_catalogs, _catalogs_lock = {}, threading.Lock()
+
+def catalog(db, table=None):
+    """Catalog of table (default: the domain table if db has it, else its first table), rebuilt when db changes."""
+    stamp = db_stamp(db)
+    with _catalogs_lock:
+        hit = _catalogs.get((db, table))
+    if hit and hit[0] == stamp: return hit[1]
+    conn = sqlite3.connect(f"file:{db}?mode=ro", uri=True)
+    try:
+        name = table
+        if name is None:
+            tables = user_tables(conn)
+            if not tables: raise ValueError(f"{db} has no tables")
+            name = next((t for t in tables if t.upper() in VOCAB), tables[0])
+        cat = build_catalog(conn, name)
+    finally:
+        conn.close()
+    with _catalogs_lock: _catalogs[(db, table)] = (stamp, cat)
+    return cat
+
+# ── Slots ──────────────────────────────────────────────────
+NUMBER_WORDS = {"one": 1, "two": 2, "three": 3, "four": 4, "five": 5, "six": 6, "seven": 7, "eight": 8,
+                "nine": 9, "ten": 10, "fifteen": 15, "twenty": 20, "thirty": 30, "forty": 40, "fifty": 50,
+                "sixty": 60, "seventy": 70, "eighty": 80, "ninety": 90, "hundred": 100}
+NUM = r"(\d+(?:\.\d+)?|" + "|".join(NUMBER_WORDS) + r")\b"
+COMPARE = {"above": ">", "over": ">", "more than": ">", "greater than": ">", "higher than": ">", "exceeding": ">",
+           "below": "<", "under": "<", "less than": "<", "lower than": "<", "at least": ">=", "minimum of": ">=",
+           "at most": "<=", "maximum of": "<=", "equal to": "=", "exactly": "=", ">=": ">=", "<=": "<=",
+           ">": ">", "<": "<", "=": "="}
+# Sections are lettered within each class, so STUDENT figures per section are per class and section.
+GROUP_WITH = {"SECTION": "CLASS"}
+DESCENDING = ("top", "best", "highest", "most", "desc", "high", "z")
+# Negation and disjunction flip or widen what the slots would filter on ("not female", "below 40 or
+# above 90"), ordinals, distinctness and sameness ask for something no slot builds; a question using
+# them is never answered offline. "sections a or b" is read by the value slot before this is checked,
+# so the lists it covers still work.
+BLOCKERS = re.compile(r"\b(?:not|no|none|nor|neither|or|except|excluding|exclude|without|other than|\w+n't"
+                      r"|second|third|distinct|different|unique|same)\b")
+
+# Words that carry no meaning of their own once the slots around them are taken.
+FILLER_WORDS = FILLER | set("""all every show list display find fetch select which what who where there any
+has have had than more was were be been by each per wise scoring across for""".split())
+
+def _number(text):
+    return NUMBER_WORDS[text] if text in NUMBER_WORDS else float(text) if "." in text else int(text)
+
+class Slots:
+    """What the question asked for, in SQL terms."""
+    def __init__(self, cat):
+        self.cat, self.values, self.where, self.group, self.aggs, self.project = cat, {}, [], [], [], []
+        self.order, self.limit, self.rank, self.extreme = None, None, None, None
+        self.each = False                        # grouped by "each / per / every ..." rather than ranked groups
+
+    def add_group(self, col):
+        for c in ([GROUP_WITH[col]] if col in GROUP_WITH and self.cat.domain else []) + [col]:
+            if c in self.cat.columns and c not in self.group: self.group.append(c)
+
+    def agg(self, func, col=None):
+        if func == "COUNT": expr, alias = "COUNT(*)", "COUNT"
+        elif func == "AVG": expr, alias = f"ROUND(AVG({_ident(col)}),1)", f"AVG_{col}"
+        else:               expr, alias = f"{func}({_ident(col)})", f"{func}_{col}"
+        if (expr, alias) not in self.aggs: self.aggs.append((expr, alias))
+        if func in ("MAX", "MIN"): self.extreme = (func, col)
+
+    def to_sql(self):
+        table = _ident(self.cat.table)
+        conds = [f"{_ident(c)}={quote(vs[0])}" if len(vs) == 1 else f"{_ident(c)} IN ({', '.join(map(quote, vs))})"
+                 for c, vs in self.values.items()] + self.where
+        where = " WHERE " + " AND ".join(conds) if conds else ""
+        if self.extreme and len(self.aggs) == 1 and not self.group:
+            # "highest marks": the rows holding it, as the few-shot examples answer it
+            func, col = self.extreme
+            conds = conds + [f"{_ident(col)}=(SELECT {func}({_ident(col)}) FROM {table}{where})"]
+            return f"SELECT * FROM {table} WHERE {' AND '.join(conds)};"
+        aggregated = bool(self.group or self.aggs)
+        if aggregated:
+            if not self.aggs: self.agg("COUNT")
+            cols = [_ident(g) for g in self.group] + [f"{e} AS {_ident(a)}" for e, a in self.aggs]
+        else:
+            cols = [_ident(p) for p in self.project if p not in self.values] or ["*"]
+        sql = f"SELECT {', '.join(cols)} FROM {table}{where}"
+        if self.group: sql += " GROUP BY " + ", ".join(map(_ident, self.group))
+        order, limit = self.order, self.limit
+        if aggregated:
+            first = _ident(self.aggs[0][1])
+            if self.rank:    order, limit = (first, self.rank), limit or (1 if self.group else None)
+            elif self.group: order = order and (_ident(order[0]) if order[0] in self.group else first, order[1])
+            else:            order = None
+        elif order:
+            order = (_ident(order[0]), order[1])
+        if order: sql += f" ORDER BY {order[0]} {order[1]}"
+        if limit: sql += f" LIMIT {limit}"
+        return sql + ";"
+
+def _target(cat, word):
+    """Numeric column named by word, else the table's score column (None when it has none)."""
+    return cat.column(word) if word else cat.score
+
+def _value_handler(col, named):
+    """Handler for a column's value regex: filter on every value the match names."""
+    def handler(s, m):
+        found = list(dict.fromkeys(v for rx, v in named if rx.search(m.group(0))))  # "female" is a value and a gender word
+        vals = s.values.setdefault(col, [])
+        vals += [v for v in found if v not in vals]
+        return f"{col} = {' / '.join(found)}"
+    return handler
+
+def _between(s, m):
+    col = _target(s.cat, m.group(1) or m.group(4))
+    if col is None: return None
+    lo, hi = sorted((_number(m.group(2)), _number(m.group(3))))
+    s.where.append(f"{_ident(col)} BETWEEN {lo} AND {hi}")
+    return f"{col} between {lo} and {hi}"
+
+def _pass_fail(s, m):
+    if s.cat.score != SCORE_COL: return None
+    op = ">=" if m.group(1).startswith("pass") else "<"
+    s.where.append(f"{SCORE_COL}{op}{PASS_MARK}")
+    return "passed" if op == ">=" else "failed"
+
+def _compare(s, m):
+    col = _target(s.cat, m.group(1) or m.group(4))
+    if col is None: return None
+    op, n = COMPARE[m.group(2)], _number(m.group(3))
+    s.where.append(f"{_ident(col)} {op} {n}")
+    return f"{col} {op} {n}"
+
+def _top_n(s, m):
+    col = _target(s.cat, m.group(4))
+    if col is None: return None
+    desc = m.group(1) in DESCENDING
+    s.order, s.limit = (col, "DESC" if desc else "ASC"), _number(m.group(2))
+    if not m.group(3): return f"{m.group(1)} {s.limit} by {col}"
+    s.add_group(s.cat.column(m.group(3)))
+    return f"{m.group(1)} {s.limit} {m.group(3)} by {col}"
+
+def _limit(s, m):
+    s.limit = _number(m.group(1))
+    return f"limit {s.limit}"
+
+def _sort(s, m):
+    col, d = s.cat.column(m.group(1)), (m.group(2) or "")
+    desc = d.startswith(DESCENDING) if d else s.cat.columns[col].numeric
+    s.order = (col, "DESC" if desc else "ASC")
+    return f"sort by {col} {s.order[1]}"
+
+def _rank(s, m):
+    s.rank = "DESC" if m.group(1) in DESCENDING else "ASC"
+    return f"{m.group(1)} first"
+
+def _aggregate(s, m):
+    func = AGGREGATES[m.group(1).replace(" of", "")]
+    if func == "COUNT":
+        s.agg("COUNT"); return "count"
+    col = _target(s.cat, m.group(2))
+    if col is None: return None
+    s.agg(func, col)
+    return f"{func.lower()} of {col}"
+
+def _group(s, m):
+    col = s.cat.column(m.group(1))
+    s.add_group(col)
+    s.each = s.each or not m.group(0).startswith(("which", "what"))
+    return f"per {col}"
+
+def _by(s, m):
+    col = s.cat.column(m.group(1))
+    s.order = (col, "DESC")
+    return f"by {col}"
+
+def _project(s, m):
+    col = s.cat.column(m.group(1))
+    if col not in s.project: s.project.append(col)
+    return col
+
+def _intents(cat):
+    """(pattern, handler) tried in this order after the values; each match is blanked out of the question."""
+    num, text, cols = cat.words(True), cat.words(False), cat.words()
+    cmp  = "|".join(sorted(map(re.escape, COMPARE), key=len, reverse=True))
+    rows = "|".join(map(re.escape, sorted(cat.table_words, key=len, reverse=True)))
+    intents = [
+        (rf"(?:\b({num})\s+(?:is\s+|are\s+)?)?\bbetween\s+{NUM}\s+(?:and|to|-)\s+{NUM}(?:\s+({num})\b)?", _between),
+        (r"\b(pass(?:ed|ing)?|fail(?:ed|ing)?)\b", _pass_fail),
+        (rf"(?:\b({num})\s+(?:is\s+|are\s+|of\s+)?)?(?<!\w)({cmp})\s*{NUM}(?:\s+({num})\b)?", _compare),
+        (rf"\b(top|best|highest|bottom|lowest|worst)\s+{NUM}(?:\s+(?:{rows}|({text})\b))?(?:\s+(?:by|in|on)\s+({num})\b)?", _top_n),
+        (rf"\b(?:limit(?:\s+to)?|first|only|just)\s+{NUM}", _limit),
+        (rf"\b(?:sort(?:ed)?|order(?:ed)?|rank(?:ed)?|arranged?)\s+(?:them\s+|it\s+)?by\s+({cols})\b"
+         r"(?:\s+(asc(?:ending)?|desc(?:ending)?|high(?:est)? to low(?:est)?|low(?:est)? to high(?:est)?|a-z|z-a))?", _sort),
+        (r"\b(best|highest|top|most|worst|lowest|least)\b(?=\s+(?:average|avg|mean|total|sum|count|number))", _rank),
+        (rf"\b(average|avg|mean|maximum|max|highest|minimum|min|lowest|sum|total|count|how many|number of)\b"
+         rf"(?:\s+(?:of\s+)?(?:the\s+)?({num})\b)?", _aggregate),
+        (rf"\b({text})\s*-?\s*wise\b", _group),
+        (rf"\b(?:by|per|for each|each|every|across|which|what)\s+({text})\b", _group),
+        (rf"\bby\s+({num})\b", _by),
+        (rf"\b({cols})\b", _project),
+    ]
+    return [(re.compile(p), h) for p, h in intents]
+
+def _refusals(cat):
+    """(pattern, reason) checked on the whole question: phrases whose words the slots would take,
+    but whose meaning they can't express."""
+    return [(re.compile(p), reason) for p, reason in [
+        (r"\b(?:than|above|below|over|under|exceeding)\s+(?:the\s+)?(?:overall\s+|class\s+)?"
+         r"(?:average|avg|mean|median|maximum|max|minimum|min|highest|lowest)\b", "compared with an aggregate"),
+        (rf"\b(?:how many|number of)\s+(?:{cat.words()})\b", "count of distinct values"),
+    ]]
+
+# ── Translation ────────────────────────────────────────────
+class Translation:
+    """sql, confidence (0-1: share of the question's words the slots accounted for), what was
+    understood (one phrase per slot) and the words that were not."""
+    def __init__(self, sql, confidence, understood, unmatched, table):
+        self.sql, self.confidence, self.understood, self.unmatched, self.table = sql, confidence, understood, unmatched, table
+    def __repr__(self):
+        return f"Translation({self.sql!r}, {self.confidence:.2f}, {self.understood}, unmatched={self.unmatched})"
+
+WORD = re.compile(r"[a-z0-9']+")
+_times, _times_lock = deque(maxlen=200), threading.Lock()
+
+def _value_intents(cat):
+    """(pattern, handler) per column for the values it holds. Longest values first so CSE-AIML wins over CSE; short values (section "A")
+    only count after their column word: "section a", "sections a and b"."""
+    any_of = lambda ps: r"(?<![\w-])(?:" + "|".join(ps) + r")(?![\w-])"
+    out = []
+    for col in cat.columns.values():
+        pats = [(re.escape(v.lower()), v) for v in col.values]
+        pats += [(pat, v) for v, pat in GENDER_WORDS.items() if v in col.values]
+        if not pats: continue
+        pats.sort(key=lambda p: len(p[1]), reverse=True)
+        short = [p for p, v in pats if len(v) <= 2 or v.lower() in FILLER_WORDS]
+        longer = [p for p, v in pats if p not in short]
+        words = "|".join(map(re.escape, sorted(col.words, key=len, reverse=True)))
+        finds = ([rf"(?:\b(?:{words})\s+)?{any_of(longer)}"] if longer else []) + \
+                ([rf"\b(?:{words})\s+{any_of(short)}(?:(?:\s*(?:and|or|&)\s*|\s+){any_of(short)})*"] if short else [])
+        named = [(re.compile(any_of([p])), v) for p, v in pats]
+        out += [(re.compile(f), _value_handler(col.name, named)) for f in finds]
+    return out
+
+def translate(question, db="student.db", table=None):
+    """Question -> Translation against table in db (see catalog() for the default table)."""
+    t0 = time.perf_counter()
+    cat = catalog(db, table)
+    s, used, understood = Slots(cat), 0, []
+    text = " " + re.sub(r"[?!.,;:()\"]", " ", question.lower()) + " "
+    blocked = [reason for rx, reason in cat.refusals if rx.search(text)]
+    for pat, handler in cat.intents:
+        while m := pat.search(text):
+            label = handler(s, m)
+            if label is None: break
+            understood.append(label)
+            used += len(WORD.findall(m.group(0)))
+            text = text[:m.start()] + " " + text[m.end():]
+    words = WORD.findall(text)
+    used += sum(w in cat.table_words for w in words)
+    unmatched = [w for w in words if w not in cat.table_words and w not in FILLER_WORDS]
+    confidence = used / (used + len(unmatched)) if used else 0.0
+    blocked += BLOCKERS.findall(text) + (["top N per group"] if s.each and s.limit else [])
+    if blocked:                                  # the slots can't express it: never clear MIN_CONFIDENCE
+        unmatched, confidence = list(dict.fromkeys(blocked + unmatched)), 0.0
+    out = Translation(s.to_sql(), round(confidence, 2), understood, unmatched, cat.table)
+    with _times_lock: _times.append((time.perf_counter() - t0) * 1000)
+    return out
+
+def stats():
+    """Recent translations: count and median time (ms)."""
+    with _times_lock: recent = list(_times)
+    return {"translations": len(recent), "median_ms": statistics.median(recent) if recent else None}
@@ -0,0 +1,104 @@
+import re, sqlite3
+
+from writer import writer
+
+COUNT_CAP = 10_000       # filtered counts stop here ("10,000+")
+
+def _q(name):
+    return '"' + name.replace('"', '""') + '"'
+
+def index_sql(table, col):
+    """CREATE INDEX for a sort column, so keyset seeks on it never scan."""
+    name = re.sub(r"\W", "_", f"IX_{table}_{col}")
+    return f"CREATE INDEX IF NOT EXISTS {_q(name)} ON {_q(table)}({_q(col)})"
+
+class Grid:
+    """One table of a SQLite database, served a page at a time.
+
+    Pages use keyset pagination on (sort column, rowid), so each page is an index range scan
+    no matter how deep the user pages; filtering and sorting happen in SQL. A cursor is the
+    (sort value, rowid) of the last row shown. Paging never writes to the database: a sort
+    column without an index (see indexed) still works, one sorted scan per page, until
+    create_index() is asked for."""
+    def __init__(self, db, table):
+        self.db, self.table = db, table
+        conn = sqlite3.connect(db)
+        try:
+            info = conn.execute(f"PRAGMA table_info({_q(table)})").fetchall()
+            if not info: raise sqlite3.OperationalError(f"no such table: {table}")
+            firsts = [conn.execute(f"PRAGMA index_info({_q(r[1])})").fetchone()
+                      for r in conn.execute(f"PRAGMA index_list({_q(table)})").fetchall()]
+        finally:
+            conn.close()
+        self.columns = [r[1] for r in info]
+        self.text = [r[1] for r in info if not r[2] or re.search(r"CHAR|TEXT|CLOB", r[2], re.I)]
+        self.indexed = {f[2] for f in firsts if f}       # columns some index starts with
+
+    def create_index(self, col):
+        """Index col through the shared writer (blocks until committed)."""
+        if col not in self.columns: raise ValueError(f"unknown column {col}")
+        writer(self.db).execute(index_sql(self.table, col))
+        self.indexed.add(col)
+
+    def _filter(self, search):
+        if not search or not self.text: return [], []
+        like = "%" + re.sub(r"([\\%_])", r"\\\1", search) + "%"     # % and _ match themselves
+        return ["(" + " OR ".join(f"{_q(c)} LIKE ? ESCAPE '\\'" for c in self.text) + ")"], [like] * len(self.text)
+
+    def _segments(self, s, desc, after):
+        """WHERE clauses that, run in order, continue the listing after the cursor. Each one is a
+        single index seek: ties with the cursor value first, then values strictly beyond it, with
+        NULLs first ascending / last descending (row-value comparisons never match NULL)."""
+        lt, gt = ("<", ">") if desc else (">", "<")
+        nulls = [(f"{s} IS NULL", [])]
+        if after is None:
+            values = [(f"{s} IS NOT NULL", [])]
+            return values + nulls if desc else nulls + values
+        val, rid = after
+        if val is None:
+            tail = [(f"{s} IS NULL AND rowid {lt} ?", [rid])]
+            return tail if desc else tail + [(f"{s} IS NOT NULL", [])]
+        segs = [(f"{s} = ? AND rowid {lt} ?", [val, rid]), (f"{s} {lt} ?", [val])]
+        return segs + nulls if desc else segs
+
+    def page(self, sort, desc=False, after=None, search="", size=50):
+        """(DataFrame of up to size rows, cursor for the next page or None when this is the last)."""
+        if sort not in self.columns: raise ValueError(f"unknown column {sort}")
+        conds, params = self._filter(search)
+        s, order = _q(sort), "DESC" if desc else "ASC"
+        rows = []
+        conn = sqlite3.connect(self.db)
+        try:
+            for cond, args in self._segments(s, desc, after):
+                sql = (f"SELECT rowid AS __rowid, * FROM {_q(self.table)} WHERE " + " AND ".join(conds + [cond])
+                       + f" ORDER BY {s} {order}, rowid {order} LIMIT ?")
+                rows += conn.execute(sql, params + args + [size + 1 - len(rows)]).fetchall()
+                if len(rows) > size: break
+        finally:
+            conn.close()
+        import pandas as pd
+        df = pd.DataFrame.from_records(rows[:size], columns=["__rowid"] + self.columns)
+        cursor = (_plain(df[sort].iloc[-1]), int(df["__rowid"].iloc[-1])) if len(rows) > size else None
+        return df.drop(columns="__rowid"), cursor
+
+    def estimate(self, search=""):
+        """(row count, exact?) — unfiltered counts come from the largest rowid (O(1), high if rows
+        were deleted); filtered counts are exact up to COUNT_CAP."""
+        conds, params = self._filter(search)
+        conn = sqlite3.connect(self.db)
+        try:
+            if not conds:
+                n = conn.execute(f"SELECT MAX(rowid) FROM {_q(self.table)}").fetchone()[0] or 0
+                if n <= COUNT_CAP:
+                    return conn.execute(f"SELECT COUNT(*) FROM {_q(self.table)}").fetchone()[0], True
+                return n, False
+            n = conn.execute(f"SELECT COUNT(*) FROM (SELECT 1 FROM {_q(self.table)} WHERE {' AND '.join(conds)} "
+                             f"LIMIT {COUNT_CAP + 1})", params).fetchone()[0]
+            return min(n, COUNT_CAP), n <= COUNT_CAP
+        finally:
+            conn.close()
+
+def _plain(v):
+    """numpy scalar -> Python value, so cursors survive session_state and bind as SQL parameters."""
+    if v is None or (isinstance(v, float) and v != v): return None
+    return v.item() if hasattr(v, "item") else v
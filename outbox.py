@@ -0,0 +1,215 @@
+import os, re, smtplib, sqlite3, ssl, threading, time
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+
+from settings import data_path
+
+BATCH        = 20        # messages claimed per worker pass
+MAX_ATTEMPTS = 5
+BACKOFF      = 5         # seconds before the first retry, doubled each attempt
+MAX_BACKOFF  = 600
+IDLE_CLOSE   = 60        # seconds an authenticated connection is kept open without traffic
+LOOPBACK     = ("localhost", "127.0.0.1", "::1")    # relays (smtpstub.py) that may see a password unencrypted
+
+def smtp_server():
+    """(host, port) from INTELLISQL_SMTP=host:port, defaulting to Gmail over SSL."""
+    host, _, port = os.getenv("INTELLISQL_SMTP", "smtp.gmail.com:465").rpartition(":")
+    return host, int(port)
+
+def split_recipients(text):
+    return [r for r in re.split(r"[,;\s]+", text or "") if r]
+
+class InsecureConnection(smtplib.SMTPException):
+    """The server offers no encryption, so the password is not sent."""
+
+def _permanent(ex):
+    """Errors that a retry won't fix: bad credentials, refused recipients, no TLS, 5xx replies."""
+    if isinstance(ex, (smtplib.SMTPAuthenticationError, smtplib.SMTPRecipientsRefused, smtplib.SMTPSenderRefused,
+                       InsecureConnection)):
+        return True
+    return isinstance(ex, smtplib.SMTPResponseException) and ex.smtp_code >= 500
+
+# ── Outbox ─────────────────────────────────────────────────
+class Outbox:
+    """Persistent email queue drained by one background worker.
+
+    Messages live in .intellisql/outbox.db so they survive restarts; SMTP passwords are
+    only kept in memory, per account: the (session, sender) that queued the message. Mail
+    is only ever sent with its own session's password, and mail whose password is gone (a
+    restart, a rejected login) fails instead of waiting. The worker keeps one authenticated
+    connection per account, sends due messages in batches over it and retries transient
+    failures with exponential backoff."""
+    def __init__(self, path=None, server=None, batch=BATCH, max_attempts=MAX_ATTEMPTS,
+                 backoff=BACKOFF, idle_close=IDLE_CLOSE):
+        self.path = path or data_path("outbox.db")
+        self.host, self.port = server or smtp_server()
+        self.batch, self.max_attempts, self.backoff, self.idle_close = batch, max_attempts, backoff, idle_close
+        self.creds = {}                 # (session, sender) -> password
+        self.conns = {}                 # (session, sender) -> [smtp, last used]
+        self.lock  = threading.Lock()
+        self.wake, self.stopping = threading.Event(), threading.Event()
+        self.counts = {"connections": 0, "sent": 0, "retries": 0, "failed": 0}
+        conn = self._db()
+        conn.execute("""CREATE TABLE IF NOT EXISTS OUTBOX(ID INTEGER PRIMARY KEY, SESSION TEXT, SENDER TEXT,
+                        RECIPIENT TEXT, SUBJECT TEXT, BODY TEXT, STATUS TEXT, ATTEMPTS INTEGER DEFAULT 0,
+                        NEXT_TRY REAL, ERROR TEXT, CREATED REAL, SENT REAL)""")
+        conn.execute("CREATE INDEX IF NOT EXISTS OUTBOX_DUE ON OUTBOX(STATUS, NEXT_TRY)")
+        conn.execute("UPDATE OUTBOX SET STATUS='queued' WHERE STATUS='sending'")     # interrupted by a restart
+        conn.commit(); conn.close()
+        self.thread = threading.Thread(target=self._run, daemon=True, name="outbox")
+        self.thread.start()
+
+    def _db(self):
+        return sqlite3.connect(self.path, timeout=10)
+
+    def enqueue(self, session, sender, password, recipients, subject, body):
+        """Queue one message per recipient and return their ids; sending happens in the background."""
+        if not password: raise ValueError(f"no password for {sender}: mail is only sent with the queuing session's own")
+        now = time.time()
+        with self.lock: self.creds[(session, sender)] = password
+        conn = self._db()
+        ids = []
+        for r in split_recipients(recipients) if isinstance(recipients, str) else recipients:
+            cur = conn.execute("INSERT INTO OUTBOX(SESSION,SENDER,RECIPIENT,SUBJECT,BODY,STATUS,NEXT_TRY,CREATED) "
+                               "VALUES (?,?,?,?,?,'queued',?,?)", (session, sender, r, subject, body, now, now))
+            ids.append(cur.lastrowid)
+        conn.commit(); conn.close()
+        self.wake.set()
+        return ids
+
+    def status(self, session, limit=10):
+        """Latest messages queued by a session, newest first."""
+        conn = self._db()
+        rows = conn.execute("SELECT ID,RECIPIENT,SUBJECT,STATUS,ATTEMPTS,NEXT_TRY,ERROR FROM OUTBOX "
+                            "WHERE SESSION=? ORDER BY ID DESC LIMIT ?", (session, limit)).fetchall()
+        conn.close()
+        keys = ("id", "recipient", "subject", "status", "attempts", "next_try", "error")
+        return [dict(zip(keys, r)) for r in rows]
+
+    def pending(self, session=None):
+        conn = self._db()
+        q, args = "SELECT COUNT(*) FROM OUTBOX WHERE STATUS IN ('queued','sending')", ()
+        if session is not None: q, args = q + " AND SESSION=?", (session,)
+        n = conn.execute(q, args).fetchone()[0]
+        conn.close()
+        return n
+
+    def drain(self, timeout=30):
+        """Block until nothing sendable is left (used by the benchmark and for shutdown)."""
+        end = time.time() + timeout
+        while time.time() < end:
+            if not self.pending(): return True
+            self.wake.set(); time.sleep(0.02)
+        return False
+
+    def close(self):
+        self.stopping.set(); self.wake.set()
+        self.thread.join(timeout=5)
+        for account in list(self.conns): self._drop(account)
+
+    # ── Worker ──
+    def _run(self):
+        while not self.stopping.is_set():
+            batch = self._claim()
+            if batch:
+                self._deliver(batch)
+                continue
+            self._close_idle()
+            self.wake.wait(self._next_wait()); self.wake.clear()
+
+    def _claim(self):
+        """Due messages whose account has a password, marked sending; the others are failed."""
+        conn = self._db()
+        with conn:
+            rows = conn.execute("SELECT ID,SESSION,SENDER,RECIPIENT,SUBJECT,BODY,ATTEMPTS FROM OUTBOX WHERE STATUS='queued' "
+                                "AND NEXT_TRY<=? ORDER BY SESSION, SENDER, ID LIMIT ?", (time.time(), self.batch)).fetchall()
+            with self.lock: known = set(self.creds)
+            orphans = [r[0] for r in rows if (r[1], r[2]) not in known]
+            rows = [r for r in rows if (r[1], r[2]) in known]
+            conn.executemany("UPDATE OUTBOX SET STATUS='sending' WHERE ID=?", [(r[0],) for r in rows])
+            conn.executemany("UPDATE OUTBOX SET STATUS='failed', ERROR=? WHERE ID=?",
+                             [("No password for this sender any more (app restarted or login rejected): send it again", i)
+                              for i in orphans])
+        conn.close()
+        self.counts["failed"] += len(orphans)
+        return rows
+
+    def _next_wait(self):
+        conn = self._db()
+        nxt = conn.execute("SELECT MIN(NEXT_TRY) FROM OUTBOX WHERE STATUS='queued'").fetchone()[0]
+        conn.close()
+        wait = self.idle_close if nxt is None else max(0.0, nxt - time.time())
+        return min(wait, self.idle_close) if self.conns else wait
+
+    def _smtp(self, account):
+        if account in self.conns:
+            self.conns[account][1] = time.time()
+            return self.conns[account][0]
+        tls = ssl.create_default_context()
+        s = (smtplib.SMTP_SSL(self.host, self.port, timeout=30, context=tls) if self.port == 465
+             else smtplib.SMTP(self.host, self.port, timeout=30))
+        try:
+            if self.port != 465:
+                s.ehlo()
+                if s.has_extn("starttls"):
+                    s.starttls(context=tls); s.ehlo()
+                elif self.host not in LOOPBACK:
+                    raise InsecureConnection(f"{self.host}:{self.port} does not offer STARTTLS; "
+                                             f"not sending the password unencrypted")
+            with self.lock: password = self.creds[account]
+            s.login(account[1], password)
+        except Exception:
+            s.close(); raise
+        self.counts["connections"] += 1
+        self.conns[account] = [s, time.time()]
+        return s
+
+    def _drop(self, account):
+        s = self.conns.pop(account, [None])[0]
+        if s is None: return
+        try: s.quit()
+        except Exception: s.close()
+
+    def _close_idle(self):
+        for account, (_, used) in list(self.conns.items()):
+            if time.time() - used >= self.idle_close: self._drop(account)
+
+    def _deliver(self, batch):
+        done = []                       # (status, attempts, next_try, error, sent, id)
+        def failed(mid, attempts, ex):
+            attempts += 1
+            err = f"{type(ex).__name__}: {ex}"
+            if _permanent(ex) or attempts >= self.max_attempts:
+                done.append(("failed", attempts, None, err, None, mid)); self.counts["failed"] += 1
+            else:
+                delay = min(self.backoff * 2 ** (attempts - 1), MAX_BACKOFF)
+                done.append(("queued", attempts, time.time() + delay, err, None, mid)); self.counts["retries"] += 1
+
+        for account in dict.fromkeys((r[1], r[2]) for r in batch):
+            sender, broken = account[1], None   # connection-level error: the rest of this account's batch backs off too
+            for mid, _, _, rcpt, subject, body, attempts in (r for r in batch if (r[1], r[2]) == account):
+                if broken:
+                    failed(mid, attempts, broken); continue
+                msg = MIMEMultipart()
+                msg["From"] = sender; msg["To"] = rcpt; msg["Subject"] = subject
+                msg.attach(MIMEText(body, "html"))
+                try:
+                    try:
+                        self._smtp(account).send_message(msg)
+                    except smtplib.SMTPServerDisconnected:
+                        # a reused connection may have been closed by the server while idle
+                        self._drop(account); self._smtp(account).send_message(msg)
+                    done.append(("sent", attempts + 1, None, None, time.time(), mid)); self.counts["sent"] += 1
+                except smtplib.SMTPAuthenticationError as ex:
+                    self._drop(account)
+                    with self.lock: self.creds.pop(account, None)
+                    failed(mid, attempts, ex); broken = ex
+                except smtplib.SMTPResponseException as ex:
+                    failed(mid, attempts, ex)
+                except (smtplib.SMTPException, OSError) as ex:
+                    self._drop(account)
+                    failed(mid, attempts, ex); broken = ex
+        conn = self._db()
+        with conn:
+            conn.executemany("UPDATE OUTBOX SET STATUS=?, ATTEMPTS=?, NEXT_TRY=?, ERROR=?, SENT=? WHERE ID=?", done)
+        conn.close()
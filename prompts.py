@@ -0,0 +1,176 @@
+import math, re, sqlite3, threading
+from collections import Counter, defaultdict
+from datetime import datetime
+
+from settings import data_path
+
+# ── Base SQL Prompt ────────────────────────────────────────
+BASE_PROMPT = """
+You are an expert SQL assistant. The SQLite database table is named STUDENT with these columns:
+  NAME    (text)    — student full name
+  CLASS   (text)    — department: CSE, Data Science, AIML, CSE-AIML, CAI
+  SECTION (text)    — section: A, B, or C
+  GENDER  (text)    — Male or Female
+  MARKS   (integer) — score out of 100
+
+Convert the user's question into a valid SQL query.
+
+Examples:
+- "How many students?"              → SELECT COUNT(*) FROM STUDENT;
+- "All CSE students"                → SELECT * FROM STUDENT WHERE CLASS='CSE';
+- "All Data Science students"       → SELECT * FROM STUDENT WHERE CLASS='Data Science';
+- "All AIML students"               → SELECT * FROM STUDENT WHERE CLASS='AIML';
+- "All CSE-AIML students"           → SELECT * FROM STUDENT WHERE CLASS='CSE-AIML';
+- "All CAI students"                → SELECT * FROM STUDENT WHERE CLASS='CAI';
+- "Section A students"              → SELECT * FROM STUDENT WHERE SECTION='A';
+- "All female students"             → SELECT * FROM STUDENT WHERE GENDER='Female';
+- "All male students"               → SELECT * FROM STUDENT WHERE GENDER='Male';
+- "Average marks"                   → SELECT ROUND(AVG(MARKS),1) AS AVG_MARKS FROM STUDENT;
+- "Highest marks"                   → SELECT * FROM STUDENT WHERE MARKS=(SELECT MAX(MARKS) FROM STUDENT);
+- "Students with marks above 80"    → SELECT * FROM STUDENT WHERE MARKS > 80;
+- "Class wise average"              → SELECT CLASS, ROUND(AVG(MARKS),1) AS AVG_MARKS FROM STUDENT GROUP BY CLASS ORDER BY AVG_MARKS DESC;
+- "Section wise count"              → SELECT CLASS, SECTION, COUNT(*) AS COUNT FROM STUDENT GROUP BY CLASS, SECTION ORDER BY CLASS, SECTION;
+- "Gender wise count"               → SELECT GENDER, COUNT(*) AS COUNT FROM STUDENT GROUP BY GENDER;
+- "Top 5 students"                  → SELECT * FROM STUDENT ORDER BY MARKS DESC LIMIT 5;
+- "Girls in CSE section A"          → SELECT * FROM STUDENT WHERE CLASS='CSE' AND SECTION='A' AND GENDER='Female';
+- "Pass count per department"       → SELECT CLASS, COUNT(*) AS PASS FROM STUDENT WHERE MARKS>=40 GROUP BY CLASS;
+- "Students between 60 and 80 marks"→ SELECT * FROM STUDENT WHERE MARKS BETWEEN 60 AND 80;
+- "Count of students per department"→ SELECT CLASS, COUNT(*) AS TOTAL FROM STUDENT GROUP BY CLASS ORDER BY TOTAL DESC;
+
+STRICT RULES:
+- Return ONLY the raw SQL query — no explanation, no ```, no word "sql".
+- Never use DROP, DELETE, INSERT, UPDATE, ALTER, CREATE, TRUNCATE.
+- Always end the query with a semicolon.
+- Use exact values: CLASS values are CSE, Data Science, AIML, CSE-AIML, CAI. GENDER values are Male or Female. SECTION values are A, B, C.
+"""
+
+# Quick-query chips on the Query page (also part of the evaluation golden set).
+CHIPS = [
+    "How many students?","All CSE students","Highest marks?",
+    "Average marks?","All AIML students","Section A students",
+    "All female students","All male students","CSE-AIML students",
+    "Top 5 students","CAI students","Class-wise average marks",
+    "Marks above 80?","Marks below 50?","Gender-wise count",
+    "Section wise count","Data Science students","Pass count by class",
+]
+
+FEWSHOT_K = 6
+
+def split_prompt(prompt):
+    """Split a prompt into (schema head, [(question, sql)], rules)."""
+    head, _, rest = prompt.partition("Examples:")
+    body, _, rules = rest.partition("STRICT RULES:")
+    examples = re.findall(r'^- "(.+?)"\s*→\s*(.+?)\s*$', body, re.MULTILINE)
+    return head.rstrip() + "\n", examples, "STRICT RULES:" + rules
+
+def format_examples(examples):
+    return "\n".join(f'- "{q}" → {s}' for q, s in examples)
+
+# ── Tokenizer ──────────────────────────────────────────────
+STOP = {"a","an","the","of","in","on","for","to","me","show","list","give","all","what","which",
+        "is","are","who","with","and","by","from","please","get","find","display","their","have"}
+SYNONYMS = {"girl":"female","women":"female","woman":"female","boy":"male","men":"male","man":"male",
+            "department":"class","dept":"class","branch":"class","avg":"average","mean":"average",
+            "many":"count","number":"count","total":"count","score":"mark","top":"highest",
+            "best":"highest","maximum":"highest","max":"highest","lowest":"minimum","worst":"minimum",
+            "min":"minimum","wise":"per","each":"per","sec":"section"}
+
+def tokenize(text):
+    out = []
+    for w in re.findall(r"[a-z0-9]+", text.lower()):
+        if w in STOP: continue
+        if len(w) > 3 and w.endswith("s") and not w.endswith("ss"): w = w[:-1]
+        out.append(SYNONYMS.get(w, w))
+    return out
+
+# ── BM25 Index ─────────────────────────────────────────────
+class BM25Index:
+    """Okapi BM25 over an inverted index; documents are only ever appended."""
+    def __init__(self, k1=1.5, b=0.75):
+        self.k1, self.b = k1, b
+        self.postings = defaultdict(list)    # term -> [(doc_id, tf)]
+        self.lengths  = []
+        self.total    = 0
+
+    def add(self, tokens):
+        doc_id = len(self.lengths)
+        for term, tf in Counter(tokens).items():
+            self.postings[term].append((doc_id, tf))
+        self.lengths.append(len(tokens)); self.total += len(tokens)
+        return doc_id
+
+    def search(self, tokens, k):
+        n = len(self.lengths)
+        if not n: return []
+        avg = self.total / n
+        scores = defaultdict(float)
+        for term in set(tokens):
+            plist = self.postings.get(term)
+            if not plist: continue
+            idf = math.log(1 + (n - len(plist) + 0.5) / (len(plist) + 0.5))
+            for doc_id, tf in plist:
+                norm = tf + self.k1 * (1 - self.b + self.b * self.lengths[doc_id] / avg)
+                scores[doc_id] += idf * tf * (self.k1 + 1) / norm
+        return sorted(scores.items(), key=lambda kv: (-kv[1], kv[0]))[:k]
+
+# ── Example Store ──────────────────────────────────────────
+class ExampleStore:
+    """Question→SQL examples: BASE_PROMPT seeds plus answers users confirmed, persisted in SQLite."""
+    def __init__(self, seeds, path=None, max_learned=500):
+        self.path, self.max_learned = path or data_path("examples.db"), max_learned
+        self.seeds = list(seeds)
+        self.lock  = threading.Lock()
+        conn = sqlite3.connect(self.path)
+        conn.execute("""CREATE TABLE IF NOT EXISTS EXAMPLES (
+            QUESTION TEXT PRIMARY KEY, SQL TEXT NOT NULL, ADDED TEXT)""")
+        learned = conn.execute("SELECT QUESTION, SQL FROM EXAMPLES ORDER BY rowid").fetchall()
+        conn.commit(); conn.close()
+        self._rebuild(learned[-max_learned:])
+
+    def _rebuild(self, learned):
+        self.examples, self.keys, self.index = [], {}, BM25Index()
+        for q, s in self.seeds + list(learned):
+            self._index(q, s)
+
+    def _index(self, question, sql):
+        key = " ".join(question.lower().split())
+        if key in self.keys: return False
+        self.keys[key] = len(self.examples)
+        self.examples.append((question, sql))
+        self.index.add(tokenize(question))
+        return True
+
+    def __len__(self):
+        return len(self.examples)
+
+    def add(self, question, sql):
+        """Record a question whose SQL the user confirmed is right; returns False for duplicates.
+        Running successfully is not enough: a wrong answer learned here is copied into later prompts."""
+        question, sql = question.strip(), sql.strip()
+        if not question or not sql: return False
+        with self.lock:
+            if not self._index(question, sql): return False
+            conn = sqlite3.connect(self.path)
+            conn.execute("INSERT OR IGNORE INTO EXAMPLES VALUES (?,?,?)",
+                         (question, sql, datetime.now().isoformat(timespec="seconds")))
+            n = conn.execute("SELECT COUNT(*) FROM EXAMPLES").fetchone()[0]
+            if n > self.max_learned * 1.2:
+                conn.execute("DELETE FROM EXAMPLES WHERE rowid NOT IN "
+                             "(SELECT rowid FROM EXAMPLES ORDER BY rowid DESC LIMIT ?)", (self.max_learned,))
+                self._rebuild(conn.execute("SELECT QUESTION, SQL FROM EXAMPLES ORDER BY rowid").fetchall())
+            conn.commit(); conn.close()
+            return True
+
+    def select(self, question, k=FEWSHOT_K):
+        """The k examples most similar to question, padded with seeds when few terms match."""
+        with self.lock:
+            hits = [self.examples[i] for i, _ in self.index.search(tokenize(question), k)]
+        for ex in self.seeds:
+            if len(hits) >= k: break
+            if ex not in hits: hits.append(ex)
+        return hits
+
+def fewshot_prompt(store, question, base=BASE_PROMPT, k=FEWSHOT_K):
+    """BASE_PROMPT with its example list replaced by the k examples closest to question."""
+    head, _, rules = split_prompt(base)
+    return f"{head}\nExamples:\n{format_examples(store.select(question, k))}\n\n{rules}"
@@ -0,0 +1,220 @@
+import re
+
+import sqlast
+from sqlast import quote
+
+# ── Domain Vocabulary ──────────────────────────────────────
+# Known values per table; a refinement is only attempted on tables listed here.
+VOCAB = {
+    "STUDENT": {
+        "CLASS":   ["CSE", "Data Science", "AIML", "CSE-AIML", "CAI"],
+        "SECTION": ["A", "B", "C"],
+        "GENDER":  ["Male", "Female"],
+    },
+}
+SCORE_COL = "MARKS"
+PASS_MARK = 40
+
+COLUMN_WORDS = {"name": "NAME", "names": "NAME", "class": "CLASS", "department": "CLASS", "dept": "CLASS",
+                "branch": "CLASS", "section": "SECTION", "gender": "GENDER", "mark": "MARKS",
+                "marks": "MARKS", "score": "MARKS", "scores": "MARKS"}
+GENDER_WORDS = {"Female": r"girls?|females?|women|woman|ladies", "Male": r"boys?|males?|men|man|gents"}
+AGGREGATES = {"avg": "AVG", "average": "AVG", "mean": "AVG", "max": "MAX", "maximum": "MAX", "highest": "MAX",
+              "min": "MIN", "minimum": "MIN", "lowest": "MIN", "sum": "SUM", "total": "SUM", "count": "COUNT",
+              "how many": "COUNT", "number": "COUNT"}
+AGG_EXPR  = {"AVG": ("ROUND(AVG(MARKS),1)", "AVG_MARKS"), "MAX": ("MAX(MARKS)", "MAX_MARKS"),
+             "MIN": ("MIN(MARKS)", "MIN_MARKS"), "SUM": ("SUM(MARKS)", "TOTAL_MARKS"), "COUNT": ("COUNT(*)", "COUNT")}
+
+# Words that may surround a refinement without changing its meaning.
+FILLER = set("""now only just the a an show me filter by to please and also them those these students student
+with who in of from for keep what about instead get give list it that same but then ones one result results
+rows row records record can you is are marks mark score scores whose having scored got getting out let us see
+too as well how set change make use using display tell do their department class dept section sec gender""".split())
+
+class Refinement:
+    def __init__(self, sql, changes):
+        self.sql, self.changes = sql, changes
+    def __repr__(self):
+        return f"Refinement({self.sql!r}, {self.changes})"
+
+LOWER, UPPER = (">", ">="), ("<", "<=")
+
+def _is_range(a, b):
+    """True when conjuncts a and b bound one column from below and above ("> 80" and "< 90")."""
+    pa, pb = sqlast.predicate(a or ""), sqlast.predicate(b or "")
+    if not (pa and pb): return False
+    lo, hi = (pa, pb) if pa[1] in LOWER else (pb, pa)
+    return lo[1] in LOWER and hi[1] in UPPER and lo[2] < hi[2]
+
+def _set_filter(q, col, conjunct, turn):
+    """Replace simple predicates on col (keeping anything more complex) and add conjunct. turn holds
+    what this follow-up already set per column: a second predicate on col is ANDed with the first when
+    the two make a range, else False is returned so the follow-up goes to the LLM."""
+    if col in turn:
+        if not _is_range(turn[col], conjunct): return False
+        q.where.append(conjunct); turn[col] = None       # a range is complete, a third bound is not merged
+        return True
+    q.where = [w for w in q.where if (sqlast.predicate(w) or ("",))[0] != col]
+    if conjunct: q.where.append(conjunct)
+    turn[col] = conjunct
+    return True
+
+def _eq_or_in(col, values):
+    return f"{col}={quote(values[0])}" if len(values) == 1 else f"{col} IN ({', '.join(map(quote, values))})"
+
+def _order_target(q, col):
+    """ORDER BY target for col; on aggregated queries MARKS means the aggregate output column, and
+    any other column not grouped by has no value to sort on (None)."""
+    if not q.aggregated or col in [g.upper() for g in q.group_by]:
+        return col
+    if col != SCORE_COL: return None
+    for c in q.columns:
+        if re.search(r"\b(AVG|MAX|MIN|SUM|COUNT|TOTAL)\s*\(", c, re.I):
+            m = re.search(r"\bAS\s+(\w+)\s*$", c, re.I)
+            return m.group(1) if m else c
+    return None
+
+def _swap_aggregate(q, func):
+    new_expr, new_alias = AGG_EXPR[func]
+    if not q.aggregated:
+        if q.limit is not None: return False
+        q.columns, q.order_by, q.distinct = [f"{new_expr} AS {new_alias}"], [], False
+        return True
+    for i, c in enumerate(q.columns):
+        if re.search(r"\b(AVG|MAX|MIN|SUM|COUNT|TOTAL)\s*\(", c, re.I):
+            m = re.search(r"\bAS\s+(\w+)\s*$", c, re.I)
+            old = m.group(1) if m else c
+            q.columns[i] = f"{new_expr} AS {new_alias}"
+            q.order_by = [(new_alias if e == old else e, d) for e, d in q.order_by]
+            return True
+    return False
+
+# ── Intent Handlers ────────────────────────────────────────
+# Each handler takes (select, match, vocab, turn) and returns a change description or None to abort;
+# turn is what this follow-up has filtered on so far (see _set_filter).
+def _between(q, m, v, turn):
+    lo, hi = sorted((int(m.group(1)), int(m.group(2))))
+    if not _set_filter(q, SCORE_COL, f"{SCORE_COL} BETWEEN {lo} AND {hi}", turn): return None
+    return f"{SCORE_COL} between {lo} and {hi}"
+
+def _threshold(q, m, v, turn):
+    word, n = m.group(1), int(m.group(2))
+    op = {"at least": ">=", "minimum of": ">=", "at most": "<=", "maximum of": "<="}.get(
+        word, ">" if word in ("above", "over", "more than", "greater than", "higher than", ">") else "<")
+    if not _set_filter(q, SCORE_COL, f"{SCORE_COL} {op} {n}", turn): return None
+    return f"{SCORE_COL} {op} {n}"
+
+def _pass_fail(q, m, v, turn):
+    op = ">=" if m.group(1).startswith("pass") else "<"
+    if not _set_filter(q, SCORE_COL, f"{SCORE_COL} {op} {PASS_MARK}", turn): return None
+    return "passed only" if op == ">=" else "failed only"
+
+def _top_n(q, m, v, turn):
+    """"first 5" keeps the current order; the others rank by MARKS whatever the query was ordered by."""
+    n, word = int(m.group(2)), m.group(1)
+    q.limit = n
+    if word == "first": return f"first {n}"
+    target = _order_target(q, SCORE_COL)
+    if not target: return None
+    q.order_by = [(target, "DESC" if word in ("top", "best", "highest") else "ASC")]
+    turn["ORDER BY"] = target
+    return f"{word} {n} by {target}"
+
+def _limit(q, m, v, turn):
+    q.limit = int(m.group(1))
+    return f"limit {q.limit}"
+
+def _sort(q, m, v, turn):
+    col = COLUMN_WORDS[m.group(1)]
+    target = _order_target(q, col)
+    if not target or turn.get("ORDER BY", target) != target: return None     # "top 5 sorted by name": ask the LLM
+    d = (m.group(2) or "").lower()
+    desc = d.startswith(("desc", "high", "z")) if d else col == SCORE_COL
+    q.order_by = [(target, "DESC" if desc else "ASC")]
+    return f"sort by {target} {'DESC' if desc else 'ASC'}"
+
+def _aggregate(q, m, v, turn):
+    func = AGGREGATES[m.group(1)]
+    return f"{func.lower()} instead" if _swap_aggregate(q, func) else None
+
+def _section(q, m, v, turn):
+    vals = [s.upper() for s in re.findall(r"\b[a-z]\b", m.group(1))]
+    if not set(vals) <= set(v["SECTION"]): return None
+    if not _set_filter(q, "SECTION", _eq_or_in("SECTION", vals), turn): return None
+    return f"section {', '.join(vals)}"
+
+def _gender(q, m, v, turn):
+    named = {k for k, pat in GENDER_WORDS.items() if re.search(rf"\b(?:{pat})\b", m.group(0))}
+    if len(named) > 1:                                   # "boys and girls": everyone
+        if not _set_filter(q, "GENDER", None, turn): return None
+        return "all genders"
+    g = named.pop()
+    if not _set_filter(q, "GENDER", f"GENDER={quote(g)}", turn): return None
+    return f"{g.lower()} only"
+
+def _drop(q, m, v, turn):
+    col = {"section": "SECTION", "sections": "SECTION", "gender": "GENDER", "genders": "GENDER",
+           "class": "CLASS", "classes": "CLASS", "department": "CLASS", "departments": "CLASS"}[m.group(1)]
+    if not _set_filter(q, col, None, turn): return None
+    return f"all {m.group(1)}"
+
+def _clear(q, m, v, turn):
+    q.where = []
+    return "filters cleared"
+
+GENDERS = "|".join(GENDER_WORDS.values())
+INTENTS = [
+    (r"\b(?:remove|clear|drop|reset)\s+(?:all\s+)?(?:the\s+)?filters?\b", _clear),   # first: later filters apply after it
+    (r"between\s+(\d+)\s+(?:and|to|-)\s+(\d+)", _between),
+    (r"\b(top|first|best|highest|bottom|lowest|worst|last)\s+(\d+)\b", _top_n),
+    (r"(?:\blimit(?:\s+to)?|\bonly|\bjust)\s+(\d+)\b", _limit),
+    (r"(above|over|more than|greater than|higher than|at least|minimum of|below|under|less than|lower than"
+     r"|at most|maximum of|>|<)\s*(\d+)", _threshold),
+    (r"\b(pass(?:ed|ing)?|fail(?:ed|ing)?)\b", _pass_fail),
+    (r"\b(?:sort(?:ed)?|order(?:ed)?|rank(?:ed)?|arranged?)\s+(?:them\s+|it\s+)?by\s+(names?|class|department|dept|branch|section"
+     r"|gender|marks?|scores?)(?:\s+(asc(?:ending)?|desc(?:ending)?|high(?:est)? to low(?:est)?"
+     r"|low(?:est)? to high(?:est)?|a-z|z-a))?", _sort),
+    (r"\b(?:all|every|any|both)\s+(sections?|genders?|class(?:es)?|departments?)\b", _drop),
+    (r"\bsec(?:tion)?s?\s+([a-z](?:\s*(?:,|and|or|&)\s*[a-z])*)\b", _section),
+    (rf"\b(?:{GENDERS})(?:\s*(?:,|and|or|&)\s*(?:{GENDERS}))*\b", _gender),
+    (r"\b(average|avg|mean|maximum|max|highest|minimum|min|lowest|sum|total|count|how many|number)\b", _aggregate),
+]
+INTENTS = [(re.compile(p), h) for p, h in INTENTS]
+
+def _classes(q, text, vocab, turn):
+    """CLASS values named in text (longest first so CSE-AIML wins over CSE); blanks them out."""
+    found = []
+    for val in sorted(vocab.get("CLASS", []), key=len, reverse=True):
+        pat = re.compile(r"(?<![\w-])" + re.escape(val.lower()) + r"(?![\w-])")
+        if pat.search(text):
+            found.append(val); text = pat.sub(" ", text)
+    if found:
+        _set_filter(q, "CLASS", _eq_or_in("CLASS", found), turn)
+    return text, found
+
+def refine(question, prev_sql):
+    """Rewrite prev_sql for a follow-up like "now only section A" or "just the top 10".
+
+    Returns a Refinement, or None when the previous SQL can't be parsed or any part
+    of the question isn't a recognized refinement (the caller then asks the LLM)."""
+    if not prev_sql: return None
+    q = sqlast.parse(prev_sql)
+    if q is None: return None
+    vocab = VOCAB.get(q.table.strip('"`[]').upper())
+    if vocab is None: return None
+
+    text, changes, turn = " " + question.lower().replace("?", " ").replace(".", " ") + " ", [], {}
+    text, classes = _classes(q, text, vocab, turn)
+    if classes: changes.append(f"class {', '.join(classes)}")
+    for pat, handler in INTENTS:
+        while True:
+            m = pat.search(text)
+            if not m: break
+            change = handler(q, m, vocab, turn)
+            if change is None: return None
+            changes.append(change)
+            text = text[:m.start()] + " " + text[m.end():]
+    leftover = [w for w in re.findall(r"[a-z0-9']+", text) if w not in FILLER]
+    if not changes or leftover:
+        return None
+    return Refinement(q.to_sql(), changes)
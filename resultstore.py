@@ -0,0 +1,156 @@
+import os, threading, uuid
+from collections import OrderedDict
+
+from settings import data_path
+
+PREVIEW_ROWS   = 200
+SESSION_BUDGET = 64  * 2**20     # bytes of full results kept in memory per session
+GLOBAL_BUDGET  = 384 * 2**20     # bytes of full results kept in memory across all sessions
+DISK_BUDGET    = 2   * 2**30     # spilled Parquet files kept on disk
+
+class ResultHandle:
+    """What session_state keeps for a query result: a small preview plus a key to the full frame."""
+    __slots__ = ("key", "session", "preview", "rows", "columns", "nbytes")
+    def __init__(self, key, session, preview, rows, columns, nbytes):
+        self.key, self.session, self.preview = key, session, preview
+        self.rows, self.columns, self.nbytes = rows, columns, nbytes
+
+    @property
+    def truncated(self):
+        return self.rows > len(self.preview)
+
+class ResultStore:
+    """Process-wide LRU of full result DataFrames with per-session and global memory budgets.
+
+    Evicted frames are spilled to zstd-compressed Parquet and read back on demand. Spills are
+    written after the lock is released, so one large frame never stalls the other sessions."""
+    def __init__(self, directory=None, session_budget=SESSION_BUDGET, global_budget=GLOBAL_BUDGET,
+                 disk_budget=DISK_BUDGET, preview_rows=PREVIEW_ROWS):
+        self.dir = directory or data_path("results")
+        os.makedirs(self.dir, exist_ok=True)
+        self.session_budget, self.global_budget = session_budget, global_budget
+        self.disk_budget, self.preview_rows = disk_budget, preview_rows
+        self.hot   = OrderedDict()       # key -> (session, df, nbytes), most recent last
+        self.spilling = {}               # key -> df evicted from hot whose Parquet file is being written
+        self.bytes = {}                  # session -> in-memory bytes
+        self.total = 0
+        self.lock  = threading.Lock()
+        self.counts = {"spills": 0, "rehydrations": 0, "hits": 0}
+
+    def _path(self, key):
+        return os.path.join(self.dir, key + ".parquet")
+
+    def put(self, session, df):
+        nbytes = int(df.memory_usage(deep=True).sum())
+        key = uuid.uuid4().hex
+        if len(df) <= self.preview_rows:
+            return ResultHandle(key, session, df, len(df), list(df.columns), nbytes)
+        h = ResultHandle(key, session, df.head(self.preview_rows).copy(), len(df), list(df.columns), nbytes)
+        with self.lock:
+            evicted = self._admit(key, session, df, nbytes)
+        self._spill(evicted)
+        return h
+
+    def get(self, h):
+        """Full DataFrame for a handle, rehydrating from disk if it was spilled; None if it's gone."""
+        if not h.truncated: return h.preview
+        with self.lock:
+            if h.key in self.hot:
+                self.hot.move_to_end(h.key); self.counts["hits"] += 1
+                return self.hot[h.key][1]
+            if h.key in self.spilling:
+                self.counts["hits"] += 1
+                return self.spilling[h.key]
+        path = self._path(h.key)
+        if not os.path.exists(path): return None
+        import pandas as pd
+        df = pd.read_parquet(path)
+        os.utime(path)
+        evicted = []
+        with self.lock:
+            self.counts["rehydrations"] += 1
+            if h.key not in self.hot: evicted = self._admit(h.key, h.session, df, h.nbytes)
+        self._spill(evicted)
+        return df
+
+    def _admit(self, key, session, df, nbytes):
+        """Add a frame to hot (lock held); returns the keys evicted for _spill()."""
+        evicted = []
+        self.hot[key] = (session, df, nbytes)
+        self.bytes[session] = self.bytes.get(session, 0) + nbytes
+        self.total += nbytes
+        # per-session budget first (never evicting the frame just admitted), then the global one
+        for k in [k for k, v in self.hot.items() if v[0] == session and k != key]:
+            if self.bytes[session] <= self.session_budget: break
+            evicted.append(self._evict(k))
+        for k in list(self.hot):
+            if self.total <= self.global_budget or k == key: break
+            evicted.append(self._evict(k))
+        return evicted
+
+    def _evict(self, key):
+        session, df, nbytes = self.hot.pop(key)
+        self.bytes[session] -= nbytes; self.total -= nbytes
+        if not self.bytes[session]: del self.bytes[session]
+        self.spilling[key] = df          # get() keeps serving it until the file is written
+        return key
+
+    def _spill(self, keys):
+        """Write evicted frames to Parquet, without the lock."""
+        for key in keys:
+            with self.lock: df = self.spilling.get(key)
+            path = self._path(key)
+            if df is not None and not os.path.exists(path):
+                df.to_parquet(path + ".part", compression="zstd", index=False)
+                os.replace(path + ".part", path)
+            with self.lock:
+                if self.spilling.pop(key, None) is None:      # discarded while it was being written
+                    if os.path.exists(path): os.remove(path)
+                elif df is not None:
+                    self.counts["spills"] += 1
+        if keys: self._trim_disk()
+
+    def _files(self):
+        """(mtime, size, path) of the spilled files; one removed meanwhile by another thread is skipped."""
+        out = []
+        for f in os.listdir(self.dir):
+            if not f.endswith(".parquet"): continue
+            try:
+                st = os.stat(os.path.join(self.dir, f))
+            except FileNotFoundError:
+                continue
+            out.append((st.st_mtime, st.st_size, os.path.join(self.dir, f)))
+        return out
+
+    def _trim_disk(self):
+        files = sorted(self._files())
+        used = sum(sz for _, sz, _ in files)
+        for _, sz, f in files:
+            if used <= self.disk_budget: break
+            try:
+                os.remove(f)
+            except FileNotFoundError:    # removed by a concurrent trim or discard
+                pass
+            used -= sz
+
+    def discard(self, handles):
+        """Forget results that can no longer be displayed (cleared chat or history)."""
+        with self.lock:
+            for h in handles:
+                if h.key in self.hot:
+                    session, _, nbytes = self.hot.pop(h.key)
+                    self.bytes[session] -= nbytes; self.total -= nbytes
+                    if not self.bytes[session]: del self.bytes[session]
+                self.spilling.pop(h.key, None)
+                if os.path.exists(self._path(h.key)): os.remove(self._path(h.key))
+
+    def stats(self, session=None):
+        with self.lock:
+            disk = [sz for _, sz, _ in self._files()]
+            return {"memory": self.total, "session_memory": self.bytes.get(session, 0), "hot": len(self.hot),
+                    "sessions": len(self.bytes), "spilled": len(disk), "disk": sum(disk), **self.counts}
+
+def fmt_bytes(n):
+    for unit in ("B", "KB", "MB", "GB"):
+        if n < 1024 or unit == "GB": return f"{n:.0f} {unit}" if unit == "B" else f"{n:.1f} {unit}"
+        n /= 1024
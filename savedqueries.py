@@ -0,0 +1,165 @@
+import hashlib, html, os, sqlite3, threading, time
+
+from exports import FORMATS, parquet_source, query_source, write
+from settings import data_path, db_stamp
+
+TICK = 5                                     # seconds between scheduler checks
+INTERVALS = {"On data change only": 0, "Every 15 min": 900, "Hourly": 3600, "Daily": 86400}
+EMAIL_ROWS = 50                              # rows inlined in a change notification
+
+class SavedQueries:
+    """Saved reports (question + frozen SQL + database) kept fresh by a background scheduler.
+
+    A report is re-run when its interval elapses or its database changes. Each run streams
+    the result to .intellisql/saved/<id>.parquet and hashes the rows on the way; only when the
+    hash differs from the previous run are the exports rebuilt and the change emailed. Exports
+    are keyed by that hash and built from the Parquet file, so a database write that leaves the
+    result as it was costs one query and no export.
+
+    Change emails go out as the report's own sender with the app password entered for that
+    report (kept in memory only, like the outbox's); without one the change is not emailed."""
+    def __init__(self, path=None, directory=None, exports=None, outbox=None, tick=TICK):
+        self.path, self.dir = path or data_path("saved.db"), directory or data_path("saved")
+        os.makedirs(self.dir, exist_ok=True)
+        self.exports, self.outbox, self.tick = exports, outbox, tick
+        self.wake, self.stopping = threading.Event(), threading.Event()
+        self.counts = {"runs": 0, "changed": 0, "emails": 0}
+        self.secrets = {}            # id -> (sender, app password) the report emails with
+        conn = self._db()
+        conn.execute("""CREATE TABLE IF NOT EXISTS SAVED(ID INTEGER PRIMARY KEY, NAME TEXT, QUESTION TEXT, SQL TEXT,
+                        DB TEXT, INTERVAL INTEGER, EMAIL_TO TEXT DEFAULT '', EMAIL_FROM TEXT DEFAULT '',
+                        CREATED REAL, LAST_RUN REAL DEFAULT 0, LAST_STAMP TEXT, LAST_HASH TEXT, ROWS INTEGER,
+                        CHANGED REAL, EMAILED REAL, ERROR TEXT)""")
+        conn.commit(); conn.close()
+        self.thread = threading.Thread(target=self._run, daemon=True, name="saved-queries")
+        self.thread.start()
+
+    def _db(self):
+        return sqlite3.connect(self.path, timeout=10)
+
+    def result_path(self, sid):
+        return os.path.join(self.dir, f"{sid}.parquet")
+
+    def export(self, r):
+        """ExportCache.path / read arguments for report r's latest result (a row from list())."""
+        return dict(result=f"saved:{r['LAST_HASH']}", source=lambda: parquet_source(self.result_path(r["ID"])),
+                    question=r["QUESTION"], sql=r["SQL"])
+
+    # ── Catalogue ──
+    def save(self, name, question, sql, db, interval=3600, email_to="", email_from=""):
+        conn = self._db()
+        sid = conn.execute("INSERT INTO SAVED(NAME,QUESTION,SQL,DB,INTERVAL,EMAIL_TO,EMAIL_FROM,CREATED) VALUES (?,?,?,?,?,?,?,?)",
+                           (name, question, sql, db, interval, email_to, email_from, time.time())).lastrowid
+        conn.commit(); conn.close()
+        self.wake.set()
+        return sid
+
+    def update(self, sid, password=None, **fields):
+        """Change report settings. A new email_from drops the password stored for the old one;
+        password (with email_from) sets the report's own sending credential."""
+        if "email_from" in fields:
+            if password: self.secrets[sid] = (fields["email_from"], password)
+            elif self.secrets.get(sid, (None,))[0] != fields["email_from"]: self.secrets.pop(sid, None)
+        cols = {"name": "NAME", "interval": "INTERVAL", "email_to": "EMAIL_TO", "email_from": "EMAIL_FROM"}
+        conn = self._db()
+        conn.execute(f"UPDATE SAVED SET {', '.join(cols[k] + '=?' for k in fields)} WHERE ID=?", (*fields.values(), sid))
+        conn.commit(); conn.close()
+        self.wake.set()
+
+    def has_password(self, sid, sender):
+        return bool(sender) and self.secrets.get(sid, (None,))[0] == sender
+
+    def delete(self, sid):
+        conn = self._db()
+        conn.execute("DELETE FROM SAVED WHERE ID=?", (sid,))
+        conn.commit(); conn.close()
+        self.secrets.pop(sid, None)
+        if os.path.exists(self.result_path(sid)): os.remove(self.result_path(sid))
+
+    def refresh(self, sid):
+        """Schedule an immediate re-run."""
+        conn = self._db()
+        conn.execute("UPDATE SAVED SET LAST_RUN=0, LAST_STAMP=NULL WHERE ID=?", (sid,))
+        conn.commit(); conn.close()
+        self.wake.set()
+
+    def list(self):
+        conn = self._db(); conn.row_factory = sqlite3.Row
+        rows = [dict(r) for r in conn.execute("SELECT * FROM SAVED ORDER BY ID")]
+        conn.close()
+        return rows
+
+    def preview(self, sid, n=200):
+        """First n rows of the latest result, read straight from its Parquet file (None before the first run)."""
+        import pyarrow as pa, pyarrow.parquet as pq
+        path = self.result_path(sid)
+        if not os.path.exists(path): return None
+        f = pq.ParquetFile(path)
+        batches = []
+        for b in f.iter_batches(batch_size=n):
+            batches.append(b); break
+        return (pa.Table.from_batches(batches) if batches else f.schema_arrow.empty_table()).to_pandas()
+
+    # ── Scheduler ──
+    def _run(self):
+        while not self.stopping.is_set():
+            now = time.time()
+            for r in self.list():
+                stamp = repr(db_stamp(r["DB"]))
+                if stamp != r["LAST_STAMP"] or (r["INTERVAL"] and now - r["LAST_RUN"] >= r["INTERVAL"]):
+                    self._execute(r, stamp)
+            self.wake.wait(self.tick); self.wake.clear()
+
+    def close(self):
+        self.stopping.set(); self.wake.set()
+        self.thread.join(timeout=5)
+
+    def _execute(self, r, stamp):
+        sid, db, sql = r["ID"], r["DB"], r["SQL"]
+        h, tmp = hashlib.sha1(), self.result_path(sid) + ".part"
+        try:
+            if not os.path.exists(db): raise FileNotFoundError(f"{db} not found")
+            cols, chunks = query_source(db, sql, readonly=True)
+            h.update(repr(cols).encode())
+            def hashed():
+                for batch in chunks:
+                    h.update(repr(batch).encode()); yield batch
+            with open(tmp, "wb") as f: rows = write("parquet", (cols, hashed()), f)
+        except Exception as ex:
+            if os.path.exists(tmp): os.remove(tmp)
+            self._record(sid, LAST_RUN=time.time(), LAST_STAMP=stamp, ERROR=f"{type(ex).__name__}: {ex}")
+            return
+        self.counts["runs"] += 1
+        digest  = h.hexdigest()
+        changed = digest != r["LAST_HASH"] or not os.path.exists(self.result_path(sid))
+        if changed: os.replace(tmp, self.result_path(sid))
+        else:       os.remove(tmp)
+        fields = dict(LAST_RUN=time.time(), LAST_STAMP=stamp, LAST_HASH=digest, ROWS=rows, ERROR=None)
+        if changed:
+            self.counts["changed"] += 1
+            fields["CHANGED"] = time.time()
+        if self.exports:
+            # warm every format so opening the report never waits; an unchanged hash finds them all built
+            for fmt in FORMATS: self.exports.path(fmt, db, sql, **self.export(dict(r, LAST_HASH=digest)))
+        if changed and r["LAST_HASH"] and r["EMAIL_TO"] and r["EMAIL_FROM"] and self.outbox:
+            sender, password = self.secrets.get(sid, (None, None))
+            if sender == r["EMAIL_FROM"]:
+                self.outbox.enqueue(f"saved:{sid}", sender, password, r["EMAIL_TO"],
+                                    f"IntelliSQL report changed: {r['NAME'][:50]}", self._email_body(r, rows))
+                self.counts["emails"] += 1
+                fields["EMAILED"] = time.time()
+            else:
+                fields["ERROR"] = (f"Change not emailed: enter the app password for {r['EMAIL_FROM']} in this "
+                                   f"report's settings (it is kept in memory only, so again after a restart)")
+        self._record(sid, **fields)
+
+    def _email_body(self, r, rows):
+        df = self.preview(r["ID"], EMAIL_ROWS)
+        more = f"<p>Showing {len(df)} of {rows} rows.</p>" if rows > len(df) else ""
+        return (f"<h2>IntelliSQL — {html.escape(r['NAME'])}</h2><p>Question: {html.escape(r['QUESTION'])}</p>"
+                f"<pre>{html.escape(r['SQL'])}</pre>{df.to_html(index=False)}{more}")
+
+    def _record(self, sid, **fields):
+        conn = self._db()
+        conn.execute(f"UPDATE SAVED SET {', '.join(k + '=?' for k in fields)} WHERE ID=?", (*fields.values(), sid))
+        conn.commit(); conn.close()
@@ -0,0 +1,66 @@
+import sqlite3
+
+from writer import writer
+
+LIMIT = 20
+
+# External-content FTS5 index over STUDENT(NAME, CLASS). The trigram tokenizer matches any
+# substring of 3+ characters; the triggers keep it in step with every insert, delete and update.
+FTS_DDL = [
+    """CREATE VIRTUAL TABLE IF NOT EXISTS STUDENT_FTS USING fts5(NAME, CLASS, content='STUDENT',
+       content_rowid='rowid', tokenize='trigram')""",
+    """CREATE TRIGGER IF NOT EXISTS STUDENT_FTS_AI AFTER INSERT ON STUDENT BEGIN
+       INSERT INTO STUDENT_FTS(rowid, NAME, CLASS) VALUES (new.rowid, new.NAME, new.CLASS); END""",
+    """CREATE TRIGGER IF NOT EXISTS STUDENT_FTS_AD AFTER DELETE ON STUDENT BEGIN
+       INSERT INTO STUDENT_FTS(STUDENT_FTS, rowid, NAME, CLASS) VALUES ('delete', old.rowid, old.NAME, old.CLASS); END""",
+    """CREATE TRIGGER IF NOT EXISTS STUDENT_FTS_AU AFTER UPDATE OF NAME, CLASS ON STUDENT BEGIN
+       INSERT INTO STUDENT_FTS(STUDENT_FTS, rowid, NAME, CLASS) VALUES ('delete', old.rowid, old.NAME, old.CLASS);
+       INSERT INTO STUDENT_FTS(rowid, NAME, CLASS) VALUES (new.rowid, new.NAME, new.CLASS); END""",
+]
+TRIGGERS = {"STUDENT_FTS_AI", "STUDENT_FTS_AD", "STUDENT_FTS_AU"}
+
+def has_fts(conn):
+    """True when the index and all its triggers exist. Searching only reads: see build_fts."""
+    have = {r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE type='trigger' AND name LIKE 'STUDENT_FTS_%'")}
+    return TRIGGERS <= have
+
+def build_fts(db):
+    """Create the index and triggers through the shared writer if missing; True when FTS5 is usable.
+
+    Recreating STUDENT (sql.py) drops the triggers, so their absence also means the index is
+    stale and gets rebuilt from the table."""
+    def build(conn):
+        if has_fts(conn): return True
+        for ddl in FTS_DDL: conn.execute(ddl)
+        conn.execute("INSERT INTO STUDENT_FTS(STUDENT_FTS) VALUES ('rebuild')")
+        return True
+    try:
+        return writer(db).submit(build).result()
+    except sqlite3.OperationalError:
+        return False            # SQLite built without FTS5 / trigram, or a read-only database
+
+def _phrase(text):
+    return '"' + text.replace('"', '""') + '"'
+
+def search_students(db, text, limit=LIMIT):
+    """First matches for text in NAME or CLASS as (rowid, NAME, CLASS, SECTION, GENDER, MARKS) rows.
+
+    Three or more characters go through the trigram index, shorter input is a prefix match.
+    Neither is ranked, so both stop as soon as limit rows are found however common the text is.
+    Without the index (build_fts not run yet, or STUDENT recreated since) every length uses LIKE."""
+    text = text.strip()
+    if not text: return []
+    conn = sqlite3.connect(db)
+    try:
+        if len(text) >= 3 and has_fts(conn):
+            return conn.execute("""SELECT s.rowid, s.NAME, s.CLASS, s.SECTION, s.GENDER, s.MARKS
+                                   FROM STUDENT_FTS f JOIN STUDENT s ON s.rowid = f.rowid
+                                   WHERE STUDENT_FTS MATCH ? LIMIT ?""",
+                                (_phrase(text), limit)).fetchall()
+        like = text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        pattern = like + "%" if len(text) < 3 else "%" + like + "%"
+        return conn.execute("SELECT rowid, NAME, CLASS, SECTION, GENDER, MARKS FROM STUDENT "
+                            "WHERE NAME LIKE ? ESCAPE '\\' OR CLASS LIKE ? ESCAPE '\\' LIMIT ?",
+                            (pattern, pattern, limit)).fetchall()
+    finally:
+        conn.close()
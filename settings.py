@@ -0,0 +1,23 @@
+import os
+
+# ── Local State ────────────────────────────────────────────
+# Everything IntelliSQL persists besides the user databases lives here.
+DATA_DIR = os.getenv("INTELLISQL_DATA", ".intellisql")
+
+def data_path(*parts):
+    os.makedirs(DATA_DIR, exist_ok=True)
+    return os.path.join(DATA_DIR, *parts)
+
+def approx_tokens(text):
+    """Rough Gemini token estimate (~4 chars per token) for prompt budgeting."""
+    return (len(text) + 3) // 4
+
+def db_stamp(db):
+    """Cheap change marker for a SQLite file (and its WAL), used to validate cached results."""
+    stamp = []
+    for p in (db, db + "-wal"):
+        try:
+            s = os.stat(p); stamp += [s.st_mtime_ns, s.st_size]
+        except OSError:
+            stamp += [0, 0]
+    return tuple(stamp)
@@ -0,0 +1,102 @@
+"""Minimal local SMTP server for exercising the outbox without a real mail provider.
+
+    python smtpstub.py --port 1025        # then run the app with INTELLISQL_SMTP=localhost:1025
+
+Accepts any AUTH PLAIN/LOGIN credentials, keeps delivered messages in memory and can
+simulate handshake latency and transient failures.
+"""
+import argparse, socketserver, threading, time
+
+class SMTPStub:
+    """Threaded SMTP stand-in. `messages` holds (sender, recipients, data) for every accepted mail.
+
+    connect_delay  seconds slept before the greeting (stands in for TCP + TLS setup)
+    auth_delay     seconds slept before accepting AUTH
+    fail_next      number of upcoming DATA commands answered with a 451 temporary failure
+    """
+    def __init__(self, host="127.0.0.1", port=0, connect_delay=0.0, auth_delay=0.0, fail_next=0):
+        self.messages, self.connections, self.logins = [], 0, 0
+        self.connect_delay, self.auth_delay, self.fail_next = connect_delay, auth_delay, fail_next
+        self.lock = threading.Lock()
+        stub = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def reply(self, line):
+                self.wfile.write(line.encode() + b"\r\n")
+
+            def handle(self):
+                with stub.lock: stub.connections += 1
+                time.sleep(stub.connect_delay)
+                self.reply("220 smtpstub ready")
+                sender, rcpts = None, []
+                while True:
+                    raw = self.rfile.readline()
+                    if not raw: return
+                    line = raw.decode(errors="replace").rstrip("\r\n")
+                    cmd  = line.split(" ", 1)[0].upper()
+                    if cmd == "EHLO":
+                        self.wfile.write(b"250-smtpstub\r\n250-AUTH PLAIN LOGIN\r\n250 8BITMIME\r\n")
+                    elif cmd == "HELO":
+                        self.reply("250 smtpstub")
+                    elif cmd == "AUTH":
+                        parts = line.split()
+                        if parts[1].upper() == "LOGIN":
+                            if len(parts) < 3:                  # no initial response: ask for the user
+                                self.reply("334 VXNlcm5hbWU6"); self.rfile.readline()
+                            self.reply("334 UGFzc3dvcmQ6"); self.rfile.readline()
+                        time.sleep(stub.auth_delay)
+                        with stub.lock: stub.logins += 1
+                        self.reply("235 authenticated")
+                    elif cmd == "MAIL":
+                        sender, rcpts = line[10:].strip("<> "), []
+                        self.reply("250 ok")
+                    elif cmd == "RCPT":
+                        rcpts.append(line[8:].strip("<> ")); self.reply("250 ok")
+                    elif cmd == "DATA":
+                        self.reply("354 end with .")
+                        data = []
+                        while True:
+                            l = self.rfile.readline()
+                            if not l or l in (b".\r\n", b".\n"): break
+                            data.append(l[1:] if l.startswith(b"..") else l)
+                        with stub.lock:
+                            failing = stub.fail_next > 0
+                            if failing: stub.fail_next -= 1
+                            else: stub.messages.append((sender, rcpts, b"".join(data)))
+                        self.reply("451 try again later" if failing else "250 queued")
+                    elif cmd in ("RSET", "NOOP"):
+                        if cmd == "RSET": sender, rcpts = None, []
+                        self.reply("250 ok")
+                    elif cmd == "QUIT":
+                        self.reply("221 bye"); return
+                    else:
+                        self.reply("502 not implemented")
+
+        self.server = socketserver.ThreadingTCPServer((host, port), Handler)
+        self.server.daemon_threads = True
+        self.host, self.port = self.server.server_address[:2]
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True, name="smtpstub")
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown(); self.server.server_close()
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--port", type=int, default=1025)
+    ap.add_argument("--delay", type=float, default=0.0, help="simulated connect + login latency (s)")
+    args = ap.parse_args()
+    with SMTPStub(port=args.port, connect_delay=args.delay / 2, auth_delay=args.delay / 2) as stub:
+        print(f"smtpstub listening on {stub.host}:{stub.port} (Ctrl+C to stop)")
+        seen = 0
+        try:
+            while True:
+                time.sleep(0.5)
+                for sender, rcpts, data in stub.messages[seen:]:
+                    print(f"  {sender} -> {', '.join(rcpts)} ({len(data)} bytes)")
+                seen = len(stub.messages)
+        except KeyboardInterrupt:
+            pass
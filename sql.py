@@ -7,6 +7,7 @@ cursor = connection.cursor()
 
 ## Drop existing table to avoid duplicate data if rerun
 cursor.execute("DROP TABLE IF EXISTS STUDENT")
+cursor.execute("DROP TABLE IF EXISTS STUDENT_FTS")     # search index; the app rebuilds it at startup
 
 ## Create the table
 table_info = """
@@ -19,6 +20,8 @@ CREATE TABLE IF NOT EXISTS STUDENT (
 );
 """
 cursor.execute(table_info)
+# the grid's default sort column (grid.index_sql naming); other columns are indexed from the grid on request
+cursor.execute('CREATE INDEX IF NOT EXISTS "IX_STUDENT_MARKS" ON "STUDENT"("MARKS")')
 
 # ── Name Pools ────────────────────────────────────────────────────────────────
 
@@ -0,0 +1,181 @@
+import re
+
+# ── Tokenizer ──────────────────────────────────────────────
+TOKEN = re.compile(r"""\s*(?:
+    (?P<str>'(?:[^']|'')*')
+  | (?P<qid>"(?:[^"]|"")*"|`[^`]*`|\[[^\]]*\])
+  | (?P<num>\d+(?:\.\d+)?)
+  | (?P<word>[A-Za-z_][A-Za-z0-9_]*)
+  | (?P<op><=|>=|<>|!=|==|\|\||[=<>+\-*/%(),;.])
+)""", re.VERBOSE)
+
+CLAUSES = ["SELECT", "FROM", "WHERE", "GROUP BY", "HAVING", "ORDER BY", "LIMIT"]
+
+class Token:
+    __slots__ = ("kind", "text", "start", "end")
+    def __init__(self, kind, text, start, end):
+        self.kind, self.text, self.start, self.end = kind, text, start, end
+    @property
+    def upper(self):
+        return self.text.upper() if self.kind == "word" else self.text
+    def __repr__(self):
+        return f"{self.kind}:{self.text}"
+
+def tokenize(sql):
+    out, pos = [], 0
+    sql = sql.rstrip()
+    while pos < len(sql):
+        m = TOKEN.match(sql, pos)
+        if not m or m.end() == pos:
+            raise ValueError(f"Cannot tokenize SQL near: {sql[pos:pos+20]!r}")
+        kind = m.lastgroup
+        out.append(Token(kind, m.group(kind), m.start(kind), m.end()))
+        pos = m.end()
+        if sql[pos:].strip() == "": break
+    return out
+
+def split_top(tokens, sep):
+    """Split a token list on sep (an op like "," or a keyword like "AND") outside parentheses."""
+    parts, cur, depth, between = [], [], 0, False
+    for t in tokens:
+        if t.text == "(": depth += 1
+        elif t.text == ")": depth -= 1
+        if depth == 0 and t.upper == "BETWEEN": between = True
+        if depth == 0 and t.upper == sep:
+            if sep == "AND" and between:
+                between = False
+            else:
+                parts.append(cur); cur = []; continue
+        cur.append(t)
+    parts.append(cur)
+    return [p for p in parts if p]
+
+# ── Select AST ─────────────────────────────────────────────
+class Select:
+    """A single-table SELECT split into its clauses; expressions are kept as source text."""
+    def __init__(self):
+        self.distinct = False
+        self.columns  = []      # ["*"] or ["CLASS", "COUNT(*) AS COUNT"]
+        self.table    = ""
+        self.where    = []      # top-level AND conjuncts
+        self.group_by = []
+        self.having   = ""
+        self.order_by = []      # [("MARKS", "DESC")]
+        self.limit    = None
+
+    def copy(self):
+        c = Select(); c.__dict__.update({k: (list(v) if isinstance(v, list) else v) for k, v in self.__dict__.items()})
+        return c
+
+    @property
+    def aggregated(self):
+        return bool(self.group_by) or any(re.search(r"\b(COUNT|SUM|AVG|MIN|MAX|TOTAL|GROUP_CONCAT)\s*\(", c, re.I)
+                                          for c in self.columns)
+
+    def to_sql(self):
+        parts = ["SELECT " + ("DISTINCT " if self.distinct else "") + ", ".join(self.columns),
+                 "FROM " + self.table]
+        if self.where:    parts.append("WHERE " + " AND ".join(self.where))
+        if self.group_by: parts.append("GROUP BY " + ", ".join(self.group_by))
+        if self.having:   parts.append("HAVING " + self.having)
+        if self.order_by: parts.append("ORDER BY " + ", ".join(f"{e} {d}" if d else e for e, d in self.order_by))
+        if self.limit is not None: parts.append(f"LIMIT {self.limit}")
+        return " ".join(parts) + ";"
+
+def _text(sql, toks):
+    return sql[toks[0].start:toks[-1].end] if toks else ""
+
+def parse(sql):
+    """Parse a simple SELECT into a Select, or return None for anything it can't round-trip
+    (CTEs, UNIONs, OFFSET, multiple statements)."""
+    try:
+        toks = tokenize(sql)
+    except ValueError:
+        return None
+    while toks and toks[-1].text == ";": toks.pop()
+    if not toks or toks[0].upper != "SELECT" or any(t.text == ";" for t in toks): return None
+
+    # locate clause keywords at paren depth 0
+    marks, depth, i = [], 0, 0
+    while i < len(toks):
+        t = toks[i]
+        if t.text == "(": depth += 1
+        elif t.text == ")": depth -= 1
+        elif depth == 0 and t.kind == "word":
+            u = t.upper
+            nxt = toks[i+1].upper if i + 1 < len(toks) else ""
+            if u in ("GROUP", "ORDER") and nxt == "BY":
+                marks.append((f"{u} BY", i, i + 2)); i += 2; continue
+            if u in ("SELECT", "FROM", "WHERE", "HAVING", "LIMIT"):
+                marks.append((u, i, i + 1))
+            elif u in ("UNION", "INTERSECT", "EXCEPT", "OFFSET", "WITH", "WINDOW"):
+                return None
+        i += 1
+    names = [m[0] for m in marks]
+    if names != sorted(set(names), key=CLAUSES.index) or names[:2] != ["SELECT", "FROM"]:
+        return None
+
+    q = Select()
+    for n, (name, _, body_start) in enumerate(marks):
+        end  = marks[n + 1][1] if n + 1 < len(marks) else len(toks)
+        body = toks[body_start:end]
+        if not body: return None
+        if name == "SELECT":
+            if body[0].upper == "DISTINCT": q.distinct, body = True, body[1:]
+            q.columns = [_text(sql, p) for p in split_top(body, ",")]
+        elif name == "FROM":
+            q.table = _text(sql, body)
+        elif name == "WHERE":
+            if len(split_top(body, "OR")) > 1:
+                q.where = [f"({_text(sql, body)})"]
+            else:
+                q.where = [_text(sql, p) for p in split_top(body, "AND")]
+        elif name == "GROUP BY":
+            q.group_by = [_text(sql, p) for p in split_top(body, ",")]
+        elif name == "HAVING":
+            q.having = _text(sql, body)
+        elif name == "ORDER BY":
+            for p in split_top(body, ","):
+                d = p[-1].upper if p[-1].upper in ("ASC", "DESC") else ""
+                q.order_by.append((_text(sql, p[:-1] if d else p), d))
+        elif name == "LIMIT":
+            if len(body) != 1 or body[0].kind != "num": return None
+            q.limit = int(body[0].text)
+    return q
+
+# ── Predicates ─────────────────────────────────────────────
+def _literal(tok):
+    if tok.kind == "str": return tok.text[1:-1].replace("''", "'")
+    if tok.kind == "num": return float(tok.text) if "." in tok.text else int(tok.text)
+    raise ValueError
+
+def _ident(tok):
+    if tok.kind == "word": return tok.text.upper()
+    if tok.kind == "qid": return tok.text[1:-1].upper()
+    raise ValueError
+
+def quote(v):
+    """SQL literal for a Python value (the inverse of _literal)."""
+    return str(v) if isinstance(v, (int, float)) else "'" + str(v).replace("'", "''") + "'"
+
+def predicate(text):
+    """Decompose a conjunct into (column, op, value) when it compares a column with literals:
+    =, !=, <, <=, >, >=, LIKE, IN (…) and BETWEEN … AND …; None otherwise."""
+    try:
+        t = tokenize(text)
+        while len(t) > 2 and t[0].text == "(" and t[-1].text == ")": t = t[1:-1]
+        col = _ident(t[0])
+        op  = t[1].upper
+        neg = op == "NOT"
+        if neg: t = [t[0]] + t[2:]; op = t[1].upper
+        if op in ("=", "==", "!=", "<>", "<", "<=", ">", ">=", "LIKE") and len(t) == 3 and not neg:
+            return col, {"==": "=", "<>": "!="}.get(op, op), _literal(t[2])
+        if op == "BETWEEN" and len(t) == 5 and t[3].upper == "AND" and not neg:
+            return col, "BETWEEN", (_literal(t[2]), _literal(t[4]))
+        if op == "IN" and t[2].text == "(" and t[-1].text == ")":
+            vals = tuple(_literal(p[0]) for p in split_top(t[3:-1], ",") if len(p) == 1)
+            if len(vals) == len(split_top(t[3:-1], ",")):
+                return col, "NOT IN" if neg else "IN", vals
+    except (ValueError, IndexError):
+        pass
+    return None
@@ -0,0 +1,161 @@
+import functools, hashlib, re, threading
+from collections import OrderedDict
+
+from sqlast import parse, split_top, tokenize
+
+# Canonical text for SQL that differs only in whitespace, keyword / identifier case, quoting
+# style, table aliases, WHERE conjunct order, a default ASC or the trailing semicolon.
+# normalize() keeps everything that changes the result, column labels included; template()
+# also drops column aliases and replaces literals with ?, so fingerprint() groups the runs of
+# one query shape whatever values it was asked with.
+
+KEYWORDS = set("""SELECT DISTINCT ALL FROM WHERE AND OR NOT IN IS NULL LIKE GLOB BETWEEN GROUP ORDER BY
+HAVING LIMIT OFFSET AS ON USING JOIN LEFT RIGHT FULL INNER OUTER CROSS NATURAL CASE WHEN THEN ELSE END
+EXISTS UNION INTERSECT EXCEPT ASC DESC WITH COLLATE ESCAPE""".split())
+OPS = {"==": "=", "<>": "!="}
+
+# ── Tokens ─────────────────────────────────────────────────
+def _token(t, params):
+    """Canonical text of one token. Unquoted words are case-insensitive in SQLite, quoted ones are
+    kept as written (a double-quoted unknown name is a string literal there)."""
+    if t.kind == "word": return t.text.upper()
+    if t.kind == "qid":  return '"' + t.text[1:-1].replace('""', '"').replace('"', '""') + '"'
+    if t.kind in ("str", "num"): return "?" if params else t.text
+    return OPS.get(t.text, t.text)
+
+def _collapse_lists(toks):
+    """IN (?, ?, ?) -> IN (?+): one shape however many values are listed."""
+    out, i = [], 0
+    while i < len(toks):
+        out.append(toks[i])
+        if toks[i] == "IN" and i + 1 < len(toks) and toks[i + 1] == "(":
+            j = i + 2
+            while j < len(toks) and toks[j] in ("?", ","): j += 1
+            if j < len(toks) and toks[j] == ")" and j > i + 2:
+                out += ["(", "?+", ")"]; i = j
+        i += 1
+    return out
+
+def _join(toks):
+    out = ""
+    for i, t in enumerate(toks):
+        prev = toks[i - 1] if i else None
+        tight = (prev is None or t in (",", ")", ".") or prev in ("(", ".")
+                 or (t == "(" and re.fullmatch(r"[A-Z_]\w*", prev) and prev not in KEYWORDS))
+        out += t if tight else " " + t
+    return out
+
+def _expr(tokens, quals, params):
+    """Canonical text of an expression, dropping the table qualifiers in quals ("s." in s.MARKS)."""
+    toks, i = [], 0
+    while i < len(tokens):
+        t = tokens[i]
+        if t.kind == "word" and t.upper in quals and i + 1 < len(tokens) and tokens[i + 1].text == ".":
+            i += 2; continue
+        toks.append(_token(t, params)); i += 1
+    return _join(_collapse_lists(toks) if params else toks)
+
+# ── Statements ─────────────────────────────────────────────
+def _split_alias(tokens):
+    """(expression tokens, alias token or None) for one select-list item."""
+    if len(tokens) >= 3 and tokens[-2].upper == "AS" and tokens[-1].kind in ("word", "qid"):
+        return tokens[:-2], tokens[-1]
+    if (len(tokens) >= 2 and tokens[-1].kind in ("word", "qid") and tokens[-1].upper not in KEYWORDS
+            and tokens[-2].text not in (".",) and (tokens[-2].kind != "op" or tokens[-2].text == ")")):
+        return tokens[:-1], tokens[-1]
+    return tokens, None
+
+def _label(text):
+    return text if re.fullmatch(r"[A-Za-z_]\w*", text) and text.upper() not in KEYWORDS else '"' + text.replace('"', '""') + '"'
+
+def _column(sql, tokens, quals, params):
+    expr, alias = _split_alias(tokens)
+    canon = _expr(expr, quals, params)
+    if params: return canon                      # templates ignore output names
+    if alias is not None:
+        name = alias.text[1:-1].replace('""', '"') if alias.kind == "qid" else alias.text
+        return f"{canon} AS {_label(name)}"
+    if re.fullmatch(r'(?:(?:[A-Z_]\w*|"[^"]*")\.)?(?:[A-Z_]\w*|"[^"]*"|\*)', canon):
+        return canon                             # a column is labelled with its declared name
+    raw = sql[expr[0].start:expr[-1].end]        # SQLite labels an expression with its text as written
+    return canon if raw == canon else f"{canon} AS {_label(raw)}"
+
+def _qualifiers(toks, table):
+    """Names that may qualify columns of a lone table ("STUDENT", "S" for FROM STUDENT s); none when
+    a subquery could refer to them, since dropping a qualifier there could change its meaning."""
+    if sum(t.upper == "SELECT" for t in toks) > 1: return set(), table
+    if len(table) == 1 and table[0].kind in ("word", "qid"): return {table[0].upper}, table
+    if len(table) in (2, 3) and table[0].kind == "word" and table[-1].kind == "word" and \
+            (len(table) == 2 or table[1].upper == "AS") and table[-1].upper not in KEYWORDS:
+        return {table[0].upper, table[-1].upper}, table[:1]
+    return set(), table
+
+def _canonical(sql, params):
+    try:
+        toks = tokenize(sql)
+    except ValueError:
+        return " ".join(sql.split()).rstrip(";") + ";"
+    while toks and toks[-1].text == ";": toks.pop()
+    q = parse(sql)
+    if q is None:
+        return _expr(toks, set(), params) + ";"
+    quals, table = _qualifiers(toks, tokenize(q.table))
+    expr = lambda text: _expr(tokenize(text), quals, params)
+    parts = ["SELECT " + ("DISTINCT " if q.distinct else "") +
+             ", ".join(_column(sql, p, quals, params) for p in split_top(toks[1 + q.distinct:_clause_end(toks)], ",")),
+             "FROM " + _expr(table, set(), params)]
+    if q.where:    parts.append("WHERE " + " AND ".join(sorted(map(expr, q.where))))
+    if q.group_by: parts.append("GROUP BY " + ", ".join(map(expr, q.group_by)))
+    if q.having:   parts.append("HAVING " + expr(q.having))
+    if q.order_by: parts.append("ORDER BY " + ", ".join(expr(e) + (" DESC" if d == "DESC" else "") for e, d in q.order_by))
+    if q.limit is not None: parts.append("LIMIT " + ("?" if params else str(q.limit)))
+    return " ".join(parts) + ";"
+
+def _clause_end(toks):
+    """Index of the FROM that ends the select list."""
+    depth = 0
+    for i, t in enumerate(toks):
+        if t.text == "(": depth += 1
+        elif t.text == ")": depth -= 1
+        elif depth == 0 and t.upper == "FROM": return i
+    return len(toks)
+
+# ── Public ─────────────────────────────────────────────────
+@functools.lru_cache(maxsize=2048)
+def normalize(sql):
+    """Canonical form of sql: equal for statements that return the same rows under the same labels."""
+    return _canonical(sql, params=False)
+
+@functools.lru_cache(maxsize=2048)
+def template(sql):
+    """normalize() without column aliases and with every literal as ?; IN lists become IN (?+)."""
+    return _canonical(sql, params=True)
+
+def fingerprint(sql):
+    """Short stable id of the query shape (the hash of its template)."""
+    return hashlib.sha1(template(sql).encode()).hexdigest()[:16]
+
+# ── Workload ───────────────────────────────────────────────
+# Executions grouped by query shape (fingerprint()): the same question asked again with
+# other values, other formatting or other aliases counts towards one entry.
+WORKLOAD_MAX = 500
+_workload, _workload_lock = OrderedDict(), threading.Lock()
+
+def record_run(sql, ms, rows):
+    fp = fingerprint(sql)
+    with _workload_lock:
+        w = _workload.get(fp)
+        if w is None:
+            w = _workload[fp] = {"fingerprint": fp, "template": template(sql), "calls": 0, "rows": 0,
+                                 "total_ms": 0.0, "max_ms": 0.0, "variants": set()}
+            if len(_workload) > WORKLOAD_MAX: _workload.popitem(last=False)
+        _workload.move_to_end(fp)
+        w["calls"] += 1; w["rows"] += rows; w["total_ms"] += ms; w["max_ms"] = max(w["max_ms"], ms)
+        if len(w["variants"]) < 100: w["variants"].add(normalize(sql))
+
+def workload_stats(n=10):
+    """The n query shapes with the most total execution time: template, calls, rows, total / mean /
+    max ms and how many distinct statements (after normalize()) ran under it."""
+    with _workload_lock:
+        shapes = [dict(w, variants=len(w["variants"]), mean_ms=w["total_ms"] / w["calls"]) for w in _workload.values()]
+    return sorted(shapes, key=lambda w: w["total_ms"], reverse=True)[:n]
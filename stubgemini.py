@@ -0,0 +1,68 @@
+"""Offline stand-in for the Gemini API, for load tests and demos without network access.
+
+    INTELLISQL_GEMINI=stub streamlit run app.py
+    INTELLISQL_GEMINI=stub INTELLISQL_STUB_LATENCY=0.4 python api.py
+    INTELLISQL_GEMINI=stub INTELLISQL_STUB_FAIL=1 streamlit run app.py     # every model down
+
+Answers NL→SQL prompts with the SQL of the closest few-shot example in the prompt itself,
+every other prompt with a short canned reply, after an optional simulated latency.
+"""
+import os, random, re, threading, time
+
+from prompts import BM25Index, tokenize
+
+class StubGemini:
+    """generate(model, prompt) and stream(model, prompt) like core.LiveBackend.
+
+    latency  mean seconds per call (stands in for the network round-trip + generation)
+    jitter   +/- seconds of uniform noise around latency
+    fail     probability a call raises, to exercise the model fallback loop
+    """
+    def __init__(self, latency=0.0, jitter=0.0, fail=0.0, seed=0):
+        self.latency, self.jitter, self.fail = latency, jitter, fail
+        self.random, self.lock = random.Random(seed), threading.Lock()
+        self.calls = 0
+
+    @classmethod
+    def from_env(cls):
+        return cls(float(os.getenv("INTELLISQL_STUB_LATENCY", "0")), float(os.getenv("INTELLISQL_STUB_JITTER", "0")),
+                   float(os.getenv("INTELLISQL_STUB_FAIL", "0")))
+
+    def _call(self):
+        with self.lock:
+            self.calls += 1
+            delay = max(0.0, self.latency + self.random.uniform(-self.jitter, self.jitter))
+            failed = self.random.random() < self.fail
+        return delay, failed
+
+    def generate(self, model, prompt):
+        delay, failed = self._call()
+        time.sleep(delay)
+        if failed: raise RuntimeError("stub: simulated model failure")
+        return self.reply(prompt)
+
+    def stream(self, model, prompt, chunk_words=4):
+        """The reply in chunks of a few words; the first arrives after a fifth of the latency and
+        the rest are spread over the remainder, as with a model that is still generating."""
+        delay, failed = self._call()
+        time.sleep(delay / 5)
+        if failed: raise RuntimeError("stub: simulated model failure")
+        words = self.reply(prompt).split(" ")
+        chunks = [" ".join(words[i:i + chunk_words]) + " " for i in range(0, len(words), chunk_words)]
+        for i, c in enumerate(chunks):
+            if i: time.sleep(delay * 4 / 5 / (len(chunks) - 1))
+            yield c
+
+    def reply(self, prompt):
+        if "Reply with only YES or NO" in prompt: return "YES"
+        if prompt.startswith("Translate this to English"): return prompt.split("\n", 1)[-1]
+        q = re.search(r"(?:Question|Latest user message):\s*(.+?)\s*(?:\nSQL:|$)", prompt, re.S)
+        if q is None: return "This is a stub response."
+        examples = re.findall(r'^- "(.+?)"\s*→\s*(.+?)\s*$', prompt, re.M)
+        if not examples:
+            table = re.search(r"Table:\s*'?([\w]+)", prompt)
+            return f"SELECT * FROM {table.group(1) if table else 'STUDENT'} LIMIT 10;"
+        index = BM25Index()
+        for question, _ in examples: index.add(tokenize(question))
+        hits = index.search(tokenize(q.group(1)), 1)
+        return examples[hits[0][0] if hits else 0][1]
@@ -0,0 +1,84 @@
+import streamlit as st
+
+from views.common import card_grid, data_grid
+
+# ════════════════════════════════════════════════════════════
+# PAGE: ABOUT
+# ════════════════════════════════════════════════════════════
+def render():
+    st.markdown("""
+<div class="hero">
+  <span class="hero-icon">ℹ️</span>
+  <h1>About</h1>
+  <p>Technology stack, architecture and database schema</p>
+</div>
+""", unsafe_allow_html=True)
+
+    st.markdown('<div class="section-header">🎯 What is IntelliSQL?</div>', unsafe_allow_html=True)
+    st.markdown("""
+<div class="insight-box">
+IntelliSQL is a production-grade AI-powered Natural Language to SQL platform. It uses Google Gemini to convert
+plain English questions (in any language) into precise SQL queries, executes them on SQLite, and returns results
+with charts, AI insights, and export options. Built for students, teachers, and data analysts who want to explore
+databases without writing a single line of SQL.
+</div>
+""", unsafe_allow_html=True)
+
+    st.markdown('<div class="section-header">🛠️ Tech Stack</div>', unsafe_allow_html=True)
+    tech = [
+        ("🤖","Google Gemini AI","Multi-model NLP→SQL with automatic fallback. Powers all AI features."),
+        ("🗄️","SQLite3","Serverless DB engine. Supports built-in and user-uploaded databases."),
+        ("🌐","Streamlit","Python web framework for fast, interactive UI with session state."),
+        ("📊","Plotly","6 chart types — Bar, Line, Pie, Area, Scatter, Heatmap, Histogram."),
+        ("🐍","Python","Backend: AI calls, SQL safety guard, email SMTP, language detection."),
+        ("📄","Pandas","Data manipulation, DataFrame rendering and CSV/HTML export."),
+    ]
+    card_grid([f'<div class="tech-card"><span class="tech-icon">{icon}</span><div class="tech-name">{title}</div><div class="tech-desc">{desc}</div></div>'
+               for icon,title,desc in tech], 3)
+
+    st.markdown("<br>", unsafe_allow_html=True)
+    st.markdown('<div class="section-header">🗃️ Database Schema</div>', unsafe_allow_html=True)
+    sc, sd = st.columns([1,1])
+    with sc:
+        st.markdown("""
+<div class="schema-box">
+  <div class="schema-title">STUDENT Table Structure</div>
+  <table style="width:100%;font-size:0.85rem;border-collapse:collapse;">
+    <thead><tr style="color:#00E676;border-bottom:1px solid rgba(0,230,118,0.2);">
+      <th style="padding:6px 8px;text-align:left;">Column</th>
+      <th style="padding:6px 8px;text-align:left;">Type</th>
+      <th style="padding:6px 8px;text-align:left;">Description</th>
+    </tr></thead>
+    <tbody style="color:#E0E0F0;">
+      <tr style="border-bottom:1px solid rgba(255,255,255,0.05);">
+        <td style="padding:6px 8px;font-family:'JetBrains Mono',monospace;color:#00BCD4;">NAME</td>
+        <td style="padding:6px 8px;color:#888;">VARCHAR(50)</td>
+        <td style="padding:6px 8px;">Student full name</td>
+      </tr>
+      <tr style="border-bottom:1px solid rgba(255,255,255,0.05);">
+        <td style="padding:6px 8px;font-family:'JetBrains Mono',monospace;color:#00BCD4;">CLASS</td>
+        <td style="padding:6px 8px;color:#888;">VARCHAR(30)</td>
+        <td style="padding:6px 8px;">CSE / Data Science / AIML / CSE-AIML / CAI</td>
+      </tr>
+      <tr style="border-bottom:1px solid rgba(255,255,255,0.05);">
+        <td style="padding:6px 8px;font-family:'JetBrains Mono',monospace;color:#00BCD4;">SECTION</td>
+        <td style="padding:6px 8px;color:#888;">VARCHAR(5)</td>
+        <td style="padding:6px 8px;">Section A, B, or C</td>
+      </tr>
+      <tr style="border-bottom:1px solid rgba(255,255,255,0.05);">
+        <td style="padding:6px 8px;font-family:'JetBrains Mono',monospace;color:#00BCD4;">GENDER</td>
+        <td style="padding:6px 8px;color:#888;">VARCHAR(10)</td>
+        <td style="padding:6px 8px;">Male or Female</td>
+      </tr>
+      <tr>
+        <td style="padding:6px 8px;font-family:'JetBrains Mono',monospace;color:#00BCD4;">MARKS</td>
+        <td style="padding:6px 8px;color:#888;">INT</td>
+        <td style="padding:6px 8px;">Score out of 100</td>
+      </tr>
+    </tbody>
+  </table>
+</div>
+""", unsafe_allow_html=True)
+    with sd:
+        st.markdown('<div class="section-header">Live Records</div>', unsafe_allow_html=True)
+        data_grid("student.db", "STUDENT", "about_grid", sort="NAME", desc=False)
@@ -0,0 +1,105 @@
+import pandas as pd
+import streamlit as st
+
+from containment import answer_from_cache
+from conversation import ConversationState
+from core import AIUnavailable, gemini_stream, offline_sql, run_sql, is_safe_sql, clean_sql, example_store
+from prompts import fewshot_prompt
+from refine import refine
+from settings import db_stamp
+from views.common import init_state, result_store, session_id, show_result
+
+# ════════════════════════════════════════════════════════════
+# PAGE: CHATBOT
+# ════════════════════════════════════════════════════════════
+def user_bubble(text):
+    return f'<div class="chat-user"><div class="chat-user-label">👤 You</div>{text}</div>'
+
+def bot_bubble(text):
+    return f'<div class="chat-bot"><div class="chat-bot-label">🤖 IntelliSQL</div>{text}</div>'
+
+def render():
+    init_state()
+
+    st.markdown("""
+<div class="hero">
+  <span class="hero-icon">💬</span>
+  <h1>AI Chatbot</h1>
+  <p>Multi-turn SQL conversation — ask follow-up questions with full memory</p>
+</div>
+""", unsafe_allow_html=True)
+
+    if st.button("🗑️ New Chat"):
+        result_store().discard([m["result"] for m in st.session_state.chat if m.get("result")])
+        st.session_state.chat = []; st.session_state.convo = ConversationState(); st.rerun()
+
+    for i, msg in enumerate(st.session_state.chat):
+        if msg["role"] == "user":
+            st.markdown(user_bubble(msg["content"]), unsafe_allow_html=True)
+        else:
+            st.markdown(bot_bubble(msg["content"]), unsafe_allow_html=True)
+            if msg.get("result") is not None:
+                show_result(msg["result"], f"chat_{i}")
+
+    user_input = st.chat_input("Ask about the student database... (e.g. 'Now filter only section A')")
+    if user_input:
+        st.session_state.chat.append({"role":"user","content":user_input})
+        st.markdown(user_bubble(user_input), unsafe_allow_html=True)
+        live  = st.empty()          # the reply bubble, filled while the SQL streams in
+        convo = st.session_state.convo
+        local, offline = refine(user_input, convo.sql), None
+        with st.spinner("🤖 Thinking..."):
+            try:
+                if local:
+                    sql = local.sql
+                else:
+                    chat_prompt = f"""{fewshot_prompt(example_store(), user_input)}
+
+CONVERSATION STATE (for context):
+{convo.render()}
+
+IMPORTANT: Use the conversation state to understand follow-up questions.
+If user says "now only section A" or "filter by class", modify the Current SQL accordingly.
+Return ONLY the raw SQL query for the latest user message.
+
+Latest user message: {user_input}
+SQL:"""
+                    text = ""
+                    try:
+                        for chunk in gemini_stream(chat_prompt):
+                            text += chunk
+                            live.markdown(bot_bubble(f"**SQL:** `{text.replace('```sql', '').replace('```', '').strip()}▌`"),
+                                          unsafe_allow_html=True)
+                        sql = clean_sql(text)
+                    except AIUnavailable:
+                        offline = offline_sql(user_input)
+                        sql = offline.sql
+                if not is_safe_sql(sql):
+                    reply = "🛡️ Blocked: Dangerous SQL operation detected."
+                    st.session_state.chat.append({"role":"assistant","content":reply,"result":None})
+                    convo.update(user_input, error="blocked as unsafe")
+                else:
+                    stamp  = db_stamp("student.db")
+                    prev   = next((m for m in reversed(st.session_state.chat) if m.get("sql")), None)
+                    cached = None
+                    if prev and prev["result"] and prev["stamp"] == stamp:
+                        cached = answer_from_cache(sql, prev["sql"], result_store().get(prev["result"]))
+                    if cached is not None:
+                        df = cached if not cached.empty else None
+                    else:
+                        rows, cols = run_sql(sql)
+                        df = pd.DataFrame(rows, columns=cols) if rows else None
+                    n = 0 if df is None else len(df)
+                    result_text = f"**SQL:** `{sql}`\n\n{'**' + str(n) + ' result(s) found.**' if n else 'No results found.'}"
+                    if local: result_text += f"\n\n⚡ Refined locally: {', '.join(local.changes)}"
+                    if offline:
+                        result_text += (f"\n\n🔌 AI models unavailable — offline engine, {offline.confidence:.0%} "
+                                        f"understood: {', '.join(offline.understood) or 'all rows'}")
+                    if cached is not None: result_text += "\n\n♻️ Answered from the previous result."
+                    result = result_store().put(session_id(), df) if df is not None else None
+                    st.session_state.chat.append({"role":"assistant","content":result_text,"result":result,"sql":sql,"stamp":stamp})
+                    convo.update(user_input, sql, n)
+            except Exception as e:
+                st.session_state.chat.append({"role":"assistant","content":f"❌ {e}","result":None})
+                convo.update(user_input, error="failed")
+        st.rerun()
@@ -0,0 +1,259 @@
+import sqlite3, time
+from datetime import datetime
+
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+import depcache
+import fallback
+from conversation import ConversationState
+from core import AIUnavailable, backend, degraded, example_store, stream_stats
+from exports import FORMATS, ExportCache
+from grid import Grid
+from outbox import Outbox, split_recipients
+from resultstore import ResultStore, fmt_bytes
+from savedqueries import SavedQueries
+from search import build_fts
+from sqlnorm import workload_stats
+from writer import writer
+
+# ════════════════════════════════════════════════════════════
+# HELPERS
+# ════════════════════════════════════════════════════════════
+depcache.track("student.db")
+
+@depcache.cached("STUDENT")
+def db_stats(db="student.db"):
+    try:
+        conn = sqlite3.connect(db)
+        c = conn.cursor()
+        total, avg_m, top_m, classes, passed = c.execute(
+            "SELECT COUNT(*), ROUND(AVG(MARKS),1), MAX(MARKS), COUNT(DISTINCT CLASS), "
+            "COUNT(CASE WHEN MARKS >= 40 THEN 1 END) FROM STUDENT").fetchone()
+        conn.close()
+        return total, avg_m or 0, top_m or 0, classes, round(passed/total*100,1) if total else 0
+    except:
+        return 0, 0, 0, 0, 0
+
+def students_changed():
+    """Call once after a write to STUDENT: drops just the cached results that read STUDENT.
+    (The version triggers would catch the write anyway; this frees the entries straight away.)"""
+    depcache.invalidate("student.db", "STUDENT")
+
+@st.cache_resource
+def outbox():
+    return Outbox()
+
+def queue_email(question, sql, df):
+    """Send-button callback: queue the results for the background outbox instead of sending inline."""
+    ss = st.session_state
+    to, user, pwd = ss.get("eto", ""), ss.get("esu", ""), ss.get("esp", "")
+    if not (split_recipients(to) and user and pwd):
+        st.toast("❌ Fill in recipient, Gmail and app password."); return
+    body = f"<h2>IntelliSQL Results</h2><p>Question: {question}</p><pre>{sql}</pre>{df.to_html(index=False)}"
+    n = len(outbox().enqueue(session_id(), user, pwd, to, f"IntelliSQL: {question[:50]}", body))
+    st.toast(f"📨 {n} email(s) queued — see 📧 Outbox in the sidebar.")
+
+EXPORT_LABELS = {"csv":"📥 Download CSV", "html":"📄 HTML Report", "parquet":"🧱 Parquet", "xlsx":"📗 Excel"}
+
+@st.cache_resource
+def export_cache():
+    return ExportCache()
+
+def export_buttons(db, query, stem, formats=("csv",), **meta):
+    """Download buttons whose files are generated on click (streamed from the SQLite cursor)
+    and cached per (result, format), so reruns never serialize the result."""
+    ts = datetime.now().strftime("%Y%m%d_%H%M%S")
+    for col, fmt in zip(st.columns(len(formats)), formats):
+        mime, ext = FORMATS[fmt]
+        with col:
+            st.download_button(EXPORT_LABELS[fmt], lambda fmt=fmt: export_cache().read(fmt, db, query, **meta),
+                               f"{stem}_{ts}.{ext}", mime, key=f"dl_{stem}_{fmt}", on_click="ignore")
+
+def render_chart(df, prefix=""):
+    from charts import CHART_TYPES, build_figure, prepare, value_counts     # numpy + pandas; only pages with results chart
+    numeric = df.select_dtypes(include="number").columns.tolist()
+    if not numeric:
+        return
+    st.markdown('<div class="section-header">📈 Visualization</div>', unsafe_allow_html=True)
+    o1, o2, o3 = st.columns(3)
+    with o1: ctype = st.selectbox("Type", CHART_TYPES, key=f"{prefix}ct")
+    with o2: y = st.selectbox("Value (Y)", numeric, key=f"{prefix}y")
+    with o3: x = st.selectbox("Label (X)", df.columns.tolist(), key=f"{prefix}x")
+    try:
+        try:
+            fig, notes = build_figure(df, ctype, x, y)
+            st.plotly_chart(fig, use_container_width=True)
+        except ImportError:
+            if x == y and ctype in ("Bar", "Pie"): df, y = value_counts(df, x)
+            data, _, notes = prepare(df, ctype, x, y)
+            if ctype == "Histogram": st.bar_chart(data.set_index("BIN")["COUNT"])
+            elif ctype in ["Bar"]:   st.bar_chart(data.set_index(x)[y])
+            else:                    st.line_chart(data.set_index(x)[y])
+            st.caption("Install plotly for richer charts: `pip install plotly`")
+    except Exception as e:                   # an odd column pair must not take the page down
+        st.warning(f"⚠️ Can't draw a {ctype} chart of {y} by {x}: {e}")
+        return
+    if notes: st.caption(" · ".join(notes))
+
+@st.cache_resource
+def search_index(db="student.db"):
+    return build_fts(db)
+
+@st.cache_resource
+def result_store():
+    return ResultStore()
+
+def session_id():
+    ctx = get_script_run_ctx()
+    return ctx.session_id if ctx else "local"
+
+def show_result(h, key):
+    """Render a stored result: the in-memory preview, or the full frame (rehydrated) on request."""
+    full = result_store().get(h) if h.truncated and st.toggle(f"Show all {h.rows:,} rows", key=f"full_{key}") else None
+    if full is not None:
+        st.dataframe(full, use_container_width=True, hide_index=True)
+    else:
+        st.dataframe(h.preview, use_container_width=True, hide_index=True)
+        if h.truncated: st.caption(f"Showing first {len(h.preview)} of {h.rows:,} rows.")
+
+def grid_move(key, cursor):
+    """Prev/Next callbacks: cursor None pops a page, otherwise it starts the next one."""
+    cursors = st.session_state[f"{key}_pages"]["cursors"]
+    if cursor is None: cursors.pop()
+    else:              cursors.append(cursor)
+
+def grid_index(db, table, col):
+    try:
+        Grid(db, table).create_index(col)
+    except Exception as e:
+        st.session_state["grid_index_error"] = f"❌ Could not index {col}: {e}"
+
+def data_grid(db, table, key, sort="MARKS", desc=True):
+    """Server-side paginated table: one page of rows per rerun, whatever the table size."""
+    try:
+        g = Grid(db, table)
+    except sqlite3.Error as e:
+        st.error(f"❌ {e}"); return
+    c1, c2, c3, c4 = st.columns([3, 2, 1, 1])
+    with c1: search = st.text_input("🔎 Filter", key=f"{key}_q", placeholder="matches any text column")
+    with c2: sort = st.selectbox("Sort by", g.columns, index=g.columns.index(sort) if sort in g.columns else 0, key=f"{key}_sort")
+    with c3: size = st.selectbox("Rows", [25, 50, 100, 200], index=1, key=f"{key}_size")
+    with c4: desc = st.toggle("Descending", desc, key=f"{key}_desc")
+    state = st.session_state.setdefault(f"{key}_pages", {"sig": None, "cursors": [None]})
+    if state["sig"] != (search, sort, desc, size):
+        state.update(sig=(search, sort, desc, size), cursors=[None])
+    df, nxt = g.page(sort, desc, state["cursors"][-1], search, size)
+    st.dataframe(df, use_container_width=True, hide_index=True)
+
+    n, exact = g.estimate(search)
+    first = (len(state["cursors"]) - 1) * size
+    total = f"{n:,}" if exact else (f"{n:,}+" if search else f"≈{n:,}")
+    p1, p2, p3 = st.columns([1, 1, 4])
+    with p1: st.button("← Prev", key=f"{key}_prev", disabled=len(state["cursors"]) == 1, on_click=grid_move, args=(key, None))
+    with p2: st.button("Next →", key=f"{key}_next", disabled=nxt is None, on_click=grid_move, args=(key, nxt))
+    with p3: st.caption(f"Page {len(state['cursors'])} · rows {first + 1 if len(df) else 0:,}–{first + len(df):,} of {total}")
+    if sort not in g.indexed:
+        st.button(f"⚡ Index {sort} for faster paging", key=f"{key}_ix", on_click=grid_index, args=(db, table, sort),
+                  help="Creates an index on this column through the shared database writer")
+    if err := st.session_state.pop("grid_index_error", None): st.error(err)
+
+def perf_panel():
+    """Sidebar stats as one caption element (one small message per rerun instead of one per line)."""
+    s = result_store().stats(session_id())
+    e = export_cache().stats()
+    w = writer("student.db").stats()
+    d = depcache.stats()
+    lines = [f"Results in memory (this session): {fmt_bytes(s['session_memory'])}",
+             f"Results in memory (all {s['sessions']} sessions): {fmt_bytes(s['memory'])} in {s['hot']} frames",
+             f"Spilled to disk: {s['spilled']} frames, {fmt_bytes(s['disk'])}",
+             f"Rehydrations: {s['rehydrations']} · spills: {s['spills']}",
+             f"Cached exports: {e['files']} files, {fmt_bytes(e['disk'])} · hits {e['hits']} · builds {e['builds']}",
+             f"student.db writes: {w['requests']} in {w['commits']} commits (largest group {w['largest']}) · {w['mode'].upper()}"]
+    g = backend()
+    if hasattr(g, "counts"):
+        lines.append(f"Gemini backend: {type(g).__name__} · " + " · ".join(f"{k} {v}" for k, v in g.counts.items()))
+    t = stream_stats()
+    if t["responses"]:
+        lines.append(f"Streamed AI answers: {t['responses']} · first token {t['first_token_ms']:.0f} ms "
+                     f"· complete {t['total_ms']:.0f} ms (medians)")
+    down, o = degraded(), fallback.stats()
+    if down: lines.append(f"🔌 AI models unavailable — offline NL→SQL, models retried in {down:.0f}s")
+    if o["translations"]:
+        lines.append(f"Offline NL→SQL: {o['translations']} questions · {o['median_ms']:.2f} ms (median)")
+    lines.append(f"Query caches: {d['hit_rate']:.0%} hit rate ({d['hits']} hits / {d['misses']} misses) · {d['entries']} entries")
+    lines += [f"· {f}: {c['hits']}/{c['hits'] + c['misses']} hits · {c['stale']} stale · {c['dropped']} invalidated"
+              for f, c in d["functions"].items()]
+    shapes = workload_stats(3)
+    if shapes:
+        lines.append("Busiest query shapes (literals as ?):")
+        lines += [f"· {w['calls']}× · {w['mean_ms']:.1f} ms avg · {w['variants']} variant(s) · `{w['template'][:80]}`"
+                  for w in shapes]
+    with st.expander("⚡ Performance"):
+        st.caption("  \n".join(lines))
+
+@st.cache_resource
+def saved_queries():
+    return SavedQueries(exports=export_cache(), outbox=outbox())
+
+def save_report(question, sql):
+    saved_queries().save(question[:60], question, sql, "student.db")
+    st.toast("⭐ Saved — it refreshes in the background; open it from ⭐ Saved Reports.")
+
+def confirm_example(question, sql):
+    """The user says sql answered question: only then does it become a few-shot example."""
+    if example_store().add(question, sql): st.toast("👍 Thanks — similar questions will learn from this one.")
+    else:                                  st.toast("👍 Already used as an example.")
+
+OUTBOX_ICONS = {"queued":"⏳", "sending":"📤", "sent":"✅", "failed":"❌"}
+
+def outbox_status():
+    with st.expander("📧 Outbox", expanded=bool(outbox().pending(session_id()))):
+        for m in outbox().status(session_id()):
+            line = f"{OUTBOX_ICONS[m['status']]} {m['recipient']} — {m['status']}"
+            if m["status"] == "queued" and m["attempts"]:
+                line += f", retry {m['attempts'] + 1} in {max(0, m['next_try'] - time.time()):.0f}s"
+            st.caption(line)
+            if m["error"] and m["status"] != "sent": st.caption(f"　↳ {m['error'][:120]}")
+
+def outbox_panel():
+    """Delivery status of this session's emails; polls every few seconds while any are pending."""
+    if not outbox().status(session_id(), 1): return
+    st.fragment(outbox_status, run_every=3 if outbox().pending(session_id()) else None)()
+
+HISTORY_MAX = 50
+
+def init_state():
+    defaults = {"history":[], "chat":[], "convo":None, "chip_q":"", "last_sql":"", "last_result":None,
+                "last_df_sql":"", "last_stamp":None}
+    for k,v in defaults.items():
+        if k not in st.session_state: st.session_state[k] = v
+    if st.session_state.convo is None: st.session_state.convo = ConversationState()
+
+def metric_card(val, label):
+    return f'<div class="metric-card"><span class="metric-val">{val}</span><span class="metric-label">{label}</span></div>'
+
+def stream_box(title, chunks):
+    """Fill an insight box as a gemini_stream() response arrives; returns the full text."""
+    box, text = st.empty(), ""
+    html = lambda body: f'<div class="insight-box"><div class="insight-title">{title}</div>{body}</div>'
+    box.markdown(html("▌"), unsafe_allow_html=True)
+    try:
+        for chunk in chunks:
+            text += chunk
+            box.markdown(html(text + "▌"), unsafe_allow_html=True)
+    except AIUnavailable as e:
+        text += f"\n\n❌ {e}"
+    box.markdown(html(text), unsafe_allow_html=True)
+    return text
+
+def offline_note(t):
+    """Say that SQL came from the offline engine, how sure it is and what it understood."""
+    st.warning(f"🔌 **Offline mode** — AI models are unavailable, so this SQL comes from the built-in keyword "
+               f"engine ({t.confidence:.0%} of the question understood: {', '.join(t.understood) or 'all rows'}). "
+               f"Check it before relying on the result.")
+
+def card_grid(cards, cols):
+    """A row/grid of cards as a single element. Per-element overhead is most of the bytes of a
+    small card, and one element is sent by hash reference once the browser has it."""
+    st.markdown(f'<div class="card-grid" style="--cols:{cols}">{"".join(cards)}</div>', unsafe_allow_html=True)
@@ -0,0 +1,59 @@
+import sqlite3
+
+import streamlit as st
+
+import depcache
+from dashboard import dashboard_specs
+from views.common import card_grid, data_grid, export_buttons, metric_card
+
+# ════════════════════════════════════════════════════════════
+# PAGE: DASHBOARD
+# ════════════════════════════════════════════════════════════
+@depcache.cached("STUDENT")
+def dashboard_data(db):
+    """Dashboard metrics and figure JSON, computed once per version of the STUDENT table."""
+    return dashboard_specs(db)
+
+def render():
+    st.markdown("""
+<div class="hero">
+  <span class="hero-icon">📊</span>
+  <h1>Dashboard</h1>
+  <p>Real-time analytics and visual insights from your student database</p>
+</div>
+""", unsafe_allow_html=True)
+
+    try:
+        (total, avg_m, top_m, low_m, pass_r), figs = dashboard_data("student.db")
+    except sqlite3.Error:
+        st.error("❌ Could not load student.db — run sql.py first.")
+        return
+
+    card_grid([metric_card(v,l) for v,l in zip([total,avg_m,top_m,low_m,f"{pass_r}%"],
+                                               ["Students","Avg Marks","Highest","Lowest","Pass Rate"])], 5)
+
+    st.markdown("<br>", unsafe_allow_html=True)
+    if figs is None:
+        st.warning("Install plotly for charts: `pip install plotly`")
+    else:
+        import plotly.io as pio
+        show = lambda name: st.plotly_chart(pio.from_json(figs[name]), use_container_width=True)
+        r1, r2 = st.columns(2)
+        with r1:
+            st.markdown('<div class="section-header">📚 Class Average Marks</div>', unsafe_allow_html=True)
+            show("class_avg")
+        with r2:
+            st.markdown('<div class="section-header">👥 Gender Distribution</div>', unsafe_allow_html=True)
+            show("gender")
+
+    # Below the fold: only the open tab is built and sent to the browser
+    names = ["📈 Marks Distribution", "🏆 Top 8 Students", "✅ Pass vs Fail by Class", "🔥 Marks Heatmap", "📋 Full Records"]
+    tabs = st.tabs(names, key="dash_tab", on_change="rerun")
+    for tab, name, spec in zip(tabs, names, ["histogram", "top8", "pass_fail", "heatmap", None]):
+        if not tab.open: continue
+        with tab:
+            if spec is None:
+                data_grid("student.db", "STUDENT", "dash_grid")
+                export_buttons("student.db", "SELECT * FROM STUDENT", "students")
+            elif figs is not None:
+                show(spec)
@@ -0,0 +1,59 @@
+import streamlit as st
+
+from views.common import card_grid, db_stats, metric_card
+
+# ════════════════════════════════════════════════════════════
+# PAGE: HOME
+# ════════════════════════════════════════════════════════════
+def render():
+    # Hero
+    st.markdown("""
+<div class="hero">
+  <span class="hero-icon">🗄️</span>
+  <h1>IntelliSQL</h1>
+  <p>Ask questions in plain English — get instant SQL results, charts &amp; AI insights</p>
+  <div class="hero-badges">
+    <span class="badge">🤖 Gemini AI</span>
+    <span class="badge">🐍 Python</span>
+    <span class="badge">🗄️ SQLite</span>
+    <span class="badge">🌐 Streamlit</span>
+    <span class="badge">📊 Plotly</span>
+    <span class="badge">🌍 Multi-lang</span>
+    <span class="badge">🛡️ SQL Guard</span>
+  </div>
+</div>
+""", unsafe_allow_html=True)
+
+    # Live stats
+    total, avg_m, top_m, cls, pass_r = db_stats("student.db")
+    st.markdown('<div class="section-header">📊 Live Stats</div>', unsafe_allow_html=True)
+    card_grid([metric_card(v,l) for v, l in zip([total, avg_m, top_m, cls, f"{pass_r}%"],
+                                                ["Students","Avg Marks","Top Score","Classes","Pass Rate"])], 5)
+
+    # Features
+    st.markdown("<br>", unsafe_allow_html=True)
+    st.markdown('<div class="section-header">✨ Features</div>', unsafe_allow_html=True)
+    feats = [
+        ("🔍","Smart Query","Type any question in plain English and get accurate SQL results instantly."),
+        ("📊","Dashboard","6 auto-generated charts — class stats, distributions, top performers."),
+        ("💬","AI Chatbot","Multi-turn conversation with memory for follow-up questions."),
+        ("🌍","Multi-language","Ask in Hindi, Telugu, Tamil, French — auto-translated to SQL."),
+        ("🧠","AI Insights","Automatic bullet-point data analysis after every query result."),
+        ("⚡","SQL Optimizer","AI suggests a faster, better version of every generated query."),
+        ("🛡️","Safety Guard","Blocks DROP/DELETE/INSERT before execution automatically."),
+        ("📝","Auto Questions","AI generates sample questions from any uploaded database schema."),
+        ("📋","History","Full log of every query with timestamps and row counts."),
+        ("⬇️","CSV & Report","One-click CSV export and downloadable HTML query reports."),
+        ("📁","Upload DB/CSV","Query any SQLite or CSV file with natural language."),
+        ("➕","Manage Data","Add or delete student records directly from the UI."),
+    ]
+    card_grid([f'<div class="card"><span class="card-icon">{icon}</span><h3>{title}</h3><p>{desc}</p></div>'
+               for icon,title,desc in feats], 3)
+
+    # How it works
+    st.markdown("<br>", unsafe_allow_html=True)
+    st.markdown('<div class="section-header">⚙️ How It Works</div>', unsafe_allow_html=True)
+    steps = [("1","Type your question\nin any language"),("2","Gemini AI converts\nit to safe SQL"),
+             ("3","SQL runs on your\nSQLite database"),("4","See results, charts\n& AI insights")]
+    card_grid([f'<div class="step-card"><span class="step-num">{n}</span><span class="step-desc">{d}</span></div>'
+               for n,d in steps], 4)
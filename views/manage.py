@@ -0,0 +1,175 @@
+import sqlite3
+
+import pandas as pd
+import streamlit as st
+
+import bulk
+import depcache
+from search import search_students
+from writer import writer
+from views.common import card_grid, data_grid, db_stats, export_buttons, metric_card, students_changed
+
+# ════════════════════════════════════════════════════════════
+# PAGE: MANAGE
+# ════════════════════════════════════════════════════════════
+@st.fragment
+def delete_student_panel():
+    """Search-as-you-type delete: each typing pause reruns only this fragment and asks the
+    FTS index for the first matches instead of listing every student."""
+    q = st.text_input("Search student", key="del_q", type="search", live="200ms",
+                      placeholder="Name or department — 3+ letters match anywhere")
+    if not q.strip():
+        st.caption("Start typing to find a student.")
+        return
+    try:
+        matches = search_students("student.db", q)
+    except Exception as e:
+        st.error(f"❌ {e}"); return
+    if not matches:
+        st.info("No matching students.")
+        return
+    opts = {f"{n} | {c} | Sec {sec} | {m} marks": rid for rid, n, c, sec, g, m in matches}
+    sel = st.selectbox(f"Select student (first {len(matches)} match{'es' if len(matches) > 1 else ''}):", list(opts.keys()))
+    st.markdown("<br>", unsafe_allow_html=True)
+    if st.button("🗑️ Delete Selected Student"):
+        writer("student.db").execute("DELETE FROM STUDENT WHERE rowid=?", (opts[sel],))
+        st.success("✅ Deleted successfully!")
+        students_changed(); st.rerun()
+
+BULK_EDIT_ROWS = 2_000
+
+@depcache.cached("STUDENT")
+def student_groups(db):
+    """Distinct departments and sections, for the bulk edit filters."""
+    conn = sqlite3.connect(db)
+    classes  = [r[0] for r in conn.execute("SELECT DISTINCT CLASS FROM STUDENT ORDER BY CLASS")]
+    sections = [r[0] for r in conn.execute("SELECT DISTINCT SECTION FROM STUDENT ORDER BY SECTION")]
+    conn.close()
+    return classes, sections
+
+def bulk_apply(label, fn, *args):
+    """Button callback for every bulk write: one transaction, one cache invalidation, and fresh
+    widget keys so the editor and import box don't replay edits onto the changed table."""
+    ss = st.session_state
+    try:
+        n = fn("student.db", *args)
+    except (ValueError, sqlite3.Error) as e:
+        ss.bulk_msg = ("error", f"❌ Nothing changed: {e}"); return
+    students_changed()
+    ss.bulk_gen = ss.get("bulk_gen", 0) + 1
+    ss.bulk_msg = ("success", f"✅ {label} {n:,} student(s) in one transaction.")
+
+def bulk_import_panel(gen):
+    st.caption("Paste rows (NAME, CLASS, SECTION, GENDER, MARKS — header optional) or upload a CSV/Excel roster.")
+    text = st.text_area("Paste roster", key=f"bulk_text_{gen}", height=140,
+                        placeholder="Name,Department,Section,Gender,Marks\nAarav,CSE,A,Male,82")
+    up = st.file_uploader("…or upload", type=["csv","xlsx"], key=f"bulk_file_{gen}")
+    try:
+        if up is not None:
+            df = bulk.parse_frame(pd.read_excel(up, dtype=str) if up.name.endswith(".xlsx") else pd.read_csv(up, dtype=str))
+        elif text.strip():
+            df = bulk.parse_text(text)
+        else:
+            return
+    except Exception as e:
+        st.error(f"❌ Could not read roster: {e}"); return
+    rows, bad = bulk.validate(df)
+    st.caption(f"✅ {len(rows):,} valid row(s) · ❌ {len(bad):,} rejected")
+    if bad:
+        st.dataframe(pd.DataFrame(bad[:200], columns=["Row", "Problem"]), use_container_width=True, hide_index=True)
+    if rows:
+        st.dataframe(pd.DataFrame(rows[:20], columns=bulk.COLUMNS), use_container_width=True, hide_index=True)
+        st.button(f"📥 Import {len(rows):,} student(s)", key="bulk_import",
+                  on_click=bulk_apply, args=("Imported", bulk.insert_students, rows))
+
+def bulk_edit_panel(gen):
+    classes, sections = student_groups("student.db")
+    f1, f2 = st.columns(2)
+    with f1: cls = st.selectbox("Department", classes, key="bulk_cls")
+    with f2: sec = st.selectbox("Section", ["All"] + sections, key="bulk_sec")
+    where, params = "CLASS=?" + ("" if sec == "All" else " AND SECTION=?"), [cls] + ([] if sec == "All" else [sec])
+    conn = sqlite3.connect("student.db")
+    df = pd.read_sql_query(f"SELECT rowid, NAME, CLASS, SECTION, GENDER, MARKS FROM STUDENT WHERE {where} "
+                           f"ORDER BY NAME LIMIT {BULK_EDIT_ROWS + 1}", conn, params=params, index_col="rowid")
+    conn.close()
+    if df.empty:
+        st.info("No students in this selection."); return
+    if len(df) > BULK_EDIT_ROWS:
+        df = df.head(BULK_EDIT_ROWS); st.caption(f"Showing the first {BULK_EDIT_ROWS:,} students — narrow by section.")
+    df.insert(0, "DELETE", False)
+    edited = st.data_editor(df, key=f"bulk_ed_{cls}_{sec}_{gen}", use_container_width=True, hide_index=True,
+                            disabled=["NAME","CLASS","SECTION","GENDER"],
+                            column_config={"DELETE": st.column_config.CheckboxColumn("🗑️", width="small"),
+                                           "MARKS": st.column_config.NumberColumn("MARKS", min_value=0, max_value=100, step=1)})
+    changed = edited["MARKS"].ne(df["MARKS"]) & ~edited["DELETE"]
+    doomed  = edited.index[edited["DELETE"]].tolist()
+    b1, b2, b3, b4 = st.columns([1.2, 1.2, 0.8, 1.2])
+    with b1: st.button(f"💾 Save {int(changed.sum())} mark change(s)", key="bulk_save", disabled=not changed.any(),
+                       on_click=bulk_apply, args=("Updated", bulk.update_marks, list(edited.loc[changed, "MARKS"].items())))
+    with b2: st.button(f"🗑️ Delete {len(doomed)} selected", key="bulk_del", disabled=not doomed,
+                       on_click=bulk_apply, args=("Deleted", bulk.delete_students, doomed))
+    with b3: delta = st.number_input("± marks", -100, 100, 5, key="bulk_delta")
+    with b4: st.button(f"➕ Apply to all {len(df):,} shown", key="bulk_shift", disabled=not delta,
+                       on_click=bulk_apply, args=("Adjusted marks for", bulk.shift_marks, df.index.tolist(), delta))
+
+def render():
+    st.markdown("""
+<div class="hero">
+  <span class="hero-icon">➕</span>
+  <h1>Manage Data</h1>
+  <p>Add new students or remove existing records from the database</p>
+</div>
+""", unsafe_allow_html=True)
+
+    add_col, del_col = st.columns(2)
+
+    with add_col:
+        st.markdown('<div class="section-header">➕ Add Student</div>', unsafe_allow_html=True)
+        with st.form("add_f", clear_on_submit=True):
+            name  = st.text_input("Full Name")
+            cls   = st.selectbox("Department", ["CSE","Data Science","AIML","CSE-AIML","CAI","Other"])
+            cls_c = st.text_input("Custom department name (if Other)")
+            sec   = st.selectbox("Section", ["A","B","C"])
+            gen   = st.selectbox("Gender", ["Male","Female"])
+            mrk   = st.number_input("Marks (0–100)", 0, 100, 75)
+            if st.form_submit_button("✅ Add Student"):
+                fc = cls_c.strip() if cls=="Other" and cls_c.strip() else cls
+                if not name.strip():
+                    st.error("❌ Name is required.")
+                else:
+                    try:
+                        writer("student.db").execute("INSERT INTO STUDENT VALUES(?,?,?,?,?)",(name.strip(),fc,sec,gen,int(mrk)))
+                        st.success(f"✅ '{name}' added to {fc} — Section {sec} — {gen} — {mrk} marks!")
+                        students_changed(); st.rerun()
+                    except Exception as e:
+                        st.error(f"❌ {e}")
+
+    with del_col:
+        st.markdown('<div class="section-header">🗑️ Delete Student</div>', unsafe_allow_html=True)
+        delete_student_panel()
+
+    st.markdown("<br>", unsafe_allow_html=True)
+    st.markdown('<div class="section-header">📦 Bulk Operations</div>', unsafe_allow_html=True)
+    if "bulk_msg" in st.session_state:
+        kind, msg = st.session_state.pop("bulk_msg")
+        (st.success if kind == "success" else st.error)(msg)
+    gen = st.session_state.get("bulk_gen", 0)
+    imp, edit = st.tabs(["📥 Import roster", "✏️ Edit marks / delete in bulk"])
+    with imp:
+        bulk_import_panel(gen)
+    with edit:
+        try:
+            bulk_edit_panel(gen)
+        except Exception as e:
+            st.error(f"❌ {e}")
+
+    st.markdown("<br>", unsafe_allow_html=True)
+    st.markdown('<div class="section-header">📋 All Records</div>', unsafe_allow_html=True)
+    try:
+        stats = db_stats("student.db")[:4]
+        card_grid([metric_card(v,l) for v,l in zip([x or 0 for x in stats], ["Total","Avg Marks","Highest","Classes"])], 4)
+        st.markdown("<br>", unsafe_allow_html=True)
+        data_grid("student.db", "STUDENT", "manage_grid")
+        export_buttons("student.db", "SELECT * FROM STUDENT", "students")
+    except Exception as e:
+        st.error(f"❌ {e}")
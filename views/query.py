@@ -0,0 +1,214 @@
+from datetime import datetime
+
+import pandas as pd
+import streamlit as st
+
+from containment import answer_from_cache
+from core import run_sql, is_safe_sql, sql_for, explain_sql, optimize_sql, ai_insights, to_english
+from prompts import CHIPS
+from settings import db_stamp
+from sqlnorm import normalize
+from views.common import (HISTORY_MAX, confirm_example, export_buttons, init_state, metric_card, offline_note,
+                          queue_email, render_chart, result_store, save_report, session_id, stream_box)
+
+# ════════════════════════════════════════════════════════════
+# PAGE: QUERY
+# ════════════════════════════════════════════════════════════
+def render():
+    init_state()
+
+    st.markdown("""
+<div class="hero">
+  <span class="hero-icon">🔍</span>
+  <h1>Query Assistant</h1>
+  <p>Ask in any language — get SQL, insights, charts &amp; exports</p>
+</div>
+""", unsafe_allow_html=True)
+
+    # Chips
+    chips = CHIPS
+    st.markdown('<div class="section-header">🧩 Quick Queries</div>', unsafe_allow_html=True)
+    rows_of_chips = [chips[:6], chips[6:12], chips[12:18]]
+    for row_i, row in enumerate(rows_of_chips):
+        chip_cols = st.columns(6)
+        for ci, (chip_col, chip) in enumerate(zip(chip_cols, row)):
+            with chip_col:
+                if st.button(chip, key=f"chip_{row_i}_{ci}"):
+                    st.session_state.chip_q = chip
+
+    st.markdown("<br>", unsafe_allow_html=True)
+    main_col, side_col = st.columns([5,2])
+
+    with main_col:
+        question = st.text_input(
+            "Your question",
+            value=st.session_state.chip_q,
+            placeholder="e.g. Show all students with marks above 75 in Data Science",
+            key="q_in"
+        )
+        go = st.button("⚡ Generate & Run", key="go_btn")
+
+        rerun = st.session_state.pop("rerun_h", None)
+
+        if go or rerun:
+            st.session_state.chip_q = ""
+            if rerun: question = rerun["question"]
+            if not question.strip():
+                st.warning("Please enter a question.")
+            else:
+                offline = None
+                if rerun:
+                    q_eng, sql = question, rerun["sql"]
+                else:
+                    with st.spinner("🌍 Processing..."):
+                        q_eng, translated = to_english(question)
+                    if translated: st.info(f"🌍 Translated: **{translated}**")
+
+                    with st.spinner("🤖 Generating SQL..."):
+                        try:
+                            sql, offline = sql_for(q_eng)
+                            if offline: offline_note(offline)
+                        except Exception as e:
+                            st.error(f"❌ AI Error: {e}")
+                            sql = None
+
+                if sql:
+                    if not is_safe_sql(sql):
+                        st.error("🛡️ **Blocked!** Dangerous SQL operation detected (DROP/DELETE/INSERT/UPDATE). Query rejected for safety.")
+                    else:
+                        st.session_state.last_sql = sql
+                        st.markdown('<div class="section-header">🧾 Generated SQL</div>', unsafe_allow_html=True)
+                        st.code(sql, language="sql")
+
+                        tab1, tab2, tab3 = st.tabs(["💡 Explain", "⚡ Optimize", "🧠 Insights"])
+
+                        with tab1:
+                            expl = stream_box("What this query does", explain_sql(sql, stream=True))
+
+                        with st.spinner("🗄️ Fetching results..."):
+                            stamp  = db_stamp("student.db")
+                            cached = None
+                            if st.session_state.last_stamp == stamp:
+                                last = st.session_state.last_result
+                                cached = answer_from_cache(sql, st.session_state.last_df_sql, last and result_store().get(last))
+                            try:
+                                if cached is not None:
+                                    df = cached
+                                else:
+                                    rows, col_names = run_sql(sql)
+                                    df = pd.DataFrame(rows, columns=col_names)
+                            except Exception as e:
+                                st.error(f"❌ DB Error: {e}")
+                                df = None
+
+                        if df is not None:
+                            if not df.empty:
+                                # the previous result can't be shown again once replaced: free it now, not at spill time
+                                old, st.session_state.last_result = st.session_state.last_result, result_store().put(session_id(), df)
+                                if old: result_store().discard([old])
+                                st.session_state.last_df_sql, st.session_state.last_stamp = sql, stamp
+                                if cached is not None: st.caption("♻️ Answered from the previous result — no database round-trip.")
+
+                                st.markdown('<div class="section-header">📊 Results</div>', unsafe_allow_html=True)
+                                mc1, mc2, mc3 = st.columns(3)
+                                with mc1: st.markdown(metric_card(len(df),"Rows Found"), unsafe_allow_html=True)
+                                with mc2: st.markdown(metric_card(len(df.columns),"Columns"), unsafe_allow_html=True)
+                                with mc3:
+                                    num = df.select_dtypes(include="number")
+                                    v = round(num.iloc[:,0].mean(),1) if not num.empty else "—"
+                                    l = f"Avg {num.columns[0]}" if not num.empty else "Result"
+                                    st.markdown(metric_card(v,l), unsafe_allow_html=True)
+
+                                st.markdown("<br>", unsafe_allow_html=True)
+                                st.dataframe(df, use_container_width=True, hide_index=True)
+
+                                with tab3:
+                                    stream_box("AI Data Insights", ai_insights(df, stream=True))
+
+                                with tab2:
+                                    stream_box("Optimization Suggestion", optimize_sql(sql, stream=True))
+
+                                # Export
+                                st.markdown('<div class="export-box"><div class="export-title">⬇️ Export</div>', unsafe_allow_html=True)
+                                export_buttons("student.db", sql, "results", ["csv","html","parquet","xlsx"],
+                                               question=question, sql=sql, explanation=expl)
+                                st.button("⭐ Save as report", key="save_q", on_click=save_report, args=(question, sql))
+                                if not offline:
+                                    st.button("👍 Correct answer", key="confirm_q", on_click=confirm_example, args=(q_eng, sql),
+                                              help="Use this question and SQL as an example for similar questions")
+                                st.markdown('</div>', unsafe_allow_html=True)
+
+                                # Email
+                                with st.expander("📧 Email Results"):
+                                    em1,em2,em3 = st.columns(3)
+                                    with em1: st.text_input("Recipient Email", key="eto")
+                                    with em2: st.text_input("Your Gmail",      key="esu")
+                                    with em3: st.text_input("App Password", type="password", key="esp")
+                                    st.button("📨 Send", key="send_em", on_click=queue_email, args=(question, sql, df))
+
+                                render_chart(df, "q_")
+                                # one entry per distinct statement: a repeat moves it to the top
+                                key  = normalize(sql)
+                                prev = next((h for h in st.session_state.history if h["key"] == key), None)
+                                if prev: st.session_state.history.remove(prev)
+                                st.session_state.history.insert(0,{
+                                    "time": datetime.now().strftime("%H:%M:%S"),
+                                    "question": question,
+                                    "sql": sql,
+                                    "rows": len(df),
+                                    "key": key,
+                                    "runs": prev["runs"] + 1 if prev else 1
+                                })
+                                del st.session_state.history[HISTORY_MAX:]
+                                st.success(f"✅ {len(df)} record(s) found.")
+                            else:
+                                st.info("ℹ️ No records matched your query.")
+
+    with side_col:
+        st.markdown('<div class="section-header">🗃️ Schema</div>', unsafe_allow_html=True)
+        st.markdown("""
+<div class="schema-box">
+  <div class="schema-title">STUDENT Table</div>
+  <div class="schema-row">🟢 <b>NAME</b> — Student name</div>
+  <div class="schema-row">🟢 <b>CLASS</b> — CSE / Data Science / AIML / CSE-AIML / CAI</div>
+  <div class="schema-row">🟢 <b>SECTION</b> — A, B or C</div>
+  <div class="schema-row">🟢 <b>GENDER</b> — Male or Female</div>
+  <div class="schema-row">🟢 <b>MARKS</b> — Score out of 100</div>
+</div>
+""", unsafe_allow_html=True)
+
+        st.markdown("<br>", unsafe_allow_html=True)
+        st.markdown('<div class="section-header">💡 Try Asking</div>', unsafe_allow_html=True)
+        st.markdown("""
+<div class="tip-list">
+  <div class="tip-item">📌 Top 5 students by marks</div>
+  <div class="tip-item">📌 Class-wise average marks</div>
+  <div class="tip-item">📌 All female CSE students</div>
+  <div class="tip-item">📌 CSE section A students</div>
+  <div class="tip-item">📌 Students between 60-80</div>
+  <div class="tip-item">📌 Gender-wise count</div>
+  <div class="tip-item">📌 Pass count per department</div>
+  <div class="tip-item">📌 Section wise student count</div>
+  <div class="tip-item">🇮🇳 सबसे ज्यादा marks किसके?</div>
+  <div class="tip-item">🇮🇳 CSE విద్యార్థులు చూపించు</div>
+</div>
+""", unsafe_allow_html=True)
+
+        st.markdown("<br>", unsafe_allow_html=True)
+        st.markdown('<div class="section-header">🕓 History</div>', unsafe_allow_html=True)
+        if st.session_state.history:
+            if st.button("🗑️ Clear History"):
+                st.session_state.history = []; st.rerun()
+            for i, h in enumerate(st.session_state.history[:5]):
+                st.markdown(f"""
+<div class="history-item">
+  <div class="history-time">⏱ {h["time"]}</div>
+  <div class="history-q">{h["question"]}</div>
+  <div class="history-sql">{h["sql"]}</div>
+  <div class="history-rows">{h["rows"]} rows{f" · run {h['runs']}×" if h["runs"] > 1 else ""}</div>
+</div>
+""", unsafe_allow_html=True)
+                if st.button("↻ Re-run", key=f"rerun_{i}"):
+                    st.session_state.rerun_h = h; st.rerun()
+        else:
+            st.markdown('<div class="insight-box" style="text-align:center;color:#888;">No queries yet</div>', unsafe_allow_html=True)
@@ -0,0 +1,60 @@
+from datetime import datetime
+
+import streamlit as st
+
+from exports import FORMATS
+from savedqueries import INTERVALS
+from views.common import export_buttons, saved_queries
+
+# ════════════════════════════════════════════════════════════
+# PAGE: SAVED REPORTS
+# ════════════════════════════════════════════════════════════
+def save_report_settings(sid):
+    ss = st.session_state
+    sender, password = ss[f"sv_from_{sid}"].strip(), ss.pop(f"sv_pw_{sid}", "")
+    if sender and not password and not saved_queries().has_password(sid, sender):
+        st.toast(f"❌ Enter the app password for {sender} — reports only email with their own credentials."); return
+    saved_queries().update(sid, password, interval=INTERVALS[ss[f"sv_int_{sid}"]],
+                           email_to=ss[f"sv_to_{sid}"].strip(), email_from=sender)
+    st.toast("✅ Report settings saved.")
+
+def render():
+    st.markdown("""
+<div class="hero">
+  <span class="hero-icon">⭐</span>
+  <h1>Saved Reports</h1>
+  <p>Re-run automatically when the data changes or on a schedule — opening one is instant</p>
+</div>
+""", unsafe_allow_html=True)
+
+    reports = saved_queries().list()
+    if not reports:
+        st.info("No saved reports yet — run a query on 🔍 Query and click ⭐ Save as report.")
+        return
+    fmt_t = lambda t: datetime.fromtimestamp(t).strftime("%d %b %H:%M:%S") if t else "—"
+    for r in reports:
+        sid = r["ID"]
+        label = f"⭐ {r['NAME']}  ·  {r['ROWS'] if r['ROWS'] is not None else '…'} rows  ·  changed {fmt_t(r['CHANGED'])}"
+        with st.expander(label):
+            st.code(r["SQL"], language="sql")
+            st.caption(f"Last run {fmt_t(r['LAST_RUN'])} · last change {fmt_t(r['CHANGED'])} · last emailed {fmt_t(r['EMAILED'])}")
+            if r["ERROR"]: st.error(f"❌ {r['ERROR']}")
+            df = saved_queries().preview(sid)
+            if df is None:
+                st.caption("⏳ First run pending…")
+            else:
+                st.dataframe(df, use_container_width=True, hide_index=True)
+                if r["ROWS"] and r["ROWS"] > len(df): st.caption(f"Showing the first {len(df)} of {r['ROWS']:,} rows.")
+                export_buttons(r["DB"], r["SQL"], f"report{sid}", list(FORMATS), **saved_queries().export(r))
+
+            interval = next((k for k, v in INTERVALS.items() if v == r["INTERVAL"]), "Hourly")
+            c1, c2, c3, c4 = st.columns(4)
+            with c1: st.selectbox("Refresh", list(INTERVALS), index=list(INTERVALS).index(interval), key=f"sv_int_{sid}")
+            with c2: st.text_input("Email changes to", r["EMAIL_TO"], key=f"sv_to_{sid}")
+            with c3: st.text_input("From (Gmail)", r["EMAIL_FROM"], key=f"sv_from_{sid}")
+            with c4: st.text_input("App password", type="password", key=f"sv_pw_{sid}",
+                                   placeholder="stored" if saved_queries().has_password(sid, r["EMAIL_FROM"]) else "")
+            b1, b2, b3 = st.columns(3)
+            with b1: st.button("💾 Save settings", key=f"sv_save_{sid}", on_click=save_report_settings, args=(sid,))
+            with b2: st.button("🔄 Run now", key=f"sv_run_{sid}", on_click=saved_queries().refresh, args=(sid,))
+            with b3: st.button("🗑️ Delete", key=f"sv_del_{sid}", on_click=saved_queries().delete, args=(sid,))
@@ -0,0 +1,19 @@
+import os
+
+import streamlit as st
+
+# The stylesheet lives in static/intellisql.css. With server.enableStaticServing (set in
+# .streamlit/config.toml) each rerun sends a one-line @import and the browser fetches the
+# file once; otherwise the file is inlined, once per rerun.
+CSS_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "static", "intellisql.css")
+CSS_URL  = "app/static/intellisql.css"
+
+@st.cache_resource
+def _inline_css():
+    with open(CSS_PATH, encoding="utf-8") as f:
+        return f"<style>\n{f.read()}</style>"
+
+def stylesheet():
+    if st.get_option("server.enableStaticServing"):
+        return f'<style>@import url("{CSS_URL}");</style>'
+    return _inline_css()
@@ -0,0 +1,106 @@
+import sqlite3
+
+import pandas as pd
+import streamlit as st
+
+from core import AIUnavailable, run_sql, sql_for, auto_sample_questions
+from views.common import export_buttons, metric_card, offline_note, render_chart
+
+# ════════════════════════════════════════════════════════════
+# PAGE: UPLOAD
+# ════════════════════════════════════════════════════════════
+def sample_questions(cols_info):
+    try:
+        return auto_sample_questions(cols_info)
+    except AIUnavailable:
+        return ("🔌 AI models are unavailable, so there are no suggestions right now. Simple questions still "
+                "work offline — filters on column values, above / below / between, counts, averages, top N.")
+
+def render():
+    st.markdown("""
+<div class="hero">
+  <span class="hero-icon">📁</span>
+  <h1>Upload &amp; Query</h1>
+  <p>Upload any SQLite .db or CSV file and query it with natural language</p>
+</div>
+""", unsafe_allow_html=True)
+
+    utype = st.radio("Choose file type:", ["📊 CSV File","🗄️ SQLite .db File"], horizontal=True)
+
+    if utype == "📊 CSV File":
+        up = st.file_uploader("Upload CSV", type=["csv"])
+        if up:
+            df_c = pd.read_csv(up)
+            c1,c2,c3 = st.columns(3)
+            with c1: st.markdown(metric_card(len(df_c),"Rows"), unsafe_allow_html=True)
+            with c2: st.markdown(metric_card(len(df_c.columns),"Columns"), unsafe_allow_html=True)
+            with c3: st.markdown(metric_card(df_c.select_dtypes(include="number").columns.__len__(),"Numeric Cols"), unsafe_allow_html=True)
+            st.markdown("<br>", unsafe_allow_html=True)
+            st.dataframe(df_c.head(8), use_container_width=True, hide_index=True)
+
+            with st.expander("📝 AI-Generated Sample Questions"):
+                with st.spinner("Generating questions from schema..."):
+                    qs = sample_questions(", ".join(df_c.columns.tolist()))
+                st.markdown(f'<div class="insight-box">{qs}</div>', unsafe_allow_html=True)
+
+            tmp = "/tmp/csv_upload.db"
+            ct  = sqlite3.connect(tmp); df_c.to_sql("my_table",ct,if_exists="replace",index=False); ct.close()
+            cp  = f"Table: my_table. Columns: {', '.join(df_c.columns)}. Return ONLY raw SQL. No ``` or sql word."
+
+            q_c = st.text_input("Ask about your CSV:", placeholder="e.g. Show rows where...", key="csvq")
+            if st.button("⚡ Query CSV") and q_c.strip():
+                with st.spinner("Generating SQL..."):
+                    try:
+                        sql, offline = sql_for(q_c, tmp, "my_table", cp + f"\nQuestion: {q_c}")
+                        if offline: offline_note(offline)
+                        st.code(sql, language="sql")
+                        rows, cols = run_sql(sql, tmp)
+                        if rows:
+                            r_df = pd.DataFrame(rows, columns=cols)
+                            st.dataframe(r_df, use_container_width=True, hide_index=True)
+                            export_buttons(tmp, sql, "result")
+                            render_chart(r_df, "csv_")
+                        else:
+                            st.info("No results.")
+                    except Exception as e:
+                        st.error(f"❌ {e}")
+    else:
+        up_db = st.file_uploader("Upload .db file", type=["db"])
+        if up_db:
+            tmp_db = f"/tmp/{up_db.name}"
+            with open(tmp_db,"wb") as f: f.write(up_db.read())
+            try:
+                conn   = sqlite3.connect(tmp_db)
+                tables = [t[0] for t in conn.cursor().execute("SELECT name FROM sqlite_master WHERE type='table'").fetchall()]
+                conn.close()
+                st.success(f"✅ {len(tables)} table(s) found: {', '.join(tables)}")
+                tbl  = st.selectbox("Choose table:", tables)
+                conn = sqlite3.connect(tmp_db)
+                df_p = pd.read_sql_query(f"SELECT * FROM '{tbl}' LIMIT 8", conn); conn.close()
+                st.dataframe(df_p, use_container_width=True, hide_index=True)
+
+                with st.expander("📝 AI-Generated Sample Questions"):
+                    with st.spinner("Generating..."):
+                        qs2 = sample_questions(f"table '{tbl}' with columns: {', '.join(df_p.columns.tolist())}")
+                    st.markdown(f'<div class="insight-box">{qs2}</div>', unsafe_allow_html=True)
+
+                dp  = f"Table: {tbl}. Columns: {', '.join(df_p.columns)}. Return ONLY raw SQL. No ``` or sql word."
+                q_d = st.text_input("Ask about your database:", key="dbq")
+                if st.button("⚡ Query DB") and q_d.strip():
+                    with st.spinner("Generating SQL..."):
+                        try:
+                            sql, offline = sql_for(q_d, tmp_db, tbl, dp + f"\nQuestion: {q_d}")
+                            if offline: offline_note(offline)
+                            st.code(sql, language="sql")
+                            rows, c_n = run_sql(sql, tmp_db)
+                            if rows:
+                                r_df = pd.DataFrame(rows, columns=c_n)
+                                st.dataframe(r_df, use_container_width=True, hide_index=True)
+                                export_buttons(tmp_db, sql, "result")
+                                render_chart(r_df,"db_")
+                            else:
+                                st.info("No results.")
+                        except Exception as e:
+                            st.error(f"❌ {e}")
+            except Exception as e:
+                st.error(f"❌ {e}")
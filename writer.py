@@ -0,0 +1,102 @@
+import os, queue, sqlite3, threading
+from concurrent.futures import Future
+
+BUSY_MS   = 10_000          # how long any connection waits on a lock before "database is locked"
+MAX_BATCH = 500             # requests folded into one commit
+
+def enable_wal(db):
+    """Switch db to write-ahead logging (persistent in the file): readers keep reading their
+    snapshot while a write is in progress instead of waiting for it."""
+    conn = sqlite3.connect(db, timeout=BUSY_MS / 1000)
+    try:
+        return conn.execute("PRAGMA journal_mode=WAL").fetchone()[0]
+    finally:
+        conn.close()
+
+class Writer:
+    """The one connection that writes to a database, shared by every session.
+
+    Requests queue up from any thread and are applied by a background thread: whatever is
+    waiting when it wakes is run in a single transaction (group commit), each request inside
+    its own savepoint so a failing one is rolled back alone. submit() returns a Future that
+    resolves after the commit with the request's own result or exception."""
+    def __init__(self, db, max_batch=MAX_BATCH):
+        self.db, self.max_batch = db, max_batch
+        self.mode = enable_wal(db)
+        self.q = queue.Queue()
+        self.counts = {"requests": 0, "commits": 0, "failed": 0, "largest": 0}
+        self.thread = threading.Thread(target=self._run, daemon=True, name=f"writer:{os.path.basename(db)}")
+        self.thread.start()
+
+    def submit(self, op):
+        """op(conn) runs in the writer thread inside the group transaction; its return value is the result."""
+        fut = Future()
+        self.q.put((fut, op))
+        return fut
+
+    def execute(self, sql, params=(), timeout=None):
+        """Run one statement; returns its rowcount once committed."""
+        return self.submit(lambda c: c.execute(sql, params).rowcount).result(timeout)
+
+    def executemany(self, sql, seq, timeout=None):
+        seq = list(seq)
+        return self.submit(lambda c: c.executemany(sql, seq).rowcount).result(timeout)
+
+    def close(self):
+        self.q.put(None)
+        self.thread.join(timeout=5)
+
+    def stats(self):
+        return dict(self.counts, queued=self.q.qsize(), mode=self.mode)
+
+    # ── Writer thread ──
+    def _run(self):
+        conn = sqlite3.connect(self.db, isolation_level=None, check_same_thread=False)
+        conn.execute(f"PRAGMA busy_timeout={BUSY_MS}")
+        conn.execute("PRAGMA synchronous=NORMAL")        # WAL: durable at checkpoints, never corrupt
+        while True:
+            item = self.q.get()
+            if item is None: break
+            batch, stop = [item], False
+            while len(batch) < self.max_batch:
+                try:
+                    item = self.q.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None: stop = True; break
+                batch.append(item)
+            self._commit(conn, batch)
+            if stop: break
+        conn.close()
+
+    def _commit(self, conn, batch):
+        batch = [(f, op) for f, op in batch if f.set_running_or_notify_cancel()]
+        done = []
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            for fut, op in batch:
+                conn.execute("SAVEPOINT request")
+                try:
+                    done.append((fut, op(conn), None))
+                except Exception as e:
+                    conn.execute("ROLLBACK TO request")
+                    done.append((fut, None, e))
+                conn.execute("RELEASE request")
+            conn.execute("COMMIT")
+        except Exception as e:
+            if conn.in_transaction: conn.execute("ROLLBACK")
+            done = [(fut, None, e) for fut, _ in batch]
+        self.counts["requests"] += len(batch); self.counts["commits"] += 1
+        self.counts["largest"] = max(self.counts["largest"], len(batch))
+        for fut, result, err in done:
+            if err is None: fut.set_result(result)
+            else:           self.counts["failed"] += 1; fut.set_exception(err)
+
+_writers, _lock = {}, threading.Lock()
+
+def writer(db):
+    """The shared Writer for db (started on first use)."""
+    key = os.path.abspath(db)
+    with _lock:
+        if key not in _writers: _writers[key] = Writer(db)
+        return _writers[key]